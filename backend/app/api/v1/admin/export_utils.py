@@ -0,0 +1,62 @@
+import csv
+from collections.abc import AsyncIterator, Iterable, Iterator
+from io import StringIO
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import iterate_in_threadpool
+
+from app.db.session import SessionLocal
+
+
+EXPORT_BATCH_SIZE = 500
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def stream_csv(fieldnames: list[str], rows: Iterable[dict]) -> Iterator[str]:
+    """Yield CSV text in chunks of roughly EXPORT_CHUNK_BYTES."""
+    buffer = StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def stream_export(fieldnames: list[str], build_rows) -> AsyncIterator[str]:
+    """Stream CSV rows from a database session owned by the response body.
+
+    The request's own session may close before a streaming body finishes, so
+    exports open a dedicated session for as long as the download runs. Rows
+    are read in a worker thread, and the cursor and session are closed here
+    when the download finishes or CSVExportResponse closes it early.
+    """
+    db: Session = SessionLocal()
+    chunks = stream_csv(fieldnames, build_rows(db))
+    try:
+        async for chunk in iterate_in_threadpool(chunks):
+            yield chunk
+    finally:
+        chunks.close()
+        db.close()
+
+
+class CSVExportResponse(StreamingResponse):
+    """Stream a CSV export and close its body however the download ends.
+
+    A client that disconnects part way leaves the body generator suspended,
+    so it is closed here instead of whenever it is garbage collected.
+    """
+    media_type = "text/csv; charset=utf-8"
+
+    async def __call__(self, scope, receive, send):
+        """Send the export, then close the body generator."""
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.body_iterator.aclose()
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends
+
+from app.core.dependencies import require_admin
+from app.services.s3_service import upload_metrics
+
+
+router = APIRouter()
+
+
+@router.get("/upload-metrics", dependencies=[Depends(require_admin)])
+def get_upload_metrics():
+    """Return S3 upload totals and throughput for this API process."""
+    return upload_metrics.snapshot()
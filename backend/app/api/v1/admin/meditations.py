@@ -1,20 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import csv
-from io import BytesIO, StringIO, TextIOWrapper
+from io import TextIOWrapper
 import mimetypes
 from pathlib import PurePath
+from tempfile import SpooledTemporaryFile
+from time import sleep
+from typing import BinaryIO, NamedTuple
+import uuid
 import zipfile
 
+from boto3.exceptions import S3UploadFailedError
+from botocore.exceptions import BotoCoreError, ClientError
+
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
-from fastapi.responses import StreamingResponse
 from pydantic import ValidationError
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 
+from app.api.v1.admin.export_utils import EXPORT_BATCH_SIZE, CSVExportResponse, stream_export
+from app.api.v1.admin.zip_utils import ZipMemberError, extract_zip_member
+from app.core.config import settings
 from app.core.dependencies import require_admin
 from app.core.logging import get_logger
 from app.db.session import SessionLocal
+from app.models.media_job import MediaJob
 from app.models.meditation import Meditation
 from app.models.session import MeditationSession
-from app.schemas.meditation import MeditationCreate, MeditationRead, MeditationUpdate
+from app.schemas.meditation import (
+    DirectUploadFinalize,
+    DirectUploadRequest,
+    DirectUploadTicket,
+    MeditationCreate,
+    MeditationRead,
+    MeditationUpdate,
+)
+from app.services.audio_pipeline import AUDIO_JOB_KINDS, enqueue_audio_processing
+from app.services.image_pipeline import artwork_variants_or_empty
+from app.services.media_jobs import enqueue_media_job
 from app.services.s3_service import S3Service
 
 
@@ -23,6 +45,10 @@ router = APIRouter()
 PLACEHOLDER_LIST_VALUES = {"[]", "{}", "null", "none", "undefined", "-", "n/a", "na"}
 ALLOWED_ARTWORK_TYPES = {"image/jpeg", "image/png", "image/webp", "image/avif"}
 MAX_ARTWORK_BYTES = 10 * 1024 * 1024
+MAX_AUDIO_BYTES = 2 * 1024 * 1024 * 1024
+MAX_MEDIA_ZIP_UNCOMPRESSED_BYTES = 20 * 1024 * 1024 * 1024
+IMPORT_UPLOAD_WORKERS = 8
+IMPORT_UPLOAD_ATTEMPTS = 3
 CSV_COLUMNS = {
     "title",
     "category",
@@ -70,50 +96,55 @@ def join_list(values: list[str] | None, separator: str) -> str:
     return separator.join(str(item).strip() for item in values if str(item).strip())
 
 
+MEDITATION_EXPORT_FIELDS = [
+    "id",
+    "title",
+    "category",
+    "duration_sec",
+    "level",
+    "description",
+    "teacher_name",
+    "tags",
+    "benefits",
+    "is_featured",
+    "is_published",
+    "audio_url",
+    "artwork_url",
+    "created_at",
+]
+
+
+def meditation_export_rows(db: Session):
+    """Yield one CSV row per meditation while reading through a server-side cursor."""
+    meditations = db.execute(
+        select(Meditation)
+        .order_by(Meditation.id.asc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    ).scalars()
+    for meditation in meditations:
+        yield {
+            "id": meditation.id,
+            "title": meditation.title,
+            "category": meditation.category,
+            "duration_sec": meditation.duration_sec,
+            "level": meditation.level,
+            "description": meditation.description,
+            "teacher_name": meditation.teacher_name,
+            "tags": join_list(meditation.tags, ","),
+            "benefits": join_list(meditation.benefits, "|"),
+            "is_featured": meditation.is_featured,
+            "is_published": meditation.is_published,
+            "audio_url": meditation.audio_url or "",
+            "artwork_url": meditation.artwork_url or "",
+            "created_at": meditation.created_at.isoformat() if meditation.created_at else "",
+        }
+
+
 @router.get("/export.csv", dependencies=[Depends(require_admin)])
-def export_meditations_csv(db: Session = Depends(get_db)):
+def export_meditations_csv():
     """Download all meditations as a CSV backup for production content."""
-    output = StringIO()
-    fieldnames = [
-        "id",
-        "title",
-        "category",
-        "duration_sec",
-        "level",
-        "description",
-        "teacher_name",
-        "tags",
-        "benefits",
-        "is_featured",
-        "is_published",
-        "audio_url",
-        "artwork_url",
-        "created_at",
-    ]
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
-    writer.writeheader()
-    for meditation in db.query(Meditation).order_by(Meditation.id.asc()).all():
-        writer.writerow(
-            {
-                "id": meditation.id,
-                "title": meditation.title,
-                "category": meditation.category,
-                "duration_sec": meditation.duration_sec,
-                "level": meditation.level,
-                "description": meditation.description,
-                "teacher_name": meditation.teacher_name,
-                "tags": join_list(meditation.tags, ","),
-                "benefits": join_list(meditation.benefits, "|"),
-                "is_featured": meditation.is_featured,
-                "is_published": meditation.is_published,
-                "audio_url": meditation.audio_url or "",
-                "artwork_url": meditation.artwork_url or "",
-                "created_at": meditation.created_at.isoformat() if meditation.created_at else "",
-            }
-        )
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv; charset=utf-8",
+    return CSVExportResponse(
+        stream_export(MEDITATION_EXPORT_FIELDS, meditation_export_rows),
         headers={"Content-Disposition": 'attachment; filename="meditations-backup.csv"'},
     )
 
@@ -165,18 +196,25 @@ def normalize_zip_name(filename: str | None) -> str:
     return str(PurePath(filename.replace("\\", "/")))
 
 
-def read_media_zip(media_zip: UploadFile | None) -> tuple[dict[str, bytes], list[str]]:
-    """Read safe audio and artwork files from an optional ZIP upload."""
+def read_media_zip(
+    media_zip: UploadFile | None,
+) -> tuple[zipfile.ZipFile | None, dict[str, zipfile.ZipInfo], list[str]]:
+    """Index safe audio and artwork files in an optional ZIP upload.
+
+    The archive is read from the upload's spooled temporary file and members
+    are only decompressed when they are streamed to S3.
+    """
     if media_zip is None:
-        return {}, []
+        return None, {}, []
 
     warnings = []
-    files: dict[str, bytes] = {}
+    files: dict[str, zipfile.ZipInfo] = {}
     try:
-        archive = zipfile.ZipFile(BytesIO(media_zip.file.read()))
+        archive = zipfile.ZipFile(media_zip.file)
     except zipfile.BadZipFile:
         raise HTTPException(status_code=400, detail="media_zip must be a valid ZIP file")
 
+    total_bytes = 0
     for info in archive.infolist():
         raw_name = info.filename.replace("\\", "/")
         normalized_name = normalize_zip_name(raw_name)
@@ -188,11 +226,23 @@ def read_media_zip(media_zip: UploadFile | None) -> tuple[dict[str, bytes], list
         ):
             warnings.append(f"Ignored ZIP file outside audio/ or artwork/: {raw_name}")
             continue
-        files[normalized_name] = archive.read(info)
-    return files, warnings
+        total_bytes += info.file_size
+        files[normalized_name] = info
+
+    if total_bytes > MAX_MEDIA_ZIP_UNCOMPRESSED_BYTES:
+        archive.close()
+        raise HTTPException(
+            status_code=400,
+            detail="media_zip must expand to 20 GB or less",
+        )
+    return archive, files, warnings
 
 
-def find_media_file(files: dict[str, bytes], folder: str, filename: str | None) -> tuple[str, bytes] | None:
+def find_media_file(
+    files: dict[str, zipfile.ZipInfo],
+    folder: str,
+    filename: str | None,
+) -> tuple[str, zipfile.ZipInfo] | None:
     """Find a media file by its folder and CSV filename."""
     safe_name = PurePath((filename or "").replace("\\", "/")).name
     if not safe_name:
@@ -206,6 +256,95 @@ def find_media_file(files: dict[str, bytes], folder: str, filename: str | None)
     return None
 
 
+class MediaUpload(NamedTuple):
+    """One ZIP member that should be uploaded to S3 under a prefix."""
+    member_name: str
+    content_type: str
+    prefix: str
+    max_bytes: int
+
+
+class PlannedMeditationRow(NamedTuple):
+    """A validated CSV row and the media it needs uploaded."""
+    row_number: int
+    row: dict[str, str | None]
+    payload: MeditationCreate
+    audio_upload: MediaUpload | None
+    artwork_upload: MediaUpload | None
+
+
+def upload_zip_member(
+    s3: S3Service,
+    member: BinaryIO,
+    upload: MediaUpload,
+) -> str:
+    """Upload an extracted ZIP member to S3, retrying transient failures."""
+    for attempt in range(1, IMPORT_UPLOAD_ATTEMPTS + 1):
+        member.seek(0)
+        try:
+            return s3.upload_file(
+                member,
+                PurePath(upload.member_name).name,
+                upload.content_type,
+                prefix=upload.prefix,
+            )
+        except (BotoCoreError, ClientError, S3UploadFailedError) as error:
+            if attempt == IMPORT_UPLOAD_ATTEMPTS:
+                raise
+            logger.warning(
+                "Retrying upload of %s after attempt %s failed: %s",
+                upload.member_name,
+                attempt,
+                error,
+            )
+            sleep(0.5 * 2 ** (attempt - 1))
+
+
+def upload_zip_media(
+    s3: S3Service,
+    archive: zipfile.ZipFile,
+    upload: MediaUpload,
+) -> tuple[str, dict[str, dict[str, str]]]:
+    """Decompress one ZIP member once, then upload it and any artwork variants."""
+    variants: dict[str, dict[str, str]] = {}
+    with extract_zip_member(archive, upload.member_name, upload.max_bytes) as member:
+        if upload.prefix.startswith("artwork/"):
+            # Variants are built first because the upload closes the file.
+            variants = artwork_variants_or_empty(member, s3)
+        url = upload_zip_member(s3, member, upload)
+    return url, variants
+
+
+def upload_media_batch(
+    archive: zipfile.ZipFile,
+    uploads: set[MediaUpload],
+) -> tuple[dict[MediaUpload, str], dict[MediaUpload, dict], dict[MediaUpload, Exception]]:
+    """Upload each distinct ZIP member once over a bounded thread pool.
+
+    Returns the uploaded URLs, the artwork variants, and the failures.
+    """
+    if not uploads:
+        return {}, {}, {}
+
+    s3 = S3Service()
+    urls: dict[MediaUpload, str] = {}
+    variants: dict[MediaUpload, dict] = {}
+    failures: dict[MediaUpload, Exception] = {}
+    with ThreadPoolExecutor(max_workers=IMPORT_UPLOAD_WORKERS) as executor:
+        futures = {
+            executor.submit(upload_zip_media, s3, archive, upload): upload
+            for upload in uploads
+        }
+        for future in as_completed(futures):
+            upload = futures[future]
+            try:
+                urls[upload], variants[upload] = future.result()
+            except Exception as error:
+                logger.warning("Bulk import upload failed for %s: %s", upload.member_name, error)
+                failures[upload] = error
+    return urls, variants, failures
+
+
 def build_meditation_payload(row: dict[str, str | None]) -> MeditationCreate:
     """Convert one CSV row into validated meditation data."""
     return MeditationCreate(
@@ -244,7 +383,70 @@ def bulk_import_meditations(
     }:
         raise HTTPException(status_code=400, detail="csv_file must be a CSV file")
 
-    media_files, warnings = read_media_zip(media_zip)
+    media_archive, media_files, warnings = read_media_zip(media_zip)
+    try:
+        return import_meditation_rows(csv_file, media_archive, media_files, warnings, db)
+    finally:
+        if media_archive is not None:
+            media_archive.close()
+
+
+def plan_audio_upload(
+    media_files: dict[str, zipfile.ZipInfo],
+    row_number: int,
+    audio_filename: str | None,
+    warnings: list[str],
+) -> MediaUpload | None:
+    """Pick the ZIP audio file for a row, or record why it was skipped."""
+    audio_file = find_media_file(media_files, "audio", audio_filename)
+    if audio_filename and audio_file is None:
+        warnings.append(f"Row {row_number}: audio file not found: {audio_filename}")
+        return None
+    if audio_file is None:
+        return None
+    audio_key, audio_info = audio_file
+    content_type = mimetypes.guess_type(audio_key)[0] or "application/octet-stream"
+    if not content_type.startswith("audio/"):
+        warnings.append(f"Row {row_number}: skipped non-audio file: {audio_filename}")
+        return None
+    if audio_info.file_size > MAX_AUDIO_BYTES:
+        warnings.append(f"Row {row_number}: skipped audio over 2 GB: {audio_filename}")
+        return None
+    return MediaUpload(audio_info.filename, content_type, "audio", MAX_AUDIO_BYTES)
+
+
+def plan_artwork_upload(
+    media_files: dict[str, zipfile.ZipInfo],
+    row_number: int,
+    artwork_filename: str | None,
+    warnings: list[str],
+) -> MediaUpload | None:
+    """Pick the ZIP artwork file for a row, or record why it was skipped."""
+    artwork_file = find_media_file(media_files, "artwork", artwork_filename)
+    if artwork_filename and artwork_file is None:
+        warnings.append(f"Row {row_number}: artwork file not found: {artwork_filename}")
+        return None
+    if artwork_file is None:
+        return None
+    artwork_key, artwork_info = artwork_file
+    content_type = mimetypes.guess_type(artwork_key)[0] or "application/octet-stream"
+    if content_type not in ALLOWED_ARTWORK_TYPES:
+        warnings.append(f"Row {row_number}: skipped unsupported artwork type: {artwork_filename}")
+        return None
+    if artwork_info.file_size > MAX_ARTWORK_BYTES:
+        warnings.append(f"Row {row_number}: skipped artwork over 10 MB: {artwork_filename}")
+        return None
+    return MediaUpload(artwork_info.filename, content_type, "artwork/meditations", MAX_ARTWORK_BYTES)
+
+
+def import_meditation_rows(
+    csv_file: UploadFile,
+    media_archive: zipfile.ZipFile | None,
+    media_files: dict[str, zipfile.ZipInfo],
+    warnings: list[str],
+    db: Session,
+) -> dict:
+    """Validate rows, upload their media concurrently, then save in one transaction."""
     reader = csv.DictReader(TextIOWrapper(csv_file.file, encoding="utf-8-sig"))
     missing_columns = {"title", "category", "duration_sec", "level"} - set(reader.fieldnames or [])
     if missing_columns:
@@ -257,73 +459,140 @@ def bulk_import_meditations(
     updated = 0
     skipped = 0
     errors: list[str] = []
-    s3 = S3Service()
 
+    # Phase 1: parse and validate every row before touching S3 or writing rows.
+    parsed_rows = []
     for row_number, row in enumerate(reader, start=2):
         try:
-            payload = build_meditation_payload(row)
+            parsed_rows.append((row_number, row, build_meditation_payload(row)))
         except (ValueError, ValidationError) as error:
             skipped += 1
             errors.append(f"Row {row_number}: {error}")
+
+    titles = {payload.title for _, _, payload in parsed_rows}
+    existing_by_title: dict[str, dict] = {}
+    if titles:
+        existing_rows = db.query(
+            Meditation.id,
+            Meditation.title,
+            Meditation.is_published,
+            Meditation.audio_url,
+            Meditation.artwork_url,
+        ).filter(Meditation.title.in_(titles)).order_by(Meditation.id.asc()).all()
+        for existing in existing_rows:
+            existing_by_title.setdefault(existing.title, dict(existing._mapping))
+    # End the read transaction so no connection is held while media uploads.
+    db.rollback()
+
+    planned_rows: list[PlannedMeditationRow] = []
+    # The first row to give a title its audio or artwork wins; a later row
+    # bringing different media for the same title is a duplicate.
+    media_sources: dict[str, dict[str, tuple[int, MediaUpload | str]]] = {}
+    for row_number, row, payload in parsed_rows:
+        existing = existing_by_title.get(payload.title, {})
+        audio_upload = None
+        if not (payload.audio_url or existing.get("audio_url")):
+            audio_upload = plan_audio_upload(
+                media_files,
+                row_number,
+                row.get("audio_filename"),
+                warnings,
+            )
+        artwork_upload = None
+        if not (payload.artwork_url or existing.get("artwork_url")):
+            artwork_upload = plan_artwork_upload(
+                media_files,
+                row_number,
+                row.get("artwork_filename"),
+                warnings,
+            )
+        sources = media_sources.setdefault(payload.title, {})
+        duplicate_of = next(
+            (
+                sources[field][0]
+                for field, upload in (("audio_url", audio_upload), ("artwork_url", artwork_upload))
+                if upload is not None and field in sources and sources[field][1] != upload
+            ),
+            None,
+        )
+        if duplicate_of is not None:
+            skipped += 1
+            errors.append(
+                f"Row {row_number}: duplicate of row {duplicate_of} for "
+                f"{payload.title!r} with different media"
+            )
+            continue
+        for field, source in (
+            ("audio_url", payload.audio_url or audio_upload),
+            ("artwork_url", payload.artwork_url or artwork_upload),
+        ):
+            if source is not None:
+                sources.setdefault(field, (row_number, source))
+        planned_rows.append(
+            PlannedMeditationRow(row_number, row, payload, audio_upload, artwork_upload)
+        )
+
+    # Phase 2: upload each distinct media file once, concurrently.
+    uploads = {
+        upload
+        for planned in planned_rows
+        for upload in (planned.audio_upload, planned.artwork_upload)
+        if upload is not None
+    }
+    uploaded_urls, uploaded_variants, failed_uploads = upload_media_batch(media_archive, uploads)
+
+    # Phase 3: merge rows per title, then write everything with one bulk
+    # INSERT and one bulk UPDATE inside a short transaction.
+    values_by_title: dict[str, dict] = {}
+    for planned in planned_rows:
+        unreadable = [
+            failed_uploads[upload]
+            for upload in (planned.audio_upload, planned.artwork_upload)
+            if isinstance(failed_uploads.get(upload), ZipMemberError)
+        ]
+        if unreadable:
+            # A corrupt or oversized member is the row's fault, not S3's.
+            skipped += 1
+            errors.append(f"Row {planned.row_number}: {unreadable[0]}")
             continue
 
-        meditation = db.query(Meditation).filter(
-            Meditation.title == payload.title
-        ).first()
-        is_new = meditation is None
-        if meditation is None:
-            meditation = Meditation()
-            db.add(meditation)
+        payload = planned.payload
+        values = values_by_title.get(payload.title)
+        is_new = values is None and payload.title not in existing_by_title
+        if values is None:
+            values = dict(existing_by_title.get(payload.title, {}))
+            values.setdefault("audio_url", None)
+            values.setdefault("artwork_url", None)
+            values_by_title[payload.title] = values
 
         for field, value in payload.model_dump().items():
             if (
                 field == "is_published"
                 and not is_new
-                and not (row.get("is_published") or "").strip()
+                and not (planned.row.get("is_published") or "").strip()
             ):
                 continue
             if field in {"audio_url", "artwork_url"} and value is None:
                 continue
-            setattr(meditation, field, value)
-
-        audio_filename = row.get("audio_filename")
-        audio_file = find_media_file(media_files, "audio", audio_filename)
-        if meditation.audio_url:
-            pass
-        elif audio_filename and audio_file is None:
-            warnings.append(f"Row {row_number}: audio file not found: {audio_filename}")
-        elif audio_file is not None:
-            audio_key, audio_bytes = audio_file
-            content_type = mimetypes.guess_type(audio_key)[0] or "application/octet-stream"
-            if not content_type.startswith("audio/"):
-                warnings.append(f"Row {row_number}: skipped non-audio file: {audio_filename}")
-            else:
-                meditation.audio_url = s3.upload_file(
-                    BytesIO(audio_bytes),
-                    PurePath(audio_key).name,
-                    content_type,
-                    prefix="audio",
-                )
-
-        artwork_filename = row.get("artwork_filename")
-        artwork_file = find_media_file(media_files, "artwork", artwork_filename)
-        if meditation.artwork_url:
-            pass
-        elif artwork_filename and artwork_file is None:
-            warnings.append(f"Row {row_number}: artwork file not found: {artwork_filename}")
-        elif artwork_file is not None:
-            artwork_key, artwork_bytes = artwork_file
-            content_type = mimetypes.guess_type(artwork_key)[0] or "application/octet-stream"
-            if content_type not in ALLOWED_ARTWORK_TYPES:
-                warnings.append(f"Row {row_number}: skipped unsupported artwork type: {artwork_filename}")
-            elif len(artwork_bytes) > MAX_ARTWORK_BYTES:
-                warnings.append(f"Row {row_number}: skipped artwork over 10 MB: {artwork_filename}")
+            if field == "artwork_url" and value != values["artwork_url"]:
+                # Variants built for an earlier row's artwork no longer match.
+                values.pop("artwork_variants", None)
+            values[field] = value
+
+        for upload, url_field in (
+            (planned.audio_upload, "audio_url"),
+            (planned.artwork_upload, "artwork_url"),
+        ):
+            if upload is None or values[url_field]:
+                continue
+            if upload in uploaded_urls:
+                values[url_field] = uploaded_urls[upload]
+                if url_field == "artwork_url":
+                    values["artwork_variants"] = uploaded_variants[upload]
             else:
-                meditation.artwork_url = s3.upload_file(
-                    BytesIO(artwork_bytes),
-                    PurePath(artwork_key).name,
-                    content_type,
-                    prefix="artwork/meditations",
+                warnings.append(
+                    f"Row {planned.row_number}: upload failed for "
+                    f"{upload.member_name}: {failed_uploads.get(upload, 'unknown error')}"
                 )
 
         if is_new:
@@ -331,6 +600,47 @@ def bulk_import_meditations(
         else:
             updated += 1
 
+    new_meditations = [values for values in values_by_title.values() if "id" not in values]
+    changed_meditations = [values for values in values_by_title.values() if "id" in values]
+    new_audio: list[tuple[int, str]] = []
+    for values in new_meditations:
+        values.setdefault("artwork_variants", {})
+    if new_meditations:
+        inserted = db.execute(
+            insert(Meditation).returning(Meditation.id, Meditation.audio_url),
+            new_meditations,
+        ).all()
+        new_audio = [(meditation_id, audio_url) for meditation_id, audio_url in inserted if audio_url]
+    changed_audio: list[tuple[int, str]] = []
+    for values in changed_meditations:
+        existing = existing_by_title[values["title"]]
+        if values["audio_url"] != existing["audio_url"]:
+            # Renditions of the old audio no longer match.
+            values["audio_renditions"] = {}
+            values["hls_manifest_url"] = None
+            values["measured_duration_sec"] = None
+            if values["audio_url"]:
+                changed_audio.append((values["id"], values["audio_url"]))
+        if values["artwork_url"] != existing["artwork_url"]:
+            # Artwork from the ZIP already has variants; a new URL has none.
+            values.setdefault("artwork_variants", {})
+    if changed_meditations:
+        db.execute(update(Meditation), changed_meditations)
+
+    # Queue audio processing in the same transaction as the rows. New
+    # meditations cannot have jobs yet, so theirs are inserted in bulk.
+    if new_audio:
+        db.execute(
+            insert(MediaJob),
+            [
+                {"meditation_id": meditation_id, "kind": kind, "source_url": audio_url}
+                for meditation_id, audio_url in new_audio
+                for kind in AUDIO_JOB_KINDS
+            ],
+        )
+    for meditation_id, audio_url in changed_audio:
+        for kind in AUDIO_JOB_KINDS:
+            enqueue_media_job(db, meditation_id, kind, audio_url)
     db.commit()
     return {
         "created": created,
@@ -342,6 +652,15 @@ def bulk_import_meditations(
     }
 
 
+def replace_meditation_audio(db: Session, meditation: Meditation, audio_url: str | None) -> None:
+    """Point a meditation at new audio and queue processing for it."""
+    meditation.audio_url = audio_url
+    meditation.audio_renditions = {}
+    meditation.hls_manifest_url = None
+    meditation.measured_duration_sec = None
+    enqueue_audio_processing(db, meditation)
+
+
 @router.post(
     "/{meditation_id}/upload-audio",
     response_model=MeditationRead,
@@ -374,7 +693,7 @@ def upload_audio(
         prefix="audio",
     )
 
-    meditation.audio_url = public_url
+    replace_meditation_audio(db, meditation, public_url)
     db.commit()
     db.refresh(meditation)
     logger.info("Audio uploaded successfully for meditation_id=%s", meditation_id)
@@ -414,6 +733,9 @@ def upload_artwork(
         )
 
     s3 = S3Service()
+    # Variants are built first because the upload closes the file.
+    meditation.artwork_variants = artwork_variants_or_empty(file.file, s3)
+    file.file.seek(0)
     meditation.artwork_url = s3.upload_file(
         file.file,
         file.filename or "meditation-artwork",
@@ -429,6 +751,158 @@ def upload_artwork(
     return meditation
 
 
+def direct_upload_prefix(kind: str, meditation_id: int) -> str:
+    """Return the key prefix a direct upload for this meditation must use."""
+    if kind == "audio":
+        return f"audio/direct/{meditation_id}/"
+    return f"artwork/meditations/direct/{meditation_id}/"
+
+
+def direct_upload_problem(kind: str, content_type: str | None, size_bytes: int) -> str | None:
+    """Explain why a direct upload's type or size is not allowed."""
+    if kind == "audio":
+        if not content_type or not content_type.startswith("audio/"):
+            return "File must be audio"
+        if size_bytes > MAX_AUDIO_BYTES:
+            return "Audio must be 2 GB or smaller"
+        return None
+    if content_type not in ALLOWED_ARTWORK_TYPES:
+        return "Artwork must be a JPEG, PNG, WebP, or AVIF image"
+    if size_bytes > MAX_ARTWORK_BYTES:
+        return "Artwork must be 10 MB or smaller"
+    return None
+
+
+@router.post(
+    "/{meditation_id}/direct-uploads",
+    response_model=DirectUploadTicket,
+    dependencies=[Depends(require_admin)],
+)
+def create_direct_upload(
+    meditation_id: int,
+    payload: DirectUploadRequest,
+    db: Session = Depends(get_db),
+):
+    """Issue presigned URLs so the browser can upload media straight to S3."""
+    meditation_exists = db.query(Meditation.id).filter(
+        Meditation.id == meditation_id
+    ).first()
+    if not meditation_exists:
+        raise HTTPException(status_code=404, detail="Meditation not found")
+
+    problem = direct_upload_problem(payload.kind, payload.content_type, payload.size_bytes)
+    if problem:
+        raise HTTPException(status_code=400, detail=problem)
+
+    suffix = PurePath(payload.filename.replace("\\", "/")).suffix.lower()
+    key = f"{direct_upload_prefix(payload.kind, meditation_id)}{uuid.uuid4()}{suffix}"
+    upload = S3Service().create_direct_upload(
+        key,
+        payload.content_type,
+        payload.size_bytes,
+        settings.DIRECT_UPLOAD_EXPIRE_SECONDS,
+    )
+    logger.info(
+        "Issued direct %s upload for meditation_id=%s, key=%s, multipart=%s",
+        payload.kind,
+        meditation_id,
+        key,
+        "upload_id" in upload,
+    )
+    return DirectUploadTicket(
+        kind=payload.kind,
+        key=key,
+        expires_in=settings.DIRECT_UPLOAD_EXPIRE_SECONDS,
+        **upload,
+    )
+
+
+def abort_direct_upload(s3: S3Service, key: str, upload_id: str) -> None:
+    """Discard a multipart upload that will not be completed.
+
+    S3 keeps and bills the parts of an unfinished upload until it is aborted.
+    """
+    try:
+        s3.abort_multipart_upload(key, upload_id)
+    except ClientError as error:
+        logger.warning("Could not abort direct upload key=%s: %s", key, error)
+
+
+@router.post(
+    "/{meditation_id}/direct-uploads/finalize",
+    response_model=MeditationRead,
+    dependencies=[Depends(require_admin)],
+)
+def finalize_direct_upload(
+    meditation_id: int,
+    payload: DirectUploadFinalize,
+    db: Session = Depends(get_db),
+):
+    """Check a finished direct upload and attach it to the meditation."""
+    meditation = db.query(Meditation).filter(
+        Meditation.id == meditation_id
+    ).first()
+    if not meditation:
+        raise HTTPException(status_code=404, detail="Meditation not found")
+
+    prefix = direct_upload_prefix(payload.kind, meditation_id)
+    object_name = payload.key.removeprefix(prefix)
+    if object_name == payload.key or not object_name or "/" in object_name:
+        raise HTTPException(status_code=400, detail="Upload key does not belong to this meditation")
+
+    s3 = S3Service()
+    if payload.upload_id:
+        if not payload.parts:
+            abort_direct_upload(s3, payload.key, payload.upload_id)
+            raise HTTPException(status_code=400, detail="Multipart uploads need their parts")
+        try:
+            s3.complete_multipart_upload(
+                payload.key,
+                payload.upload_id,
+                [(part.part_number, part.etag) for part in payload.parts],
+            )
+        except ClientError as error:
+            logger.warning(
+                "Could not complete direct upload for meditation_id=%s, key=%s: %s",
+                meditation_id,
+                payload.key,
+                error,
+            )
+            abort_direct_upload(s3, payload.key, payload.upload_id)
+            raise HTTPException(status_code=400, detail="Upload could not be completed") from error
+
+    uploaded = s3.object_metadata(payload.key)
+    if uploaded is None:
+        raise HTTPException(status_code=400, detail="Uploaded file not found")
+
+    problem = direct_upload_problem(
+        payload.kind,
+        uploaded.get("ContentType"),
+        uploaded.get("ContentLength", 0),
+    )
+    if problem:
+        s3.delete_object(payload.key)
+        raise HTTPException(status_code=400, detail=problem)
+
+    public_url = s3.generate_public_url(payload.key)
+    if payload.kind == "audio":
+        replace_meditation_audio(db, meditation, public_url)
+    else:
+        meditation.artwork_url = public_url
+        with SpooledTemporaryFile() as artwork_file:
+            s3.download_fileobj(payload.key, artwork_file)
+            artwork_file.seek(0)
+            meditation.artwork_variants = artwork_variants_or_empty(artwork_file, s3)
+    db.commit()
+    db.refresh(meditation)
+    logger.info(
+        "Direct %s upload attached to meditation_id=%s",
+        payload.kind,
+        meditation_id,
+    )
+    return meditation
+
+
 @router.patch(
     "/{meditation_id}",
     response_model=MeditationRead,
@@ -451,6 +925,12 @@ def update_meditation(
         raise HTTPException(status_code=404, detail="Meditation not found")
 
     for field, value in update_data.items():
+        if field == "audio_url":
+            if value != meditation.audio_url:
+                replace_meditation_audio(db, meditation, value)
+            continue
+        if field == "artwork_url" and value != meditation.artwork_url:
+            meditation.artwork_variants = {}
         setattr(meditation, field, value)
 
     db.commit()
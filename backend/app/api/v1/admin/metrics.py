@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends, Response
+
+from app.core.dependencies import require_admin
+from app.core.metrics import render_metrics
+
+
+router = APIRouter()
+
+
+@router.get("", dependencies=[Depends(require_admin)])
+def get_metrics():
+    """Return request latency, status, and database time metrics for Prometheus."""
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
@@ -1,25 +1,33 @@
 import csv
-from io import BytesIO, StringIO, TextIOWrapper
+from datetime import UTC, datetime
+from io import TextIOWrapper
+from itertools import groupby
 import mimetypes
 from pathlib import PurePath
 import zipfile
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
-from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, or_, select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 
+from app.api.v1.admin.export_utils import EXPORT_BATCH_SIZE, CSVExportResponse, stream_export
+from app.api.v1.admin.zip_utils import ZipMemberError, extract_zip_member
 from app.api.v1.program_utils import program_to_read, replace_program_meditations
+from app.api.v1.session_merge import collapse_open_sessions
 from app.core.dependencies import require_admin
 from app.db.session import SessionLocal
 from app.models.meditation import Meditation
 from app.models.program import Program, ProgramMeditation
+from app.models.session import MeditationSession
 from app.schemas.program import ProgramCreate, ProgramRead, ProgramUpdate
+from app.services.image_pipeline import artwork_variants_or_empty
 from app.services.s3_service import S3Service
 
 router = APIRouter()
 ALLOWED_ARTWORK_TYPES = {"image/jpeg", "image/png", "image/webp", "image/avif"}
 MAX_ARTWORK_BYTES = 10 * 1024 * 1024
+MAX_ARTWORK_ZIP_UNCOMPRESSED_BYTES = 2 * 1024 * 1024 * 1024
 PROGRAM_CSV_COLUMNS = {
     "title",
     "description",
@@ -56,51 +64,58 @@ def list_all_programs(db: Session = Depends(get_db)):
     return [program_to_read(db, program) for program in programs]
 
 
+PROGRAM_EXPORT_FIELDS = [
+    "id",
+    "title",
+    "description",
+    "goal",
+    "level",
+    "is_published",
+    "artwork_url",
+    "meditation_ids",
+    "meditation_titles",
+    "created_at",
+    "updated_at",
+]
+
+
+def program_export_rows(db: Session):
+    """Yield one CSV row per program from a single ordered program/meditation join."""
+    rows = db.execute(
+        select(Program, Meditation.id, Meditation.title)
+        .outerjoin(ProgramMeditation, ProgramMeditation.program_id == Program.id)
+        .outerjoin(Meditation, Meditation.id == ProgramMeditation.meditation_id)
+        .order_by(Program.id.asc(), ProgramMeditation.position.asc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for _, program_rows in groupby(rows, key=lambda row: row[0].id):
+        program_rows = list(program_rows)
+        program = program_rows[0][0]
+        meditations = [
+            (meditation_id, title)
+            for _, meditation_id, title in program_rows
+            if meditation_id is not None
+        ]
+        yield {
+            "id": program.id,
+            "title": program.title,
+            "description": program.description,
+            "goal": program.goal,
+            "level": program.level,
+            "is_published": program.is_published,
+            "artwork_url": program.artwork_url or "",
+            "meditation_ids": "|".join(str(meditation_id) for meditation_id, _ in meditations),
+            "meditation_titles": "|".join(title for _, title in meditations),
+            "created_at": program.created_at.isoformat() if program.created_at else "",
+            "updated_at": program.updated_at.isoformat() if program.updated_at else "",
+        }
+
+
 @router.get("/export.csv", dependencies=[Depends(require_admin)])
-def export_programs_csv(db: Session = Depends(get_db)):
+def export_programs_csv():
     """Download all programs and ordered meditation details as a CSV backup."""
-    output = StringIO()
-    fieldnames = [
-        "id",
-        "title",
-        "description",
-        "goal",
-        "level",
-        "is_published",
-        "artwork_url",
-        "meditation_ids",
-        "meditation_titles",
-        "created_at",
-        "updated_at",
-    ]
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
-    writer.writeheader()
-    programs = db.query(Program).order_by(Program.id.asc()).all()
-    for program in programs:
-        rows = db.query(ProgramMeditation, Meditation).join(
-            Meditation,
-            Meditation.id == ProgramMeditation.meditation_id,
-        ).filter(
-            ProgramMeditation.program_id == program.id,
-        ).order_by(ProgramMeditation.position.asc()).all()
-        writer.writerow(
-            {
-                "id": program.id,
-                "title": program.title,
-                "description": program.description,
-                "goal": program.goal,
-                "level": program.level,
-                "is_published": program.is_published,
-                "artwork_url": program.artwork_url or "",
-                "meditation_ids": "|".join(str(meditation.id) for _, meditation in rows),
-                "meditation_titles": "|".join(meditation.title for _, meditation in rows),
-                "created_at": program.created_at.isoformat() if program.created_at else "",
-                "updated_at": program.updated_at.isoformat() if program.updated_at else "",
-            }
-        )
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv; charset=utf-8",
+    return CSVExportResponse(
+        stream_export(PROGRAM_EXPORT_FIELDS, program_export_rows),
         headers={"Content-Disposition": 'attachment; filename="programs-backup.csv"'},
     )
 
@@ -150,18 +165,21 @@ def normalize_zip_name(filename: str | None) -> str:
     return str(PurePath(filename.replace("\\", "/")))
 
 
-def read_artwork_zip(artwork_zip: UploadFile | None) -> tuple[dict[str, bytes], list[str]]:
-    """Read safe artwork files from an optional ZIP upload."""
+def read_artwork_zip(
+    artwork_zip: UploadFile | None,
+) -> tuple[zipfile.ZipFile | None, dict[str, zipfile.ZipInfo], list[str]]:
+    """Index safe artwork files in an optional ZIP upload without extracting them."""
     if artwork_zip is None:
-        return {}, []
+        return None, {}, []
 
     warnings = []
-    files: dict[str, bytes] = {}
+    files: dict[str, zipfile.ZipInfo] = {}
     try:
-        archive = zipfile.ZipFile(BytesIO(artwork_zip.file.read()))
+        archive = zipfile.ZipFile(artwork_zip.file)
     except zipfile.BadZipFile:
         raise HTTPException(status_code=400, detail="artwork_zip must be a valid ZIP file")
 
+    total_bytes = 0
     for info in archive.infolist():
         raw_name = info.filename.replace("\\", "/")
         normalized_name = normalize_zip_name(raw_name)
@@ -170,11 +188,22 @@ def read_artwork_zip(artwork_zip: UploadFile | None) -> tuple[dict[str, bytes],
         if not normalized_name.startswith("artwork/"):
             warnings.append(f"Ignored ZIP file outside artwork/: {raw_name}")
             continue
-        files[normalized_name] = archive.read(info)
-    return files, warnings
+        total_bytes += info.file_size
+        files[normalized_name] = info
+
+    if total_bytes > MAX_ARTWORK_ZIP_UNCOMPRESSED_BYTES:
+        archive.close()
+        raise HTTPException(
+            status_code=400,
+            detail="artwork_zip must expand to 2 GB or less",
+        )
+    return archive, files, warnings
 
 
-def find_artwork_file(files: dict[str, bytes], filename: str | None) -> tuple[str, bytes] | None:
+def find_artwork_file(
+    files: dict[str, zipfile.ZipInfo],
+    filename: str | None,
+) -> tuple[str, zipfile.ZipInfo] | None:
     """Find program artwork by filename in the artwork folder."""
     safe_name = PurePath((filename or "").replace("\\", "/")).name
     if not safe_name:
@@ -189,8 +218,9 @@ def find_artwork_file(files: dict[str, bytes], filename: str | None) -> tuple[st
 
 
 def ordered_meditation_ids_from_row(
-    db: Session,
     row: dict[str, str | None],
+    known_ids: set[int],
+    ids_by_title: dict[str, int],
 ) -> tuple[list[int], list[str]]:
     """Resolve ordered meditation IDs from IDs and exact titles in a CSV row."""
     errors = []
@@ -205,10 +235,7 @@ def ordered_meditation_ids_from_row(
             except ValueError:
                 errors.append(f"invalid meditation ID: {raw_id}")
                 continue
-            meditation = db.query(Meditation).filter(
-                Meditation.id == meditation_id,
-            ).first()
-            if meditation is None:
+            if meditation_id not in known_ids:
                 errors.append(f"meditation ID not found: {meditation_id}")
                 continue
             if meditation_id not in seen_ids:
@@ -218,18 +245,57 @@ def ordered_meditation_ids_from_row(
 
     raw_titles = split_ordered_cell(row.get("meditation_titles"))
     for title in raw_titles:
-        meditation = db.query(Meditation).filter(
-            Meditation.title == title,
-        ).first()
-        if meditation is None:
+        meditation_id = ids_by_title.get(title)
+        if meditation_id is None:
             errors.append(f"meditation title not found: {title}")
             continue
-        if meditation.id not in seen_ids:
-            ordered_ids.append(meditation.id)
-            seen_ids.add(meditation.id)
+        if meditation_id not in seen_ids:
+            ordered_ids.append(meditation_id)
+            seen_ids.add(meditation_id)
     return ordered_ids, errors
 
 
+def referenced_meditations(
+    db: Session,
+    rows: list[dict[str, str | None]],
+) -> tuple[set[int], dict[str, int], set[int]]:
+    """Load every meditation referenced by the CSV with one query per lookup type."""
+    referenced_ids: set[int] = set()
+    referenced_titles: set[str] = set()
+    for row in rows:
+        raw_ids = split_ordered_cell(row.get("meditation_ids"))
+        if raw_ids:
+            for raw_id in raw_ids:
+                try:
+                    referenced_ids.add(int(raw_id))
+                except ValueError:
+                    continue
+        else:
+            referenced_titles.update(split_ordered_cell(row.get("meditation_titles")))
+
+    known_ids: set[int] = set()
+    ids_by_title: dict[str, int] = {}
+    published_ids: set[int] = set()
+    if referenced_ids:
+        for meditation_id, is_published in db.query(
+            Meditation.id,
+            Meditation.is_published,
+        ).filter(Meditation.id.in_(referenced_ids)).all():
+            known_ids.add(meditation_id)
+            if is_published:
+                published_ids.add(meditation_id)
+    if referenced_titles:
+        for meditation_id, title, is_published in db.query(
+            Meditation.id,
+            Meditation.title,
+            Meditation.is_published,
+        ).filter(Meditation.title.in_(referenced_titles)).order_by(Meditation.id.asc()).all():
+            ids_by_title.setdefault(title, meditation_id)
+            if is_published:
+                published_ids.add(meditation_id)
+    return known_ids, ids_by_title, published_ids
+
+
 @router.post(
     "/bulk-import",
     dependencies=[Depends(require_admin)],
@@ -250,7 +316,22 @@ def bulk_import_programs(
     }:
         raise HTTPException(status_code=400, detail="csv_file must be a CSV file")
 
-    artwork_files, warnings = read_artwork_zip(artwork_zip)
+    artwork_archive, artwork_files, warnings = read_artwork_zip(artwork_zip)
+    try:
+        return import_program_rows(csv_file, artwork_archive, artwork_files, warnings, db)
+    finally:
+        if artwork_archive is not None:
+            artwork_archive.close()
+
+
+def import_program_rows(
+    csv_file: UploadFile,
+    artwork_archive: zipfile.ZipFile | None,
+    artwork_files: dict[str, zipfile.ZipInfo],
+    warnings: list[str],
+    db: Session,
+) -> dict:
+    """Validate program CSV rows, upload artwork, then save programs in bulk."""
     reader = csv.DictReader(TextIOWrapper(csv_file.file, encoding="utf-8-sig"))
     missing_columns = {"title", "level"} - set(reader.fieldnames or [])
     if missing_columns:
@@ -265,7 +346,28 @@ def bulk_import_programs(
     errors: list[str] = []
     s3 = S3Service()
 
-    for row_number, row in enumerate(reader, start=2):
+    rows = list(enumerate(reader, start=2))
+    known_ids, ids_by_title, published_ids = referenced_meditations(
+        db,
+        [row for _, row in rows],
+    )
+    titles = {(row.get("title") or "").strip() for _, row in rows}
+    existing_by_title: dict[str, dict] = {}
+    for existing in db.query(
+        Program.id,
+        Program.title,
+        Program.is_published,
+        Program.artwork_url,
+    ).filter(Program.title.in_(titles)).order_by(Program.id.asc()).all():
+        existing_by_title.setdefault(existing.title, dict(existing._mapping))
+    # Nothing else is read before the writes below, so release the connection
+    # while artwork uploads run.
+    db.rollback()
+
+    values_by_title: dict[str, dict] = {}
+    meditation_ids_by_title: dict[str, list[int]] = {}
+    uploaded_artwork: dict[str, tuple[str, dict]] = {}
+    for row_number, row in rows:
         title = (row.get("title") or "").strip()
         level = (row.get("level") or "").strip()
         if not title or not level:
@@ -273,7 +375,11 @@ def bulk_import_programs(
             errors.append(f"Row {row_number}: title and level are required")
             continue
 
-        meditation_ids, meditation_errors = ordered_meditation_ids_from_row(db, row)
+        meditation_ids, meditation_errors = ordered_meditation_ids_from_row(
+            row,
+            known_ids,
+            ids_by_title,
+        )
         if meditation_errors:
             skipped += 1
             errors.append(f"Row {row_number}: {'; '.join(meditation_errors)}")
@@ -285,29 +391,30 @@ def bulk_import_programs(
             )
             continue
 
-        program = db.query(Program).filter(Program.title == title).first()
+        program = values_by_title.get(title) or existing_by_title.get(title)
         is_new = program is None
         try:
             is_published = parse_bool(
                 row.get("is_published"),
-                False if is_new else bool(program.is_published),
+                False if is_new else bool(program["is_published"]),
             )
         except ValueError as error:
             skipped += 1
             errors.append(f"Row {row_number}: {error}")
             continue
 
-        if program is None:
-            program = Program(title=title)
-            db.add(program)
-            db.flush()
-
-        program.title = title
-        program.description = (row.get("description") or "").strip()
-        program.goal = (row.get("goal") or "").strip()
-        program.level = level
-        program.is_published = is_published
-        program.artwork_url = (row.get("artwork_url") or "").strip() or program.artwork_url
+        values = dict(program or {})
+        values.update(
+            title=title,
+            description=(row.get("description") or "").strip(),
+            goal=(row.get("goal") or "").strip(),
+            level=level,
+            is_published=is_published,
+            artwork_url=(row.get("artwork_url") or "").strip() or values.get("artwork_url"),
+        )
+        if values["artwork_url"] != (program or {}).get("artwork_url"):
+            # Variants built for an earlier row's artwork no longer match.
+            values.pop("artwork_variants", None)
 
         artwork_filename = row.get("artwork_filename")
         artwork_file = find_artwork_file(artwork_files, artwork_filename)
@@ -316,27 +423,83 @@ def bulk_import_programs(
         elif artwork_filename and artwork_file is None:
             warnings.append(f"Row {row_number}: artwork file not found: {artwork_filename}")
         elif artwork_file is not None:
-            artwork_key, artwork_bytes = artwork_file
+            artwork_key, artwork_info = artwork_file
             content_type = mimetypes.guess_type(artwork_key)[0] or "application/octet-stream"
             if content_type not in ALLOWED_ARTWORK_TYPES:
                 warnings.append(f"Row {row_number}: skipped unsupported artwork type: {artwork_filename}")
-            elif len(artwork_bytes) > MAX_ARTWORK_BYTES:
+            elif artwork_info.file_size > MAX_ARTWORK_BYTES:
                 warnings.append(f"Row {row_number}: skipped artwork over 10 MB: {artwork_filename}")
             else:
-                program.artwork_url = s3.upload_file(
-                    BytesIO(artwork_bytes),
-                    PurePath(artwork_key).name,
-                    content_type,
-                    prefix="artwork/programs",
-                )
-
-        program.updated_at = func.now()
-        replace_program_meditations(db, program, meditation_ids)
+                if artwork_key not in uploaded_artwork:
+                    try:
+                        with extract_zip_member(artwork_archive, artwork_info, MAX_ARTWORK_BYTES) as artwork_stream:
+                            # Variants are built first because the upload closes the file.
+                            variants = artwork_variants_or_empty(artwork_stream, s3)
+                            artwork_stream.seek(0)
+                            url = s3.upload_file(
+                                artwork_stream,
+                                PurePath(artwork_key).name,
+                                content_type,
+                                prefix="artwork/programs",
+                            )
+                    except ZipMemberError as error:
+                        skipped += 1
+                        errors.append(f"Row {row_number}: {error}")
+                        continue
+                    uploaded_artwork[artwork_key] = (url, variants)
+                values["artwork_url"], values["artwork_variants"] = uploaded_artwork[artwork_key]
+
+        values_by_title[title] = values
+        # Match replace_program_meditations: keep only published meditations.
+        meditation_ids_by_title[title] = [
+            meditation_id
+            for meditation_id in meditation_ids
+            if meditation_id in published_ids
+        ]
         if is_new:
             created += 1
         else:
             updated += 1
 
+    new_programs = [values for values in values_by_title.values() if "id" not in values]
+    changed_programs = [values for values in values_by_title.values() if "id" in values]
+    now = datetime.now(UTC)
+    for values in new_programs:
+        values.setdefault("artwork_variants", {})
+    for values in changed_programs:
+        values["updated_at"] = now
+        if values["artwork_url"] != existing_by_title[values["title"]]["artwork_url"]:
+            # Artwork from the ZIP already has variants; a new URL has none.
+            values.setdefault("artwork_variants", {})
+    program_ids_by_title = {values["title"]: values["id"] for values in changed_programs}
+    if new_programs:
+        program_ids_by_title.update(
+            {
+                title: program_id
+                for program_id, title in db.execute(
+                    insert(Program).returning(Program.id, Program.title),
+                    new_programs,
+                )
+            }
+        )
+    if changed_programs:
+        db.execute(update(Program), changed_programs)
+    if program_ids_by_title:
+        db.query(ProgramMeditation).filter(
+            ProgramMeditation.program_id.in_(program_ids_by_title.values())
+        ).delete(synchronize_session=False)
+        program_meditations = [
+            {
+                "program_id": program_ids_by_title[title],
+                "meditation_id": meditation_id,
+                "position": position,
+            }
+            for title, meditation_ids in meditation_ids_by_title.items()
+            for position, meditation_id in enumerate(meditation_ids, start=1)
+        ]
+        if program_meditations:
+            db.execute(insert(ProgramMeditation), program_meditations)
+
     db.commit()
     return {
         "created": created,
@@ -366,6 +529,8 @@ def update_program(
     update_data = payload.model_dump(exclude_unset=True)
     meditation_ids = update_data.pop("meditation_ids", None)
     for field, value in update_data.items():
+        if field == "artwork_url" and value != program.artwork_url:
+            program.artwork_variants = {}
         setattr(program, field, value)
     program.updated_at = func.now()
     if meditation_ids is not None:
@@ -407,6 +572,9 @@ def upload_program_artwork(
         )
 
     s3 = S3Service()
+    # Variants are built first because the upload closes the file.
+    program.artwork_variants = artwork_variants_or_empty(file.file, s3)
+    file.file.seek(0)
     program.artwork_url = s3.upload_file(
         file.file,
         file.filename or "program-artwork",
@@ -426,6 +594,19 @@ def delete_program(program_id: int, db: Session = Depends(get_db)):
     if program is None:
         raise HTTPException(status_code=404, detail="Program not found")
 
+    # Deleting the program clears program_id on its sessions, so fold its
+    # unfinished sessions into any unfinished non-program ones first.
+    collapse_open_sessions(
+        db,
+        or_(MeditationSession.program_id == program_id, MeditationSession.program_id.is_(None)),
+        MeditationSession.meditation_id.in_(
+            select(MeditationSession.meditation_id).where(
+                MeditationSession.program_id == program_id,
+                MeditationSession.completed_at.is_(None),
+            )
+        ),
+        detached_program=MeditationSession.program_id == program_id,
+    )
     db.query(ProgramMeditation).filter(
         ProgramMeditation.program_id == program_id
     ).delete(synchronize_session=False)
@@ -0,0 +1,40 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from tempfile import SpooledTemporaryFile
+import zipfile
+import zlib
+
+from app.services.s3_service import HASH_CHUNK_BYTES, SPOOL_MAX_MEMORY_BYTES
+
+
+class ZipMemberError(ValueError):
+    """Raised when a ZIP member is corrupt or expands past its size limit."""
+
+
+@contextmanager
+def extract_zip_member(
+    archive: zipfile.ZipFile,
+    member: zipfile.ZipInfo | str,
+    max_bytes: int,
+) -> Iterator[SpooledTemporaryFile]:
+    """Decompress one ZIP member into a rewound temporary file.
+
+    The size limit is checked against the bytes actually decompressed, since
+    the size in the member's header can be wrong. A corrupt member, such as
+    one whose CRC does not match, raises ZipMemberError instead of the
+    zipfile or zlib error.
+    """
+    name = member.filename if isinstance(member, zipfile.ZipInfo) else member
+    size = 0
+    with SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY_BYTES) as spool:
+        try:
+            with archive.open(member) as stream:
+                while chunk := stream.read(HASH_CHUNK_BYTES):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise ZipMemberError(f"{name} expands past {max_bytes // (1024 * 1024)} MB")
+                    spool.write(chunk)
+        except (zipfile.BadZipFile, zlib.error, EOFError) as error:
+            raise ZipMemberError(f"{name} is corrupt: {error}") from error
+        spool.seek(0)
+        yield spool
@@ -73,9 +73,6 @@ def get_user_context(
     """Load compact personalization context for ranking."""
     preference = None
     favorite_ids: set[int] = set()
-    completed_ids: set[int] = set()
-    recent_ids: set[int] = set()
-    category_counts: dict[str, int] = {}
 
     if current_user is not None:
         preference = db.query(UserPreference).filter(
@@ -102,15 +99,28 @@ def get_user_context(
     else:
         session_query = None
 
+    rows = []
     if session_query is not None:
         rows = session_query.filter(MeditationSession.seconds_listened > 0).all()
-        for meditation_session, meditation in rows:
-            category = (meditation.category or "").lower()
-            if category:
-                category_counts[category] = category_counts.get(category, 0) + 1
-            recent_ids.add(meditation.id)
-            if meditation_session.completed_at is not None:
-                completed_ids.add(meditation.id)
+    return build_user_context(preference, favorite_ids, rows)
+
+
+def build_user_context(
+    preference: UserPreference | None,
+    favorite_ids: set[int],
+    session_rows: list[tuple[MeditationSession, Meditation]],
+) -> dict:
+    """Summarize preferences, favorites, and listened sessions for ranking."""
+    completed_ids: set[int] = set()
+    recent_ids: set[int] = set()
+    category_counts: dict[str, int] = {}
+    for meditation_session, meditation in session_rows:
+        category = (meditation.category or "").lower()
+        if category:
+            category_counts[category] = category_counts.get(category, 0) + 1
+        recent_ids.add(meditation.id)
+        if meditation_session.completed_at is not None:
+            completed_ids.add(meditation.id)
 
     return {
         "preference": preference,
@@ -121,6 +131,17 @@ def get_user_context(
     }
 
 
+def recommendation_candidates(db: Session) -> list[Meditation]:
+    """Return the published meditations considered for recommendations."""
+    return db.query(Meditation).filter(
+        Meditation.is_published.is_(True)
+    ).order_by(
+        Meditation.is_featured.desc(),
+        Meditation.created_at.desc(),
+        Meditation.id.desc(),
+    ).limit(MAX_CANDIDATES).all()
+
+
 def deterministic_recommendations(
     meditations: list[Meditation],
     user_query: str,
@@ -355,13 +376,7 @@ def recommend_meditations(
     current_user: User | None = Depends(get_optional_user),
 ):
     """Recommend published meditations from user intent and saved context."""
-    meditations = db.query(Meditation).filter(
-        Meditation.is_published.is_(True)
-    ).order_by(
-        Meditation.is_featured.desc(),
-        Meditation.created_at.desc(),
-        Meditation.id.desc(),
-    ).limit(MAX_CANDIDATES).all()
+    meditations = recommendation_candidates(db)
     if not meditations:
         return AIRecommendationResponse(
             items=[],
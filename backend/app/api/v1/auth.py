@@ -11,7 +11,12 @@ from app.core.csrf import create_csrf_token, set_csrf_cookie
 from app.core.dependencies import get_current_user
 from app.core.logging import get_logger
 from app.core.rate_limit import check_rate_limit
-from app.core.security import create_access_token, hash_password, verify_password
+from app.core.security import (
+    PasswordHasherBusy,
+    create_access_token,
+    hash_password,
+    verify_password_and_update,
+)
 from app.db.session import SessionLocal
 from app.models.email_verification import EmailVerificationToken
 from app.models.password_reset import PasswordResetToken
@@ -79,6 +84,37 @@ def authentication_response(user: User, response: Response) -> AuthSession:
     return AuthSession(user=user)
 
 
+def password_service_busy(error: PasswordHasherBusy) -> HTTPException:
+    """Build the response used when password hashing is at capacity."""
+    logger.warning("Password hashing pool is full: %s", error)
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Sign-in is busy right now. Please try again in a moment.",
+        headers={"Retry-After": "2"},
+    )
+
+
+def hash_new_password(password: str) -> str:
+    """Hash a password chosen by the user, or ask them to retry when busy."""
+    try:
+        return hash_password(password)
+    except PasswordHasherBusy as error:
+        raise password_service_busy(error) from error
+
+
+def check_login_password(user: User, password: str, db: Session) -> bool:
+    """Verify a login password and upgrade the saved hash when it is outdated."""
+    try:
+        is_valid, updated_hash = verify_password_and_update(password, user.hashed_password)
+    except PasswordHasherBusy as error:
+        raise password_service_busy(error) from error
+    if is_valid and updated_hash is not None:
+        user.hashed_password = updated_hash
+        db.commit()
+        db.refresh(user)
+    return is_valid
+
+
 def hash_reset_token(token: str) -> str:
     """Create a stable fingerprint for a reset token without storing the token itself."""
     return hashlib.sha256(token.encode("utf-8")).hexdigest()
@@ -164,7 +200,7 @@ def register(
 
     user = User(
         email=payload.email,
-        hashed_password=hash_password(payload.password),
+        hashed_password=hash_new_password(payload.password),
         is_admin=False,
         is_active=True,
     )
@@ -197,7 +233,7 @@ def login(
     """Check an email and password, then sign in the matching user."""
     check_rate_limit(request, scope="auth:login", limit=10, window_seconds=900)
     user = db.query(User).filter(User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.hashed_password):
+    if not user or not check_login_password(user, payload.password, db):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     if not user.is_active:
         raise HTTPException(status_code=403, detail="Account is disabled")
@@ -261,7 +297,7 @@ def confirm_password_reset(
     if user is None:
         raise HTTPException(status_code=400, detail="Reset link is invalid or expired")
 
-    user.hashed_password = hash_password(payload.password)
+    user.hashed_password = hash_new_password(payload.password)
     reset_token.used_at = datetime.now(UTC)
     reset_token.is_active = False
     db.query(PasswordResetToken).filter(
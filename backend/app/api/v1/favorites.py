@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_current_user
+from app.core.home_cache import home_feed_cache
 from app.db.session import SessionLocal
 from app.models.favorite import UserFavorite
 from app.models.meditation import Meditation
@@ -79,6 +80,7 @@ def save_favorite(
         )
         db.add(favorite)
         db.commit()
+        home_feed_cache.invalidate(user_id=current_user.id)
         db.refresh(favorite)
 
     return favorite_response(favorite, meditation)
@@ -96,4 +98,5 @@ def remove_favorite(
         UserFavorite.meditation_id == meditation_id,
     ).delete(synchronize_session=False)
     db.commit()
+    home_feed_cache.invalidate(user_id=current_user.id)
     return None
@@ -0,0 +1,240 @@
+from collections import defaultdict
+from zoneinfo import ZoneInfo
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.api.v1.ai import (
+    build_user_context,
+    deterministic_recommendations,
+    recommendation_candidates,
+)
+from app.api.v1.favorites import favorite_response
+from app.api.v1.program_utils import PROGRAM_SESSION_ORDER, build_program_read
+from app.api.v1.sessions import (
+    build_progress_summary,
+    history_item,
+    last_activity_at,
+    parse_timezone,
+)
+from app.core.dependencies import get_optional_user
+from app.core.home_cache import device_owner, home_feed_cache, user_owner
+from app.db.session import SessionLocal
+from app.models.favorite import UserFavorite
+from app.models.meditation import Meditation
+from app.models.preference import UserPreference
+from app.models.program import Program, ProgramMeditation, UserProgram
+from app.models.session import MeditationSession
+from app.models.user import User
+from app.schemas.favorite import FavoriteListResponse
+from app.schemas.home import HomeFeedResponse
+from app.schemas.program import UserProgramRead
+from app.schemas.session import SessionHistoryResponse
+
+router = APIRouter()
+
+
+def get_db():
+    """Open a database session for this request and close it afterward."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@router.get("/{device_id}", response_model=HomeFeedResponse)
+def home_feed(
+    device_id: int,
+    timezone_name: str = Query(default="UTC", alias="timezone", max_length=100),
+    history_limit: int = Query(default=10, ge=1, le=50),
+    continue_limit: int = Query(default=3, ge=1, le=10),
+    recommendation_limit: int = Query(default=3, ge=1, le=5),
+    db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_optional_user),
+):
+    """Return every home screen section for the signed-in user or device."""
+    timezone = parse_timezone(timezone_name)
+    owner = user_owner(current_user.id) if current_user is not None else device_owner(device_id)
+    variant = (timezone.key, history_limit, continue_limit, recommendation_limit)
+    cached = home_feed_cache.get(owner, variant)
+    if cached is not None:
+        return cached
+
+    built_since = home_feed_cache.now()
+    feed = build_home_feed(
+        db,
+        device_id,
+        current_user,
+        timezone,
+        history_limit=history_limit,
+        continue_limit=continue_limit,
+        recommendation_limit=recommendation_limit,
+    )
+    home_feed_cache.set(owner, variant, feed, built_since)
+    return feed
+
+
+def build_home_feed(
+    db: Session,
+    device_id: int,
+    current_user: User | None,
+    timezone: ZoneInfo,
+    *,
+    history_limit: int,
+    continue_limit: int,
+    recommendation_limit: int,
+) -> HomeFeedResponse:
+    """Load the owner's sessions once and build every home section from them."""
+    session_query = db.query(MeditationSession, Meditation).join(
+        Meditation,
+        Meditation.id == MeditationSession.meditation_id,
+    )
+    if current_user is not None:
+        session_query = session_query.filter(MeditationSession.user_id == current_user.id)
+    else:
+        session_query = session_query.filter(
+            MeditationSession.user_id.is_(None),
+            MeditationSession.device_id == device_id,
+        )
+    session_rows = session_query.order_by(*PROGRAM_SESSION_ORDER).all()
+    listened_rows = [
+        (meditation_session, meditation)
+        for meditation_session, meditation in session_rows
+        if meditation_session.seconds_listened > 0
+    ]
+
+    progress = build_progress_summary(
+        db,
+        [meditation_session for meditation_session, _ in listened_rows],
+        timezone,
+    )
+
+    recent_rows = sorted(
+        listened_rows,
+        key=lambda row: (last_activity_at(row[0]), row[0].id),
+        reverse=True,
+    )
+    history = SessionHistoryResponse(
+        items=[
+            history_item(meditation_session, meditation)
+            for meditation_session, meditation in recent_rows[:history_limit]
+        ],
+        total=len(recent_rows),
+        limit=history_limit,
+        offset=0,
+    )
+    continue_listening = [
+        history_item(meditation_session, meditation)
+        for meditation_session, meditation in recent_rows
+        if meditation_session.completed_at is None
+        and meditation_session.last_position_sec > 0
+        and meditation.is_published
+        and meditation.audio_url
+    ][:continue_limit]
+
+    preference = None
+    favorite_rows = []
+    programs = []
+    if current_user is not None:
+        preference = db.query(UserPreference).filter(
+            UserPreference.user_id == current_user.id
+        ).first()
+        favorite_rows = db.query(UserFavorite, Meditation).join(
+            Meditation,
+            Meditation.id == UserFavorite.meditation_id,
+        ).filter(
+            UserFavorite.user_id == current_user.id,
+            Meditation.is_published.is_(True),
+        ).order_by(UserFavorite.created_at.desc(), UserFavorite.id.desc()).all()
+        programs = enrolled_programs(db, current_user, session_rows)
+
+    favorite_items = [
+        favorite_response(favorite, meditation)
+        for favorite, meditation in favorite_rows
+    ]
+    # Recommendations use the local ranking so the home screen never waits on
+    # the AI provider; Explore still asks it through /ai/recommendations.
+    context = build_user_context(
+        preference,
+        {item.meditation_id for item in favorite_items},
+        listened_rows,
+    )
+    recommendations = deterministic_recommendations(
+        recommendation_candidates(db),
+        "",
+        context,
+        recommendation_limit,
+    )
+
+    feed = HomeFeedResponse(
+        progress=progress,
+        continue_listening=continue_listening,
+        history=history,
+        favorites=FavoriteListResponse(
+            items=favorite_items,
+            meditation_ids=[item.meditation_id for item in favorite_items],
+        ),
+        programs=programs,
+        recommendations=recommendations,
+    )
+    if programs:
+        # Save program completion dates, as list_my_programs does.
+        db.commit()
+    return feed
+
+
+def enrolled_programs(
+    db: Session,
+    current_user: User,
+    session_rows: list[tuple[MeditationSession, Meditation]],
+) -> list[UserProgramRead]:
+    """Build the user's started programs from already loaded sessions.
+
+    All enrolled programs' meditations are loaded in one query instead of one
+    query per program. Completion dates are updated in the session for the
+    caller to commit.
+    """
+    rows = db.query(UserProgram, Program).join(
+        Program,
+        Program.id == UserProgram.program_id,
+    ).filter(
+        UserProgram.user_id == current_user.id,
+        Program.is_published.is_(True),
+    ).order_by(UserProgram.started_at.desc()).all()
+    if not rows:
+        return []
+
+    program_items = db.query(ProgramMeditation, Meditation).join(
+        Meditation,
+        Meditation.id == ProgramMeditation.meditation_id,
+    ).filter(
+        ProgramMeditation.program_id.in_([program.id for _, program in rows]),
+        Meditation.is_published.is_(True),
+    ).order_by(ProgramMeditation.program_id, ProgramMeditation.position.asc()).all()
+    meditations_by_program = defaultdict(list)
+    for item, meditation in program_items:
+        meditations_by_program[item.program_id].append((item, meditation))
+
+    # session_rows are already in PROGRAM_SESSION_ORDER.
+    sessions_by_program = defaultdict(list)
+    for meditation_session, _ in session_rows:
+        if meditation_session.program_id is not None:
+            sessions_by_program[meditation_session.program_id].append(meditation_session)
+
+    return [
+        UserProgramRead(
+            id=enrollment.id,
+            user_id=enrollment.user_id,
+            program_id=enrollment.program_id,
+            started_at=enrollment.started_at,
+            program=build_program_read(
+                program,
+                meditations_by_program[program.id],
+                sessions_by_program[program.id],
+                enrollment,
+            ),
+            completed_at=enrollment.completed_at,
+        )
+        for enrollment, program in rows
+    ]
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 
 from app.core.dependencies import get_current_user
+from app.core.home_cache import home_feed_cache
 from app.db.session import SessionLocal
 from app.models.preference import UserPreference
 from app.models.user import User
@@ -53,5 +54,6 @@ def update_my_preferences(
     preference.updated_at = func.now()
 
     db.commit()
+    home_feed_cache.invalidate(user_id=current_user.id)
     db.refresh(preference)
     return preference
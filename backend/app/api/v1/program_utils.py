@@ -13,6 +13,15 @@ from app.schemas.program import (
 )
 
 
+# Most recently played first; the first unfinished session picks the
+# meditation a program resumes with.
+PROGRAM_SESSION_ORDER = (
+    MeditationSession.last_listened_at.desc().nullslast(),
+    MeditationSession.started_at.desc(),
+    MeditationSession.id.desc(),
+)
+
+
 def update_enrollment_completion(
     enrollment: UserProgram,
     completed_meditations: int,
@@ -41,45 +50,47 @@ def program_to_read(
         ProgramMeditation.program_id == program.id,
         Meditation.is_published.is_(True),
     ).order_by(ProgramMeditation.position.asc()).all()
+    program_sessions = []
+    if current_user is not None and enrollment is not None and rows:
+        program_sessions = db.query(
+            MeditationSession.meditation_id,
+            MeditationSession.completed_at,
+        ).filter(
+            MeditationSession.user_id == current_user.id,
+            MeditationSession.program_id == program.id,
+        ).order_by(*PROGRAM_SESSION_ORDER).all()
+    result = build_program_read(program, rows, program_sessions, enrollment)
+    if enrollment is not None:
+        db.flush()
+    return result
+
+
+def build_program_read(
+    program: Program,
+    rows: list[tuple[ProgramMeditation, Meditation]],
+    program_sessions: list,
+    enrollment: UserProgram | None,
+) -> ProgramRead:
+    """Build a program response from already loaded meditations and sessions.
+
+    ``program_sessions`` are the enrolled user's sessions in this program,
+    most recently played first, as ordered by PROGRAM_SESSION_ORDER.
+    """
     meditation_ids = [meditation.id for _, meditation in rows]
+    listed_ids = set(meditation_ids)
     started_ids = set()
     completed_ids = set()
+    recent_incomplete_meditation_id = None
     is_enrolled = enrollment is not None
-    if current_user is not None and is_enrolled and meditation_ids:
-        started_ids = {
-            item[0]
-            for item in db.query(MeditationSession.meditation_id).filter(
-                MeditationSession.user_id == current_user.id,
-                MeditationSession.program_id == program.id,
-                MeditationSession.meditation_id.in_(meditation_ids),
-            ).distinct().all()
-        }
-        completed_ids = {
-            item[0]
-            for item in db.query(MeditationSession.meditation_id).filter(
-                MeditationSession.user_id == current_user.id,
-                MeditationSession.program_id == program.id,
-                MeditationSession.meditation_id.in_(meditation_ids),
-                MeditationSession.completed_at.isnot(None),
-            ).distinct().all()
-        }
-        recent_incomplete_session = db.query(MeditationSession).filter(
-            MeditationSession.user_id == current_user.id,
-            MeditationSession.program_id == program.id,
-            MeditationSession.meditation_id.in_(meditation_ids),
-            MeditationSession.completed_at.is_(None),
-        ).order_by(
-            MeditationSession.last_listened_at.desc().nullslast(),
-            MeditationSession.started_at.desc(),
-            MeditationSession.id.desc(),
-        ).first()
-        recent_incomplete_meditation_id = (
-            recent_incomplete_session.meditation_id
-            if recent_incomplete_session is not None
-            else None
-        )
-    else:
-        recent_incomplete_meditation_id = None
+    if is_enrolled:
+        for meditation_session in program_sessions:
+            if meditation_session.meditation_id not in listed_ids:
+                continue
+            started_ids.add(meditation_session.meditation_id)
+            if meditation_session.completed_at is not None:
+                completed_ids.add(meditation_session.meditation_id)
+            elif recent_incomplete_meditation_id is None:
+                recent_incomplete_meditation_id = meditation_session.meditation_id
     total_meditations = len(meditation_ids)
     completed_meditations = len(completed_ids)
     if enrollment is not None:
@@ -88,7 +99,6 @@ def program_to_read(
             completed_meditations,
             total_meditations,
         )
-        db.flush()
     completion_percent = (
         round((completed_meditations / total_meditations) * 100)
         if total_meditations
@@ -121,6 +131,7 @@ def program_to_read(
         title=program.title,
         description=program.description,
         artwork_url=program.artwork_url,
+        artwork_variants=program.artwork_variants or {},
         level=program.level,
         goal=program.goal,
         is_published=program.is_published,
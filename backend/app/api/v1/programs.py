@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from app.api.v1.program_utils import program_to_read
 from app.core.dependencies import get_current_user, get_optional_user
+from app.core.home_cache import home_feed_cache
 from app.db.session import SessionLocal
 from app.models.program import Program, UserProgram
 from app.models.user import User
@@ -146,6 +147,7 @@ def start_program(
         )
         db.add(enrollment)
         db.commit()
+        home_feed_cache.invalidate(user_id=current_user.id)
         db.refresh(enrollment)
 
     program_response = program_to_read(
@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 from app.api.v1 import sessions
 
-from app.api.v1 import ai, favorites, health, meditations, preferences, programs, reminders
+from app.api.v1 import ai, favorites, health, home, meditations, preferences, programs, reminders
+from app.api.v1.admin import media as admin_media
+from app.api.v1.admin import metrics as admin_metrics
 from app.api.v1.admin import meditations as admin_meditations
 from app.api.v1.admin import programs as admin_programs
 from app.api.v1 import auth
@@ -38,6 +40,18 @@ api_router.include_router(
     tags=["Admin"],
 )
 
+api_router.include_router(
+    admin_media.router,
+    prefix="/admin/media",
+    tags=["Admin"],
+)
+
+api_router.include_router(
+    admin_metrics.router,
+    prefix="/admin/metrics",
+    tags=["Admin"],
+)
+
 api_router.include_router(
     sessions.router,
     prefix="/sessions",
@@ -73,3 +87,9 @@ api_router.include_router(
     prefix="/ai",
     tags=["AI"],
 )
+
+api_router.include_router(
+    home.router,
+    prefix="/home",
+    tags=["Home"],
+)
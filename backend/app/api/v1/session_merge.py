@@ -0,0 +1,166 @@
+from sqlalchemy import and_, case, delete, literal_column, or_, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.api.v1.program_utils import program_to_read
+from app.models.meditation import Meditation
+from app.models.program import Program, UserProgram
+from app.models.session import MeditationSession, MeditationSessionActivity
+from app.models.user import User
+from app.schemas.session import DeviceSyncResponse
+
+
+def open_session_program_key(detached_program=None):
+    """Return the program part of the unfinished-session uniqueness key.
+
+    Sessions outside a program share key 0. Sessions matching the optional
+    ``detached_program`` condition are treated as outside a program too,
+    which is what they become once their program is cleared.
+    """
+    program_column = MeditationSession.program_id
+    if detached_program is not None:
+        program_column = case((detached_program, None), else_=program_column)
+    # A plain 0 keeps the expression identical to the index definition, so
+    # ON CONFLICT can infer the index from it.
+    return func.coalesce(program_column, literal_column("0"))
+
+
+def collapse_open_sessions(
+    db: Session,
+    *criteria,
+    single_owner: bool = False,
+    detached_program=None,
+) -> int:
+    """Fold unfinished sessions that share an owner, meditation, and program.
+
+    Only one unfinished session per owner, meditation, and program may exist.
+    The most recently played session in each group is kept so its resume
+    position survives. It takes over the others' activity and listening time,
+    capped at the meditation's duration like heartbeats are, and the others
+    are deleted. With ``single_owner`` every matching session is treated as
+    having the same owner, and sessions matching ``detached_program`` as
+    having no program. Returns the number of sessions removed.
+    """
+    owner_key = () if single_owner else (
+        MeditationSession.user_id,
+        case((MeditationSession.user_id.is_(None), MeditationSession.device_id)),
+    )
+    ranked = select(
+        MeditationSession.id,
+        MeditationSession.seconds_listened,
+        MeditationSession.last_listened_at,
+        func.first_value(MeditationSession.id).over(
+            partition_by=(
+                *owner_key,
+                MeditationSession.meditation_id,
+                open_session_program_key(detached_program),
+            ),
+            order_by=(
+                MeditationSession.last_listened_at.desc().nullslast(),
+                MeditationSession.started_at.desc(),
+                MeditationSession.id.desc(),
+            ),
+        ).label("keeper_id"),
+    ).where(
+        MeditationSession.completed_at.is_(None),
+        *criteria,
+    ).subquery("ranked")
+    duplicates = select(ranked.c.id, ranked.c.keeper_id).where(
+        ranked.c.id != ranked.c.keeper_id,
+    ).subquery("duplicates")
+    totals = select(
+        ranked.c.keeper_id,
+        func.sum(ranked.c.seconds_listened).label("seconds_listened"),
+        func.max(ranked.c.last_listened_at).label("last_listened_at"),
+    ).group_by(ranked.c.keeper_id).having(func.count() > 1).subquery("totals")
+
+    # Each statement ranks the sessions again. None of them changes the
+    # ordering, so all three agree on which session is kept.
+    db.execute(
+        update(MeditationSession)
+        .where(
+            MeditationSession.id == totals.c.keeper_id,
+            Meditation.id == MeditationSession.meditation_id,
+        )
+        .values(
+            seconds_listened=func.least(totals.c.seconds_listened, Meditation.duration_sec),
+            last_listened_at=totals.c.last_listened_at,
+        )
+    )
+    db.execute(
+        update(MeditationSessionActivity)
+        .where(MeditationSessionActivity.session_id == duplicates.c.id)
+        .values(session_id=duplicates.c.keeper_id)
+    )
+    return db.execute(
+        delete(MeditationSession).where(
+            MeditationSession.id.in_(select(duplicates.c.id)),
+        )
+    ).rowcount
+
+
+def merge_device_sessions(db: Session, user: User, device_id: int) -> DeviceSyncResponse:
+    """Move a device's anonymous listening history into a user's account.
+
+    Every step is a set-based statement in the caller's transaction: fold
+    unfinished duplicates across the device and the account, drop program
+    context the user is not enrolled in, attach the device's sessions, and
+    refresh program completion. Progress and streaks are computed from
+    sessions on each read, so there is no stored rollup to rebuild afterward.
+    """
+    result = DeviceSyncResponse(device_id=device_id, user_id=user.id)
+    is_device_session = and_(
+        MeditationSession.user_id.is_(None),
+        MeditationSession.device_id == device_id,
+    )
+
+    # Anonymous plays never carry a program, but sessions left behind by a
+    # deleted account can. Keep program context only where this user is
+    # enrolled.
+    loses_program = and_(
+        is_device_session,
+        MeditationSession.program_id.is_not(None),
+        MeditationSession.program_id.not_in(
+            select(UserProgram.program_id).where(UserProgram.user_id == user.id)
+        ),
+    )
+
+    # Playing the same meditation on the device and after signing in leaves
+    # two unfinished sessions, and only one may remain once they share an
+    # owner. Sessions about to lose their program are grouped without it.
+    result.removed_duplicate_sessions = collapse_open_sessions(
+        db,
+        or_(MeditationSession.user_id == user.id, is_device_session),
+        MeditationSession.meditation_id.in_(
+            select(MeditationSession.meditation_id).where(
+                is_device_session,
+                MeditationSession.completed_at.is_(None),
+            )
+        ),
+        single_owner=True,
+        detached_program=loses_program,
+    )
+    result.detached_program_sessions = db.execute(
+        update(MeditationSession).where(loses_program).values(program_id=None)
+    ).rowcount
+    attached = db.execute(
+        update(MeditationSession)
+        .where(is_device_session)
+        .values(user_id=user.id)
+        .returning(MeditationSession.program_id)
+    ).all()
+    result.attached_sessions = len(attached)
+
+    # Refresh completion of the enrolled programs the sessions count toward.
+    program_ids = {program_id for program_id, in attached if program_id is not None}
+    if program_ids:
+        rows = db.query(UserProgram, Program).join(
+            Program,
+            and_(Program.id == UserProgram.program_id, Program.is_published.is_(True)),
+        ).filter(
+            UserProgram.user_id == user.id,
+            UserProgram.program_id.in_(program_ids),
+        ).all()
+        for enrollment, program in rows:
+            program_to_read(db, program, current_user=user, enrollment=enrollment)
+    return result
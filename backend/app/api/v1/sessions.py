@@ -2,13 +2,18 @@ from collections import defaultdict
 from datetime import UTC, date, datetime, timedelta
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from sqlalchemy import Date, and_, cast, false, literal, or_, select, union_all
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 
 from app.api.v1.program_utils import sync_user_programs_for_meditation
+from app.api.v1.session_merge import merge_device_sessions, open_session_program_key
 from app.core.dependencies import get_current_user, get_optional_user
+from app.core.home_cache import home_feed_cache
 from app.db.session import SessionLocal
 from app.models.meditation import Meditation
 from app.models.program import Program, ProgramMeditation, UserProgram
@@ -77,8 +82,6 @@ def get_owned_session(
     meditation_session = query.first()
     if meditation_session is None:
         raise HTTPException(status_code=404, detail="Session not found")
-    if current_user is not None and meditation_session.user_id is None:
-        meditation_session.user_id = current_user.id
     return meditation_session
 
 
@@ -97,6 +100,14 @@ def owned_sessions_query(
     )
 
 
+def invalidate_home_feed(device_id: int, current_user: User | None) -> None:
+    """Drop the cached home feed of whoever owns the changed sessions."""
+    if current_user is not None:
+        home_feed_cache.invalidate(user_id=current_user.id)
+    else:
+        home_feed_cache.invalidate(device_id=device_id)
+
+
 def get_meditation_duration(db: Session, meditation_id: int) -> int:
     """Return the saved duration for a meditation."""
     duration = db.query(Meditation.duration_sec).filter(
@@ -183,6 +194,105 @@ def as_local_date(value: datetime, timezone: ZoneInfo) -> date:
     return value.astimezone(timezone).date()
 
 
+def daily_seconds_in_python(
+    db: Session,
+    sessions: list[MeditationSession],
+    timezone: ZoneInfo,
+) -> dict[date, int]:
+    """Total listening seconds per local day by converting each activity row."""
+    activity_by_date: dict[date, int] = defaultdict(int)
+    activity_seconds_by_session: dict[int, int] = defaultdict(int)
+
+    # Activity is never recorded before its session starts, so this bound
+    # lets PostgreSQL skip monthly partitions older than the first session.
+    first_started_at = min(item.started_at for item in sessions)
+    activities = db.query(
+        MeditationSessionActivity.session_id,
+        MeditationSessionActivity.seconds_listened,
+        MeditationSessionActivity.recorded_at,
+    ).filter(
+        MeditationSessionActivity.session_id.in_([item.id for item in sessions]),
+        MeditationSessionActivity.recorded_at >= first_started_at,
+    ).all()
+    for activity in activities:
+        activity_date = as_local_date(activity.recorded_at, timezone)
+        activity_by_date[activity_date] += activity.seconds_listened
+        activity_seconds_by_session[activity.session_id] += activity.seconds_listened
+
+    # Sessions that began before event tracking may have only part of their
+    # mindful time represented by activity rows. Reconcile the residual once.
+    for meditation_session in sessions:
+        residual_seconds = max(
+            0,
+            meditation_session.seconds_listened
+            - activity_seconds_by_session[meditation_session.id],
+        )
+        if residual_seconds == 0:
+            continue
+        fallback_timestamp = (
+            meditation_session.completed_at
+            or meditation_session.last_listened_at
+            or meditation_session.started_at
+        )
+        activity_by_date[as_local_date(fallback_timestamp, timezone)] += residual_seconds
+    return dict(activity_by_date)
+
+
+def daily_seconds_in_sql(
+    db: Session,
+    sessions: list[MeditationSession],
+    timezone: ZoneInfo,
+) -> dict[date, int]:
+    """Total listening seconds per local day, grouped by PostgreSQL.
+
+    Returns the same totals as daily_seconds_in_python, including the residual
+    for sessions with incomplete activity, but only one row per local day
+    comes back from the database.
+    """
+    owned = select(
+        MeditationSession.id,
+        MeditationSession.seconds_listened,
+        func.coalesce(
+            MeditationSession.completed_at,
+            MeditationSession.last_listened_at,
+            MeditationSession.started_at,
+        ).label("fallback_at"),
+    ).where(MeditationSession.id.in_([item.id for item in sessions])).cte("owned")
+    activity = select(
+        MeditationSessionActivity.session_id,
+        MeditationSessionActivity.seconds_listened,
+        MeditationSessionActivity.recorded_at,
+    ).join(owned, owned.c.id == MeditationSessionActivity.session_id).where(
+        MeditationSessionActivity.recorded_at >= min(item.started_at for item in sessions),
+    ).cte("activity")
+    activity_by_session = select(
+        activity.c.session_id,
+        func.sum(activity.c.seconds_listened).label("seconds"),
+    ).group_by(activity.c.session_id).cte("activity_by_session")
+    recorded_seconds = func.coalesce(activity_by_session.c.seconds, 0)
+    residual = select(
+        owned.c.fallback_at,
+        owned.c.seconds_listened - recorded_seconds,
+    ).outerjoin_from(
+        owned,
+        activity_by_session,
+        activity_by_session.c.session_id == owned.c.id,
+    ).where(owned.c.seconds_listened > recorded_seconds)
+    listening = union_all(
+        select(activity.c.recorded_at, activity.c.seconds_listened),
+        residual,
+    ).subquery("listening")
+    local_days = select(
+        cast(func.timezone(timezone.key, listening.c.recorded_at), Date).label("local_date"),
+        listening.c.seconds_listened,
+    ).subquery("local_days")
+    rows = db.execute(
+        select(local_days.c.local_date, func.sum(local_days.c.seconds_listened))
+        .group_by(local_days.c.local_date)
+    ).all()
+    return {local_date: int(seconds) for local_date, seconds in rows}
+
+
 def calculate_streaks(qualifying_dates: set[date], today: date) -> tuple[int, int]:
     """Calculate the current and longest streak from active practice dates."""
     if not qualifying_dates:
@@ -214,9 +324,165 @@ def calculate_streaks(qualifying_dates: set[date], today: date) -> tuple[int, in
     return current_streak, longest_streak
 
 
+def last_activity_at(meditation_session: MeditationSession) -> datetime:
+    """Return when a session was last listened to, completed, or started."""
+    return (
+        meditation_session.last_listened_at
+        or meditation_session.completed_at
+        or meditation_session.started_at
+    )
+
+
+def history_item(
+    meditation_session: MeditationSession,
+    meditation: Meditation,
+) -> SessionHistoryItem:
+    """Build one listening history row."""
+    progress_percent = min(
+        100,
+        round(
+            meditation_session.last_position_sec
+            / max(meditation.duration_sec, 1)
+            * 100
+        ),
+    )
+    return SessionHistoryItem(
+        id=meditation_session.id,
+        meditation_id=meditation.id,
+        title=meditation.title,
+        category=meditation.category,
+        teacher_name=meditation.teacher_name,
+        artwork_url=meditation.artwork_url,
+        meditation_duration_sec=meditation.duration_sec,
+        seconds_listened=meditation_session.seconds_listened,
+        last_position_sec=meditation_session.last_position_sec,
+        progress_percent=progress_percent,
+        started_at=meditation_session.started_at,
+        last_activity_at=last_activity_at(meditation_session),
+        completed_at=meditation_session.completed_at,
+        is_completed=meditation_session.completed_at is not None,
+    )
+
+
+def preferred_audio_quality(request: Request, requested: str | None) -> str:
+    """Choose an audio rendition from the request body or network client hints."""
+    if requested:
+        return requested
+    if request.headers.get("save-data", "").strip().lower() == "on":
+        return "low"
+    effective_type = request.headers.get("ect", "").strip().lower()
+    if effective_type in {"slow-2g", "2g"}:
+        return "low"
+    if effective_type == "3g":
+        return "medium"
+    return "high"
+
+
+def select_audio_url(meditation: Meditation, quality: str) -> str | None:
+    """Return the rendition URL for a quality, falling back to the original."""
+    renditions = meditation.audio_renditions or {}
+    if quality == "original":
+        return meditation.audio_url
+    return renditions.get(quality) or meditation.audio_url
+
+
+def session_response(
+    meditation_session: MeditationSession,
+    meditation: Meditation,
+    audio_url: str | None,
+) -> SessionRead:
+    """Build a session response that includes the audio to play."""
+    response = SessionRead.model_validate(meditation_session)
+    response.audio_url = audio_url
+    response.hls_manifest_url = meditation.hls_manifest_url
+    return response
+
+
+def upsert_open_session(
+    db: Session,
+    payload: SessionStart,
+    program_id: int | None,
+    current_user: User | None,
+    start_key: str | None,
+) -> MeditationSession:
+    """Create an unfinished session or return the open one in a single statement.
+
+    The unique open-session indexes decide whether a row is inserted, so
+    concurrent starts share one session. A start retried with the same
+    idempotency key returns its original session, even once completed. An
+    open session keeps the first key it was started with.
+    """
+    if current_user is not None:
+        owner = MeditationSession.user_id == current_user.id
+        owner_columns = [MeditationSession.user_id]
+        owner_where = MeditationSession.user_id.is_not(None)
+    else:
+        owner = and_(
+            MeditationSession.user_id.is_(None),
+            MeditationSession.device_id == payload.device_id,
+        )
+        owner_columns = [MeditationSession.device_id]
+        owner_where = MeditationSession.user_id.is_(None)
+
+    columns = MeditationSession.__table__.c
+    values = {
+        "meditation_id": payload.meditation_id,
+        "program_id": program_id,
+        "device_id": payload.device_id,
+        "user_id": current_user.id if current_user is not None else None,
+        "start_key": start_key,
+    }
+    # Without a key nothing can be replayed; comparing with None would match
+    # every session that was started without one.
+    is_replay = and_(MeditationSession.start_key == start_key, owner) if start_key else false()
+
+    def on_open_session_conflict(insert_statement):
+        return insert_statement.on_conflict_do_update(
+            index_elements=[*owner_columns, MeditationSession.meditation_id, open_session_program_key()],
+            index_where=and_(MeditationSession.completed_at.is_(None), owner_where),
+            set_={
+                "start_key": func.coalesce(
+                    MeditationSession.start_key,
+                    insert_statement.excluded.start_key,
+                ),
+            },
+        ).returning(*columns)
+
+    if db.get_bind().dialect.name == "sqlite":
+        # SQLite cannot run an INSERT inside a CTE, so the replay lookup is a
+        # separate statement. It serializes writers, so nothing slips between.
+        replayed_session = db.execute(
+            select(MeditationSession).where(is_replay)
+        ).scalar_one_or_none()
+        if replayed_session is not None:
+            return replayed_session
+        started = on_open_session_conflict(sqlite_insert(MeditationSession).values(values))
+        return db.execute(
+            select(MeditationSession).from_statement(started),
+            execution_options={"populate_existing": True},
+        ).scalar_one()
+
+    replayed = select(*columns).where(is_replay).cte("replayed")
+    insert_statement = postgresql_insert(MeditationSession).from_select(
+        list(values),
+        select(
+            *(literal(value, columns[name].type) for name, value in values.items())
+        ).where(~select(replayed.c.id).exists()),
+        include_defaults=False,
+    )
+    started = on_open_session_conflict(insert_statement).cte("started")
+    return db.execute(
+        select(MeditationSession).from_statement(
+            union_all(select(started), select(replayed))
+        )
+    ).scalar_one()
+
+
 @router.post("/start", response_model=SessionRead)
 def start_session(
     payload: SessionStart,
+    request: Request,
+    idempotency_key: str | None = Header(default=None, max_length=64),
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_optional_user),
 ):
@@ -230,51 +496,29 @@ def start_session(
     if not meditation.audio_url:
         raise HTTPException(status_code=409, detail="Meditation audio is unavailable")
     program_id = validate_program_context(db, payload, current_user)
-
-    existing_query = db.query(MeditationSession).filter(
-        MeditationSession.meditation_id == payload.meditation_id,
-        MeditationSession.completed_at.is_(None),
+    audio_url = select_audio_url(
+        meditation,
+        preferred_audio_quality(request, payload.audio_quality),
     )
-    if program_id is None:
-        existing_query = existing_query.filter(MeditationSession.program_id.is_(None))
-    else:
-        existing_query = existing_query.filter(MeditationSession.program_id == program_id)
-    if current_user is not None:
-        existing_query = existing_query.filter(
-            or_(
-                MeditationSession.user_id == current_user.id,
-                (
-                    (MeditationSession.user_id.is_(None))
-                    & (MeditationSession.device_id == payload.device_id)
-                ),
-            )
-        )
-    else:
-        existing_query = existing_query.filter(
-            MeditationSession.user_id.is_(None),
-            MeditationSession.device_id == payload.device_id,
-        )
 
-    existing_session = existing_query.order_by(
-        MeditationSession.started_at.desc()
-    ).first()
-    if existing_session is not None:
-        if current_user is not None and existing_session.user_id is None:
-            existing_session.user_id = current_user.id
-            db.commit()
-            db.refresh(existing_session)
-        return existing_session
-
-    meditation_session = MeditationSession(
-        meditation_id=payload.meditation_id,
-        program_id=program_id,
-        device_id=payload.device_id,
-        user_id=current_user.id if current_user is not None else None,
-    )
-    db.add(meditation_session)
-    db.commit()
-    db.refresh(meditation_session)
-    return meditation_session
+    try:
+        meditation_session = upsert_open_session(
+            db,
+            payload,
+            program_id,
+            current_user,
+            idempotency_key,
+        )
+        response = session_response(meditation_session, meditation, audio_url)
+        db.commit()
+    except IntegrityError as error:
+        db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="Idempotency key was already used for another session",
+        ) from error
+    invalidate_home_feed(payload.device_id, current_user)
+    return response
 
 
 @router.patch("/{session_id}/progress", response_model=SessionRead)
@@ -297,6 +541,7 @@ def update_progress(
     duration_sec = get_meditation_duration(db, meditation_session.meditation_id)
     apply_progress(db, meditation_session, payload, duration_sec)
     db.commit()
+    invalidate_home_feed(payload.device_id, current_user)
     db.refresh(meditation_session)
     return meditation_session
 
@@ -331,6 +576,7 @@ def complete_session(
             meditation_session.program_id,
         )
     db.commit()
+    invalidate_home_feed(payload.device_id, current_user)
     db.refresh(meditation_session)
     return meditation_session
 
@@ -347,38 +593,25 @@ def progress_summary(
     sessions = owned_sessions_query(db, device_id, current_user).filter(
         MeditationSession.seconds_listened > 0,
     ).all()
+    return build_progress_summary(db, sessions, timezone)
+
 
+def build_progress_summary(
+    db: Session,
+    sessions: list[MeditationSession],
+    timezone: ZoneInfo,
+) -> ProgressSummary:
+    """Summarize mindful time and streaks from sessions with listening time."""
     total_seconds = sum(item.seconds_listened for item in sessions)
     completed_sessions = sum(item.completed_at is not None for item in sessions)
-    session_ids = [item.id for item in sessions]
-    activity_by_date: dict[date, int] = defaultdict(int)
-    activity_seconds_by_session: dict[int, int] = defaultdict(int)
-
-    if session_ids:
-        activities = db.query(MeditationSessionActivity).filter(
-            MeditationSessionActivity.session_id.in_(session_ids)
-        ).all()
-        for activity in activities:
-            activity_date = as_local_date(activity.recorded_at, timezone)
-            activity_by_date[activity_date] += activity.seconds_listened
-            activity_seconds_by_session[activity.session_id] += activity.seconds_listened
-
-    # Sessions that began before event tracking may have only part of their
-    # mindful time represented by activity rows. Reconcile the residual once.
-    for meditation_session in sessions:
-        residual_seconds = max(
-            0,
-            meditation_session.seconds_listened
-            - activity_seconds_by_session[meditation_session.id],
-        )
-        if residual_seconds == 0:
-            continue
-        fallback_timestamp = (
-            meditation_session.completed_at
-            or meditation_session.last_listened_at
-            or meditation_session.started_at
-        )
-        activity_by_date[as_local_date(fallback_timestamp, timezone)] += residual_seconds
+    # PostgreSQL groups activity by local day itself; other databases, such
+    # as SQLite in local experiments, fall back to converting rows in Python.
+    if not sessions:
+        activity_by_date: dict[date, int] = {}
+    elif db.get_bind().dialect.name == "postgresql":
+        activity_by_date = daily_seconds_in_sql(db, sessions, timezone)
+    else:
+        activity_by_date = daily_seconds_in_python(db, sessions, timezone)
 
     completed_dates = {
         as_local_date(item.completed_at, timezone)
@@ -452,40 +685,10 @@ def session_history(
         MeditationSession.id.desc(),
     ).offset(offset).limit(limit).all()
 
-    items = []
-    for meditation_session, meditation in rows:
-        last_activity_at = (
-            meditation_session.last_listened_at
-            or meditation_session.completed_at
-            or meditation_session.started_at
-        )
-        progress_percent = min(
-            100,
-            round(
-                meditation_session.last_position_sec
-                / max(meditation.duration_sec, 1)
-                * 100
-            ),
-        )
-        items.append(
-            SessionHistoryItem(
-                id=meditation_session.id,
-                meditation_id=meditation.id,
-                title=meditation.title,
-                category=meditation.category,
-                teacher_name=meditation.teacher_name,
-                artwork_url=meditation.artwork_url,
-                meditation_duration_sec=meditation.duration_sec,
-                seconds_listened=meditation_session.seconds_listened,
-                last_position_sec=meditation_session.last_position_sec,
-                progress_percent=progress_percent,
-                started_at=meditation_session.started_at,
-                last_activity_at=last_activity_at,
-                completed_at=meditation_session.completed_at,
-                is_completed=meditation_session.completed_at is not None,
-            )
-        )
-
+    items = [
+        history_item(meditation_session, meditation)
+        for meditation_session, meditation in rows
+    ]
     return SessionHistoryResponse(
         items=items,
         total=total,
@@ -501,19 +704,10 @@ def sync_device_sessions(
     current_user: User = Depends(get_current_user),
 ):
     """Link anonymous listening sessions from this browser to the user."""
-    updated = db.query(MeditationSession).filter(
-        MeditationSession.device_id == payload.device_id,
-        MeditationSession.user_id.is_(None),
-    ).update(
-        {MeditationSession.user_id: current_user.id},
-        synchronize_session=False,
-    )
+    result = merge_device_sessions(db, current_user, payload.device_id)
     db.commit()
-    return DeviceSyncResponse(
-        device_id=payload.device_id,
-        user_id=current_user.id,
-        attached_sessions=updated,
-    )
+    home_feed_cache.invalidate(user_id=current_user.id, device_id=payload.device_id)
+    return result
 
 
 @router.get("/stats/{device_id}")
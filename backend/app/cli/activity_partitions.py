@@ -0,0 +1,202 @@
+"""Maintain the monthly partitions of meditation_session_activity.
+
+Run from the backend directory:
+
+  python -m app.cli.activity_partitions
+  python -m app.cli.activity_partitions --months-ahead 6
+  python -m app.cli.activity_partitions --detach-before 2025-01 --archive-dir /backups/activity
+
+Every run creates any missing partitions from the current month through
+--months-ahead, plus a partition for every month with rows in the default
+partition. Partitions for months before --detach-before are
+detached from the table. With --archive-dir, each detached partition is
+written there as a gzip-compressed CSV file and then dropped.
+"""
+import argparse
+import gzip
+import re
+from datetime import UTC, date, datetime
+from pathlib import Path
+
+from app.db.session import engine
+
+
+ACTIVITY_TABLE = "meditation_session_activity"
+DEFAULT_PARTITION = f"{ACTIVITY_TABLE}_default"
+PARTITION_NAME = re.compile(rf"^{ACTIVITY_TABLE}_p(\d{{4}})_(\d{{2}})$")
+
+
+def add_months(month: date, count: int) -> date:
+    """Return the first day of the month ``count`` months after ``month``."""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name the partition that holds one month of activity."""
+    return f"{ACTIVITY_TABLE}_p{month:%Y_%m}"
+
+
+def month_bounds(month: date) -> tuple[datetime, datetime]:
+    """Return the UTC start of a month and of the month after it."""
+    start = datetime(month.year, month.month, 1, tzinfo=UTC)
+    next_month = add_months(month, 1)
+    return start, datetime(next_month.year, next_month.month, 1, tzinfo=UTC)
+
+
+def parse_month(value: str) -> date:
+    """Read a YYYY-MM argument as the first day of that month."""
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError as error:
+        raise argparse.ArgumentTypeError("use the YYYY-MM format, for example 2025-01") from error
+
+
+def is_partitioned(cursor) -> bool:
+    """Check that the activity table has been migrated to partitions."""
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", (ACTIVITY_TABLE,))
+    row = cursor.fetchone()
+    return row is not None and row[0] == "p"
+
+
+def monthly_partitions(cursor) -> dict[date, str]:
+    """Return the attached monthly partitions keyed by the month they hold."""
+    cursor.execute(
+        """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = to_regclass(%s)
+        """,
+        (ACTIVITY_TABLE,),
+    )
+    partitions = {}
+    for (name,) in cursor.fetchall():
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def default_partition_months(cursor) -> list[date]:
+    """Return the months that have rows waiting in the default partition."""
+    cursor.execute(
+        f"""
+        SELECT DISTINCT date_trunc('month', recorded_at AT TIME ZONE 'UTC')::date
+        FROM {DEFAULT_PARTITION}
+        ORDER BY 1
+        """
+    )
+    return [month for (month,) in cursor.fetchall()]
+
+
+def create_partition(cursor, month: date) -> None:
+    """Add the partition for one month, moving any rows the default partition caught."""
+    name = partition_name(month)
+    start, end = month_bounds(month)
+    cursor.execute(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE recorded_at >= %s AND recorded_at < %s)",
+        (start, end),
+    )
+    if not cursor.fetchone()[0]:
+        cursor.execute(
+            f"CREATE TABLE {name} PARTITION OF {ACTIVITY_TABLE} FOR VALUES FROM (%s) TO (%s)",
+            (start, end),
+        )
+        return
+
+    # PostgreSQL refuses to add a partition whose range already has rows in
+    # the default partition, so move those rows into the new table first.
+    cursor.execute(f"CREATE TABLE {name} (LIKE {ACTIVITY_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    cursor.execute(
+        f"""
+        WITH moved AS (
+            DELETE FROM {DEFAULT_PARTITION}
+            WHERE recorded_at >= %s AND recorded_at < %s
+            RETURNING id, session_id, seconds_listened, recorded_at
+        )
+        INSERT INTO {name} (id, session_id, seconds_listened, recorded_at)
+        SELECT id, session_id, seconds_listened, recorded_at FROM moved
+        """,
+        (start, end),
+    )
+    cursor.execute(
+        f"ALTER TABLE {ACTIVITY_TABLE} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)",
+        (start, end),
+    )
+
+
+def archive_partition(cursor, name: str, directory: Path) -> Path:
+    """Write a detached partition to a compressed CSV file and drop it."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{name}.csv.gz"
+    with gzip.open(path, "wt", encoding="utf-8", newline="") as archive:
+        cursor.copy_expert(f"COPY {name} TO STDOUT WITH (FORMAT csv, HEADER)", archive)
+    cursor.execute(f"DROP TABLE {name}")
+    return path
+
+
+def main() -> None:
+    """Create upcoming partitions and retire old ones."""
+    parser = argparse.ArgumentParser(description="Maintain listening activity partitions.")
+    parser.add_argument("--months-ahead", type=int, default=3, help="future months to prepare")
+    parser.add_argument("--detach-before", type=parse_month, help="detach months before this YYYY-MM")
+    parser.add_argument("--archive-dir", type=Path, help="archive and drop detached partitions here")
+    parser.add_argument("--dry-run", action="store_true", help="print the changes without making them")
+    args = parser.parse_args()
+    if args.archive_dir and not args.detach_before:
+        parser.error("--archive-dir needs --detach-before")
+
+    this_month = datetime.now(UTC).date().replace(day=1)
+    if args.detach_before and args.detach_before > this_month:
+        parser.error("--detach-before cannot be later than the current month")
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        if not is_partitioned(cursor):
+            print(f"{ACTIVITY_TABLE} is not partitioned; run alembic upgrade head first")
+            return
+
+        partitions = monthly_partitions(cursor)
+        upcoming = [add_months(this_month, offset) for offset in range(args.months_ahead + 1)]
+        created = 0
+        for month in sorted(set(upcoming + default_partition_months(cursor))):
+            if month in partitions:
+                continue
+            print(f"Create {partition_name(month)}")
+            if not args.dry_run:
+                create_partition(cursor, month)
+                connection.commit()
+            partitions[month] = partition_name(month)
+            created += 1
+
+        detached = 0
+        archived = 0
+        if args.detach_before:
+            for month, name in sorted(partitions.items()):
+                if month >= args.detach_before:
+                    continue
+                print(f"Detach {name}")
+                if args.dry_run:
+                    detached += 1
+                    continue
+                cursor.execute(f"ALTER TABLE {ACTIVITY_TABLE} DETACH PARTITION {name}")
+                connection.commit()
+                detached += 1
+                if args.archive_dir:
+                    path = archive_partition(cursor, name, args.archive_dir)
+                    connection.commit()
+                    archived += 1
+                    print(f"Archived {name} to {path}")
+
+        print(
+            f"Activity partitions complete: created={created} detached={detached} "
+            f"archived={archived}{' (dry run)' if args.dry_run else ''}"
+        )
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
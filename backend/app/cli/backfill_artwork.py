@@ -0,0 +1,84 @@
+"""Build responsive artwork variants for meditations and programs.
+
+Run from the backend directory:
+
+  python -m app.cli.backfill_artwork
+  python -m app.cli.backfill_artwork --all
+"""
+import argparse
+from tempfile import SpooledTemporaryFile
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from app.db.session import SessionLocal
+from app.models.meditation import Meditation
+from app.models.program import Program
+from app.services.image_pipeline import ArtworkProcessingError, build_artwork_variants
+from app.services.s3_service import S3Service
+
+
+def backfill_model(db, s3: S3Service, model, rebuild_all: bool, dry_run: bool) -> tuple[int, int, int]:
+    """Build variants for one model's artwork and return built, skipped, and failed counts."""
+    built = 0
+    skipped = 0
+    failed = 0
+    label = model.__tablename__
+    rows = db.query(model.id, model.artwork_url, model.artwork_variants).filter(
+        model.artwork_url.is_not(None)
+    ).order_by(model.id.asc()).all()
+    # Nothing else is read inside this transaction, so release the connection
+    # while images download and encode.
+    db.rollback()
+    for row_id, artwork_url, artwork_variants in rows:
+        if artwork_variants and not rebuild_all:
+            continue
+        key = s3.key_from_url(artwork_url)
+        if key is None:
+            skipped += 1
+            print(f"Artwork skipped: {label} {row_id} is not stored in the media bucket")
+            continue
+        if dry_run:
+            built += 1
+            continue
+        try:
+            with SpooledTemporaryFile() as artwork_file:
+                s3.download_fileobj(key, artwork_file)
+                artwork_file.seek(0)
+                variants = build_artwork_variants(artwork_file, s3)
+        except (ArtworkProcessingError, BotoCoreError, ClientError, OSError) as error:
+            failed += 1
+            print(f"Artwork failed: {label} {row_id}: {error}")
+            continue
+
+        # Only save if the artwork was not replaced while this ran.
+        db.query(model).filter(
+            model.id == row_id,
+            model.artwork_url == artwork_url,
+        ).update({model.artwork_variants: variants}, synchronize_session=False)
+        db.commit()
+        built += 1
+    return built, skipped, failed
+
+
+def main() -> None:
+    """Backfill artwork variants from the command line."""
+    parser = argparse.ArgumentParser(description="Build responsive artwork variants.")
+    parser.add_argument("--all", action="store_true", help="rebuild artwork that already has variants")
+    parser.add_argument("--dry-run", action="store_true", help="list what would be built")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    s3 = S3Service()
+    try:
+        for model in (Meditation, Program):
+            built, skipped, failed = backfill_model(db, s3, model, args.all, args.dry_run)
+            print(
+                f"Artwork backfill for {model.__tablename__}: "
+                f"built={built} skipped={skipped} failed={failed}"
+            )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
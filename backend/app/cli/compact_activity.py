@@ -0,0 +1,149 @@
+"""Merge old listening heartbeats into fewer activity rows.
+
+Run from the backend directory, for example from a nightly cron job:
+
+  python -m app.cli.compact_activity
+  python -m app.cli.compact_activity --older-than-days 14 --batch-size 5000
+  python -m app.cli.compact_activity --dry-run
+
+Activity older than --older-than-days is merged per session and 15-minute UTC
+bucket into one row holding the summed seconds. Every timezone offset is a
+whole number of quarter hours, so a bucket never spans a local midnight and
+daily progress stays the same in every timezone. Each batch of sessions is
+compacted in its own transaction and rolled back if its total changes.
+"""
+import argparse
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import text
+
+from app.db.session import engine
+
+
+BUCKET = "date_bin(interval '15 minutes', recorded_at, timestamptz '2000-01-01 00:00:00+00')"
+
+SESSION_RANGE = text(
+    """
+    SELECT min(session_id), max(session_id)
+    FROM meditation_session_activity
+    WHERE recorded_at < :cutoff
+    """
+)
+BATCH_TOTAL = text(
+    """
+    SELECT coalesce(sum(seconds_listened), 0)
+    FROM meditation_session_activity
+    WHERE session_id BETWEEN :first_id AND :last_id AND recorded_at < :cutoff
+    """
+)
+MERGEABLE_ROWS = text(
+    f"""
+    SELECT coalesce(sum(row_count), 0), count(*)
+    FROM (
+        SELECT count(*) AS row_count
+        FROM meditation_session_activity
+        WHERE session_id BETWEEN :first_id AND :last_id AND recorded_at < :cutoff
+        GROUP BY session_id, {BUCKET}
+        HAVING count(*) > 1
+    ) AS buckets
+    """
+)
+# The merged row keeps the earliest timestamp in its bucket, so it stays in
+# the same monthly partition and never precedes its session's start.
+COMPACT_BATCH = text(
+    f"""
+    WITH merged AS (
+        DELETE FROM meditation_session_activity
+        WHERE session_id BETWEEN :first_id AND :last_id
+          AND recorded_at < :cutoff
+          AND (session_id, {BUCKET}) IN (
+              SELECT session_id, {BUCKET}
+              FROM meditation_session_activity
+              WHERE session_id BETWEEN :first_id AND :last_id AND recorded_at < :cutoff
+              GROUP BY session_id, {BUCKET}
+              HAVING count(*) > 1
+          )
+        RETURNING session_id, seconds_listened, recorded_at
+    ),
+    inserted AS (
+        INSERT INTO meditation_session_activity (session_id, seconds_listened, recorded_at)
+        SELECT session_id, sum(seconds_listened), min(recorded_at)
+        FROM merged
+        GROUP BY session_id, {BUCKET}
+        RETURNING 1
+    )
+    SELECT (SELECT count(*) FROM merged), (SELECT count(*) FROM inserted)
+    """
+)
+
+
+class CompactionMismatch(RuntimeError):
+    """Raised when compaction would change a batch's listening total."""
+
+
+def compact_batch(connection, first_id: int, last_id: int, cutoff: datetime) -> tuple[int, int]:
+    """Merge one range of sessions and return the rows removed and added."""
+    params = {"first_id": first_id, "last_id": last_id, "cutoff": cutoff}
+    seconds_before = connection.execute(BATCH_TOTAL, params).scalar_one()
+    removed, added = connection.execute(COMPACT_BATCH, params).one()
+    seconds_after = connection.execute(BATCH_TOTAL, params).scalar_one()
+    if seconds_after != seconds_before:
+        raise CompactionMismatch(
+            f"sessions {first_id}-{last_id}: {seconds_before} seconds before, {seconds_after} after"
+        )
+    return removed, added
+
+
+def compact_activity(bind, cutoff: datetime, batch_size: int, dry_run: bool = False) -> tuple[int, int, int]:
+    """Compact activity older than the cutoff and return the batches, rows removed, and rows added."""
+    with bind.connect() as connection:
+        first_session, last_session = connection.execute(SESSION_RANGE, {"cutoff": cutoff}).one()
+
+    removed = 0
+    added = 0
+    batches = 0
+    if first_session is not None:
+        for first_id in range(first_session, last_session + 1, batch_size):
+            last_id = first_id + batch_size - 1
+            if dry_run:
+                with bind.connect() as connection:
+                    batch_removed, batch_added = connection.execute(
+                        MERGEABLE_ROWS,
+                        {"first_id": first_id, "last_id": last_id, "cutoff": cutoff},
+                    ).one()
+            else:
+                with bind.begin() as connection:
+                    batch_removed, batch_added = compact_batch(connection, first_id, last_id, cutoff)
+            removed += batch_removed
+            added += batch_added
+            batches += 1
+    return batches, removed, added
+
+
+def main() -> None:
+    """Compact old listening activity in batches of sessions."""
+    parser = argparse.ArgumentParser(description="Merge old listening heartbeats.")
+    parser.add_argument("--older-than-days", type=int, default=30, help="only compact activity this old")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="session ids per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="count mergeable rows without changing them")
+    args = parser.parse_args()
+    if args.older_than_days < 1:
+        parser.error("--older-than-days must be at least 1")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    cutoff = datetime.now(UTC) - timedelta(days=args.older_than_days)
+    batches, removed, added = compact_activity(engine, cutoff, args.batch_size, args.dry_run)
+
+    print(
+        "Activity compaction complete: "
+        f"batches={batches} "
+        f"merged_rows={removed} "
+        f"new_rows={added} "
+        f"saved_rows={removed - added}"
+        f"{' (dry run)' if args.dry_run else ''}"
+    )
+
+
+if __name__ == "__main__":
+    main()
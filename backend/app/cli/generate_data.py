@@ -0,0 +1,506 @@
+"""Generate a synthetic dataset for scale testing.
+
+Run from the backend directory against a disposable PostgreSQL database that
+nothing else is writing to:
+
+  python -m app.cli.generate_data --users 100000 --sessions 2000000
+  python -m app.cli.generate_data --tag big --users 500000 --sessions 10000000
+  python -m app.cli.generate_data --delete big
+
+Rows are streamed to PostgreSQL with COPY in chunks, so memory stays flat
+however large the dataset is. Every generated row is marked with the tag:
+titles start with "Synthetic <tag>" and emails with "synthetic-<tag>-", which
+is how --delete finds them again.
+"""
+import argparse
+import io
+import math
+import random
+import time
+from datetime import UTC, date, datetime, timedelta
+from datetime import time as time_of_day
+from zoneinfo import ZoneInfo
+
+from app.core.security import hash_password
+from app.db.session import engine
+
+
+COPY_CHUNK_ROWS = 50_000
+SYNTHETIC_PASSWORD = "synthetic-password"
+# First id given to generated devices, well above browser-generated ids.
+DEVICE_ID_START = 1_500_000_000
+# Rough share of listeners per timezone.
+TIMEZONE_WEIGHTS = (
+    ("Asia/Kolkata", 35),
+    ("America/New_York", 15),
+    ("America/Los_Angeles", 8),
+    ("Europe/London", 10),
+    ("Europe/Berlin", 8),
+    ("Asia/Singapore", 6),
+    ("Australia/Sydney", 5),
+    ("America/Sao_Paulo", 5),
+    ("Asia/Tokyo", 4),
+    ("UTC", 4),
+)
+# Local listening hours cluster around waking up, lunch, and bedtime.
+LISTENING_PEAKS = ((7.0, 1.2, 40), (13.0, 1.5, 15), (22.0, 1.3, 45))
+CATEGORIES = ("sleep", "stress", "focus", "anxiety", "breathing", "body scan")
+LEVELS = ("beginner", "intermediate", "advanced")
+PROGRAM_GOALS = ("sleep", "stress", "focus", "calm")
+COMPLETION_RATE = 0.65
+PROGRAM_PLAY_RATE = 0.3
+
+
+def text_value(value) -> str:
+    """Format one value for COPY in PostgreSQL's text format."""
+    if value is None:
+        return "\\N"
+    if value is True:
+        return "t"
+    if value is False:
+        return "f"
+    if isinstance(value, (datetime, date, time_of_day)):
+        return value.isoformat()
+    return str(value)
+
+
+def copy_rows(cursor, table: str, columns: tuple[str, ...], rows) -> int:
+    """Stream rows into a table with COPY and return how many were written."""
+    statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    buffer = io.StringIO()
+    written = 0
+    for row in rows:
+        buffer.write("\t".join(map(text_value, row)))
+        buffer.write("\n")
+        written += 1
+        if written % COPY_CHUNK_ROWS == 0:
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+            buffer = io.StringIO()
+    if buffer.tell():
+        buffer.seek(0)
+        cursor.copy_expert(statement, buffer)
+    return written
+
+
+def reserve_ids(cursor, table: str, count: int) -> int:
+    """Claim a block of ids from a table's sequence and return the first one."""
+    if count <= 0:
+        return 0
+    cursor.execute(
+        "SELECT setval(pg_get_serial_sequence(%(table)s, 'id'), "
+        "nextval(pg_get_serial_sequence(%(table)s, 'id')) + %(count)s - 1)",
+        {"table": table, "count": count},
+    )
+    last_id = cursor.fetchone()[0]
+    return last_id - count + 1
+
+
+def weighted_hour(rng: random.Random) -> float:
+    """Pick a local hour of day from the listening peaks."""
+    peak_hour, spread, _ = rng.choices(
+        LISTENING_PEAKS,
+        weights=[weight for _, _, weight in LISTENING_PEAKS],
+    )[0]
+    return rng.gauss(peak_hour, spread) % 24
+
+
+def local_start(rng: random.Random, timezone: ZoneInfo, days: int, today: date) -> datetime:
+    """Pick a listening start time in UTC, favoring recent days and peak hours."""
+    # Squaring the draw puts more sessions in recent weeks, as retention would.
+    days_ago = int(days * rng.random() ** 2)
+    local_day = today - timedelta(days=days_ago)
+    hour = weighted_hour(rng)
+    local = datetime.combine(local_day, time_of_day(), tzinfo=timezone) + timedelta(hours=hour)
+    return local.astimezone(UTC)
+
+
+def generate_meditations(cursor, rng: random.Random, tag: str, count: int) -> list[tuple[int, int]]:
+    """Load the meditation catalog and return ids with durations."""
+    first_id = reserve_ids(cursor, "meditations", count)
+    catalog = []
+    rows = []
+    for index in range(count):
+        meditation_id = first_id + index
+        duration_sec = rng.choice((300, 420, 600, 600, 900, 900, 1200, 1800))
+        category = rng.choice(CATEGORIES)
+        catalog.append((meditation_id, duration_sec))
+        rows.append(
+            (
+                meditation_id,
+                f"Synthetic {tag} meditation {index + 1}",
+                category,
+                duration_sec,
+                rng.choice(LEVELS),
+                f"https://example.com/synthetic/{meditation_id}.mp3",
+                f"A {duration_sec // 60} minute {category} practice.",
+                f"Teacher {rng.randint(1, 40)}",
+                f'["{category}"]',
+                "[]",
+                rng.random() < 0.05,
+                rng.random() < 0.95,
+            )
+        )
+    copy_rows(
+        cursor,
+        "meditations",
+        (
+            "id",
+            "title",
+            "category",
+            "duration_sec",
+            "level",
+            "audio_url",
+            "description",
+            "teacher_name",
+            "tags",
+            "benefits",
+            "is_featured",
+            "is_published",
+        ),
+        rows,
+    )
+    return catalog
+
+
+def generate_programs(
+    cursor,
+    rng: random.Random,
+    tag: str,
+    count: int,
+    meditation_ids: list[int],
+) -> dict[int, list[int]]:
+    """Load programs with their ordered meditations and return them by program id."""
+    first_id = reserve_ids(cursor, "programs", count)
+    programs: dict[int, list[int]] = {}
+    for index in range(count):
+        size = min(len(meditation_ids), rng.randint(5, 10))
+        programs[first_id + index] = rng.sample(meditation_ids, size)
+    copy_rows(
+        cursor,
+        "programs",
+        ("id", "title", "description", "level", "goal"),
+        (
+            (
+                program_id,
+                f"Synthetic {tag} program {index + 1}",
+                f"A {len(program_meditations)} day series.",
+                rng.choice(LEVELS),
+                rng.choice(PROGRAM_GOALS),
+            )
+            for index, (program_id, program_meditations) in enumerate(programs.items())
+        ),
+    )
+    copy_rows(
+        cursor,
+        "program_meditations",
+        ("program_id", "meditation_id", "position"),
+        (
+            (program_id, meditation_id, position)
+            for program_id, program_meditations in programs.items()
+            for position, meditation_id in enumerate(program_meditations, start=1)
+        ),
+    )
+    return programs
+
+
+def generate_users(cursor, rng: random.Random, tag: str, count: int, days: int) -> list[int]:
+    """Load user accounts that all share one password and return their ids."""
+    first_id = reserve_ids(cursor, "users", count)
+    password_hash = hash_password(SYNTHETIC_PASSWORD)
+    now = datetime.now(UTC)
+
+    def user_rows():
+        """Yield accounts created over the dataset's time span."""
+        for index in range(count):
+            created_at = now - timedelta(days=rng.uniform(0, days))
+            yield (
+                first_id + index,
+                f"synthetic-{tag}-{index + 1}@example.com",
+                password_hash,
+                created_at if rng.random() < 0.8 else None,
+                created_at,
+            )
+
+    copy_rows(
+        cursor,
+        "users",
+        ("id", "email", "hashed_password", "email_verified_at", "created_at"),
+        user_rows(),
+    )
+    return list(range(first_id, first_id + count))
+
+
+def generate_devices(
+    rng: random.Random,
+    user_ids: list[int],
+    anonymous_devices: int,
+) -> list[tuple[int, int | None, ZoneInfo]]:
+    """Give users one to three devices, add anonymous ones, and pick timezones."""
+    zones = [ZoneInfo(name) for name, _ in TIMEZONE_WEIGHTS]
+    zone_weights = [weight for _, weight in TIMEZONE_WEIGHTS]
+    devices = []
+    next_device_id = DEVICE_ID_START + rng.randrange(100_000_000)
+    for user_id in user_ids:
+        timezone = rng.choices(zones, weights=zone_weights)[0]
+        for _ in range(rng.choices((1, 2, 3), weights=(70, 25, 5))[0]):
+            devices.append((next_device_id, user_id, timezone))
+            next_device_id += 1
+    for _ in range(anonymous_devices):
+        devices.append((next_device_id, None, rng.choices(zones, weights=zone_weights)[0]))
+        next_device_id += 1
+    return devices
+
+
+def generate_user_extras(
+    cursor,
+    rng: random.Random,
+    devices: list[tuple[int, int | None, ZoneInfo]],
+    meditation_ids: list[int],
+    program_ids: list[int],
+) -> tuple[dict[int, list[int]], dict[str, int]]:
+    """Load enrollments, favorites, and reminders, returning enrollments by user."""
+    timezone_by_user = {user_id: timezone for _, user_id, timezone in devices if user_id is not None}
+    enrollments: dict[int, list[int]] = {}
+    for user_id in timezone_by_user:
+        if program_ids and rng.random() < 0.35:
+            enrollments[user_id] = rng.sample(program_ids, min(len(program_ids), rng.randint(1, 3)))
+    counts = {
+        "user_programs": copy_rows(
+            cursor,
+            "user_programs",
+            ("user_id", "program_id"),
+            (
+                (user_id, program_id)
+                for user_id, user_program_ids in enrollments.items()
+                for program_id in user_program_ids
+            ),
+        ),
+        "user_favorites": copy_rows(
+            cursor,
+            "user_favorites",
+            ("user_id", "meditation_id"),
+            (
+                (user_id, meditation_id)
+                for user_id in timezone_by_user
+                for meditation_id in rng.sample(
+                    meditation_ids,
+                    min(len(meditation_ids), int(rng.expovariate(1 / 3))),
+                )
+            ),
+        ),
+        "user_reminder_preferences": copy_rows(
+            cursor,
+            "user_reminder_preferences",
+            ("user_id", "is_enabled", "reminder_time", "frequency", "timezone"),
+            (
+                (
+                    user_id,
+                    rng.random() < 0.8,
+                    time_of_day(int(weighted_hour(rng)), rng.choice((0, 15, 30, 45))),
+                    rng.choices(("daily", "weekdays", "weekly"), weights=(70, 20, 10))[0],
+                    timezone.key,
+                )
+                for user_id, timezone in timezone_by_user.items()
+                if rng.random() < 0.3
+            ),
+        ),
+    }
+    return enrollments, counts
+
+
+def session_stream(
+    seed: int,
+    first_id: int,
+    count: int,
+    devices: list[tuple[int, int | None, ZoneInfo]],
+    meditations: list[tuple[int, int]],
+    programs: dict[int, list[int]],
+    enrollments: dict[int, list[int]],
+    days: int,
+):
+    """Yield the same synthetic sessions every time it is called with one seed.
+
+    Sessions are spread over devices with a heavy-tailed weight, so a few
+    listeners are very active and most play now and then. Popular
+    meditations are played far more often than the rest.
+    """
+    rng = random.Random(seed)
+    device_weights = list(accumulate_weights(rng.paretovariate(1.2) for _ in devices))
+    meditation_weights = list(accumulate_weights(1 / rank for rank in range(1, len(meditations) + 1)))
+    duration_by_id = dict(meditations)
+    today = datetime.now(UTC).date()
+    for index in range(count):
+        device_id, user_id, timezone = rng.choices(devices, cum_weights=device_weights)[0]
+        program_id = None
+        if user_id in enrollments and rng.random() < PROGRAM_PLAY_RATE:
+            program_id = rng.choice(enrollments[user_id])
+            meditation_id = rng.choice(programs[program_id])
+        else:
+            meditation_id = rng.choices(meditations, cum_weights=meditation_weights)[0][0]
+        duration_sec = duration_by_id[meditation_id]
+        started_at = local_start(rng, timezone, days, today)
+        completed = rng.random() < COMPLETION_RATE
+        seconds_listened = duration_sec if completed else int(duration_sec * rng.betavariate(1.2, 2.5))
+        last_listened_at = started_at + timedelta(seconds=seconds_listened)
+        yield (
+            first_id + index,
+            meditation_id,
+            user_id,
+            program_id,
+            device_id,
+            started_at,
+            last_listened_at if completed else None,
+            last_listened_at if seconds_listened else None,
+            seconds_listened,
+            seconds_listened,
+        )
+
+
+def accumulate_weights(weights):
+    """Yield running totals of weights for random.choices(cum_weights=...)."""
+    total = 0.0
+    for weight in weights:
+        total += weight
+        yield total
+
+
+def activity_rows(sessions, activity_seconds: int):
+    """Split each session's listening time into activity rows like heartbeats do."""
+    for session in sessions:
+        session_id, started_at, seconds_listened = session[0], session[5], session[8]
+        pieces = max(1, math.ceil(seconds_listened / activity_seconds)) if seconds_listened else 0
+        remaining = seconds_listened
+        recorded_at = started_at
+        for _ in range(pieces):
+            piece = min(activity_seconds, remaining)
+            remaining -= piece
+            recorded_at += timedelta(seconds=piece)
+            yield (session_id, piece, recorded_at)
+
+
+def delete_dataset(cursor, tag: str) -> None:
+    """Remove every row generated with a tag."""
+    title_prefix = f"Synthetic {tag} %"
+    cursor.execute(
+        "DELETE FROM meditation_sessions WHERE meditation_id IN "
+        "(SELECT id FROM meditations WHERE title LIKE %s)",
+        (title_prefix,),
+    )
+    print(f"Deleted {cursor.rowcount} sessions and their activity")
+    cursor.execute("DELETE FROM users WHERE email LIKE %s", (f"synthetic-{tag}-%@example.com",))
+    print(f"Deleted {cursor.rowcount} users with their favorites, reminders, and enrollments")
+    cursor.execute("DELETE FROM programs WHERE title LIKE %s", (title_prefix,))
+    print(f"Deleted {cursor.rowcount} programs")
+    cursor.execute("DELETE FROM meditations WHERE title LIKE %s", (title_prefix,))
+    print(f"Deleted {cursor.rowcount} meditations")
+
+
+def main() -> None:
+    """Generate or delete a tagged synthetic dataset."""
+    parser = argparse.ArgumentParser(description="Generate synthetic data for scale testing.")
+    parser.add_argument("--tag", default="scale", help="label used to find the rows again")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--anonymous-devices", type=int, default=None, help="defaults to the number of users")
+    parser.add_argument("--meditations", type=int, default=300)
+    parser.add_argument("--programs", type=int, default=30)
+    parser.add_argument("--sessions", type=int, default=500_000)
+    parser.add_argument("--days", type=int, default=365, help="how far back sessions go")
+    parser.add_argument("--activity-seconds", type=int, default=120, help="listening time per activity row")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--delete", metavar="TAG", help="delete a generated dataset instead")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        parser.error("generate_data loads rows with COPY and needs a PostgreSQL DATABASE_URL")
+    anonymous_devices = args.users if args.anonymous_devices is None else args.anonymous_devices
+    if not args.delete and args.meditations < 1:
+        parser.error("--meditations must be at least 1")
+    if not args.delete and args.users + anonymous_devices < 1:
+        parser.error("--users or --anonymous-devices must be at least 1")
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        if args.delete:
+            delete_dataset(cursor, args.delete)
+            connection.commit()
+            return
+
+        rng = random.Random(args.seed)
+        started = time.perf_counter()
+        counts: dict[str, int] = {}
+
+        meditations = generate_meditations(cursor, rng, args.tag, args.meditations)
+        counts["meditations"] = len(meditations)
+        meditation_ids = [meditation_id for meditation_id, _ in meditations]
+        programs = generate_programs(cursor, rng, args.tag, args.programs, meditation_ids)
+        counts["programs"] = len(programs)
+        user_ids = generate_users(cursor, rng, args.tag, args.users, args.days)
+        counts["users"] = len(user_ids)
+        devices = generate_devices(rng, user_ids, anonymous_devices)
+        counts["devices"] = len(devices)
+        enrollments, extra_counts = generate_user_extras(
+            cursor, rng, devices, meditation_ids, list(programs)
+        )
+        counts.update(extra_counts)
+        print(f"Loaded catalog and accounts in {time.perf_counter() - started:.1f}s")
+
+        # Sessions and activity come from the same seeded stream, generated
+        # twice, so activity can follow its session without holding millions
+        # of sessions in memory.
+        session_seed = rng.randrange(2**32)
+        first_session_id = reserve_ids(cursor, "meditation_sessions", args.sessions)
+        stream_args = (
+            session_seed,
+            first_session_id,
+            args.sessions,
+            devices,
+            meditations,
+            programs,
+            enrollments,
+            args.days,
+        )
+        sessions_started = time.perf_counter()
+        counts["meditation_sessions"] = copy_rows(
+            cursor,
+            "meditation_sessions",
+            (
+                "id",
+                "meditation_id",
+                "user_id",
+                "program_id",
+                "device_id",
+                "started_at",
+                "completed_at",
+                "last_listened_at",
+                "seconds_listened",
+                "last_position_sec",
+            ),
+            session_stream(*stream_args),
+        )
+        counts["meditation_session_activity"] = copy_rows(
+            cursor,
+            "meditation_session_activity",
+            ("session_id", "seconds_listened", "recorded_at"),
+            activity_rows(session_stream(*stream_args), args.activity_seconds),
+        )
+        print(f"Loaded sessions and activity in {time.perf_counter() - sessions_started:.1f}s")
+
+        # Fresh statistics so the planner sees the new volumes right away.
+        for table in counts:
+            if table != "devices":
+                cursor.execute(f"ANALYZE {table}")
+        connection.commit()
+
+        elapsed = time.perf_counter() - started
+        total = sum(count for table, count in counts.items() if table != "devices")
+        summary = " ".join(f"{table}={count}" for table, count in counts.items())
+        print(f"Synthetic dataset '{args.tag}' ready: {summary}")
+        print(f"{total} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
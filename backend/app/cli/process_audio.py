@@ -0,0 +1,107 @@
+"""Build audio renditions and HLS packages for queued meditations.
+
+Run from the backend directory with ffmpeg and ffprobe on the PATH:
+
+  python -m app.cli.process_audio --enqueue-missing
+  python -m app.cli.process_audio --meditation-id 12 --kind audio_hls
+"""
+import argparse
+
+from sqlalchemy import or_
+
+from app.db.session import SessionLocal
+from app.models.meditation import Meditation
+from app.services.audio_pipeline import (
+    AUDIO_HLS_JOB,
+    AUDIO_JOB_HANDLERS,
+    AUDIO_JOB_KINDS,
+    AUDIO_RENDITIONS_JOB,
+    enqueue_audio_processing,
+)
+from app.services.media_jobs import claim_next_media_job, fail_media_job, finish_media_job
+
+
+def missing_kinds(meditation: Meditation, kinds: tuple[str, ...]) -> tuple[str, ...]:
+    """Return the processing steps a meditation's audio has not had yet."""
+    finished = {
+        AUDIO_RENDITIONS_JOB: bool(meditation.audio_renditions),
+        AUDIO_HLS_JOB: bool(meditation.hls_manifest_url),
+    }
+    return tuple(kind for kind in kinds if not finished[kind])
+
+
+def enqueue_missing(db, kinds: tuple[str, ...]) -> int:
+    """Queue every meditation with audio that still needs processing."""
+    queued = 0
+    meditations = db.query(Meditation).filter(
+        Meditation.audio_url.is_not(None),
+        or_(Meditation.hls_manifest_url.is_(None), Meditation.measured_duration_sec.is_(None)),
+    ).all()
+    for meditation in meditations:
+        jobs = enqueue_audio_processing(db, meditation, missing_kinds(meditation, kinds))
+        queued += sum(1 for job in jobs if job is not None)
+    db.commit()
+    return queued
+
+
+def process_jobs(db, kind: str, limit: int) -> tuple[int, int]:
+    """Process pending jobs of one kind and return processed and failed counts."""
+    processed = 0
+    failed = 0
+    while not limit or processed + failed < limit:
+        job = claim_next_media_job(db, kind)
+        if job is None:
+            break
+        try:
+            result = AUDIO_JOB_HANDLERS[kind](db, job)
+        except Exception as error:
+            fail_media_job(db, job, error)
+            failed += 1
+            print(f"Audio job {job.id} ({kind}) failed: {job.error}")
+            continue
+        finish_media_job(db, job, result)
+        processed += 1
+        if result.get("duration_mismatch"):
+            print(
+                f"Audio job {job.id}: meditation {job.meditation_id} lasts "
+                f"{result['measured_duration_sec']}s but duration_sec is {result['duration_sec']}"
+            )
+    return processed, failed
+
+
+def main() -> None:
+    """Queue audio jobs if asked, then process pending jobs."""
+    parser = argparse.ArgumentParser(description="Process queued meditation audio.")
+    parser.add_argument("--enqueue-missing", action="store_true", help="queue meditations that were not processed")
+    parser.add_argument("--meditation-id", type=int, action="append", default=[], help="queue one meditation")
+    parser.add_argument("--kind", choices=AUDIO_JOB_KINDS, action="append", help="limit to one job kind")
+    parser.add_argument("--limit", type=int, default=0, help="stop after this many jobs of each kind")
+    args = parser.parse_args()
+    kinds = tuple(args.kind or AUDIO_JOB_KINDS)
+
+    db = SessionLocal()
+    try:
+        queued = enqueue_missing(db, kinds) if args.enqueue_missing else 0
+        for meditation_id in args.meditation_id:
+            meditation = db.query(Meditation).filter(Meditation.id == meditation_id).first()
+            jobs = enqueue_audio_processing(db, meditation, kinds) if meditation else []
+            if not jobs:
+                print(f"Audio job skipped: meditation {meditation_id} has no audio")
+                continue
+            queued += sum(1 for job in jobs if job is not None)
+        db.commit()
+
+        processed = 0
+        failed = 0
+        for kind in kinds:
+            kind_processed, kind_failed = process_jobs(db, kind, args.limit)
+            processed += kind_processed
+            failed += kind_failed
+
+        print(f"Audio run complete: queued={queued} processed={processed} failed={failed}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.logging import get_logger
+
+
+logger = get_logger(__name__)
+# Media is already compressed, so squeezing it again only costs CPU.
+UNCOMPRESSIBLE_CONTENT_TYPES = ("image/", "audio/", "video/", "application/zip")
+
+
+def load_brotli():
+    """Return the brotli module, or none when it is not installed."""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def parse_accept_encoding(value: str) -> dict[str, float]:
+    """Read the codings a client accepts and their quality values."""
+    accepted: dict[str, float] = {}
+    for item in value.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, raw_value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(raw_value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+class GzipEncoder:
+    """Incremental gzip encoder."""
+    name = "gzip"
+
+    def __init__(self, level: int):
+        """Start a gzip stream at the given compression level."""
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so streamed rows reach the client."""
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Compress the last chunk and close the stream."""
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class BrotliEncoder:
+    """Incremental brotli encoder."""
+    name = "br"
+
+    def __init__(self, brotli, quality: int):
+        """Start a brotli stream at the given quality."""
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so streamed rows reach the client."""
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Compress the last chunk and close the stream."""
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """Compress responses with brotli or gzip, whichever the client prefers.
+
+    Responses smaller than ``minimum_size``, responses that already carry a
+    Content-Encoding, and media types that are compressed already pass
+    through unchanged. Streaming responses are compressed chunk by chunk.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1000,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        """Wrap an ASGI app with negotiated response compression."""
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.brotli = load_brotli()
+        if self.brotli is None:
+            logger.info("brotli is not installed; responses will use gzip only")
+
+    def choose_encoder(self, accept_encoding: str):
+        """Pick the best encoder the client accepts, if any."""
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        brotli_quality = accepted.get("br", wildcard)
+        gzip_quality = accepted.get("gzip", wildcard)
+        if self.brotli is not None and brotli_quality > 0 and brotli_quality >= gzip_quality:
+            return BrotliEncoder(self.brotli, self.brotli_quality)
+        if gzip_quality > 0:
+            return GzipEncoder(self.gzip_level)
+        return None
+
+    async def __call__(self, scope, receive, send):
+        """Compress the response when the client and content allow it."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoder = self.choose_encoder(Headers(scope=scope).get("accept-encoding", ""))
+        if encoder is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        # None until the first body chunk decides whether to compress.
+        compressing: bool | None = None
+
+        async def send_compressed(message) -> None:
+            """Hold the response start until the first body shows its size."""
+            nonlocal start_message, compressing
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressing is None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                content_type = headers.get("content-type", "")
+                compressing = not (
+                    "content-encoding" in headers
+                    or content_type.startswith(UNCOMPRESSIBLE_CONTENT_TYPES)
+                    or (not more_body and len(body) < self.minimum_size)
+                )
+                if not compressing:
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                headers["Content-Encoding"] = encoder.name
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                    body = encoder.compress(body)
+                else:
+                    body = encoder.finish(body)
+                    headers["Content-Length"] = str(len(body))
+                await send(start_message)
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+
+            if not compressing:
+                await send(message)
+                return
+            body = encoder.compress(body) if more_body else encoder.finish(body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
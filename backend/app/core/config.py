@@ -29,6 +29,16 @@ class Settings(BaseSettings):
     AWS_SECRET_KEY: str = ""
     AWS_REGION: str = "ap-south-1"
     AWS_S3_BUCKET: str = ""
+    S3_ENDPOINT_URL: str = ""
+    DIRECT_UPLOAD_EXPIRE_SECONDS: int = 3600
+    S3_MAX_POOL_CONNECTIONS: int = 32
+    S3_TRANSFER_CONCURRENCY: int = 4
+    S3_MULTIPART_THRESHOLD_MB: int = 16
+    S3_MULTIPART_CHUNK_MB: int = 16
+
+    # Media processing
+    FFMPEG_PATH: str = "ffmpeg"
+    FFPROBE_PATH: str = "ffprobe"
 
     # Optional Admin API Key
     ADMIN_API_KEY: str = "dev-secret"
@@ -36,6 +46,8 @@ class Settings(BaseSettings):
     # Authentication
     JWT_SECRET_KEY: str = "development-only-change-me"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    JWT_VERIFY_BACKEND: str = "hmac"
+    TOKEN_CACHE_MAX_ENTRIES: int = 10_000
     AUTH_COOKIE_NAME: str = "still_session"
     AUTH_COOKIE_SECURE: bool = False
     AUTH_COOKIE_SAMESITE: str = "lax"
@@ -44,8 +56,25 @@ class Settings(BaseSettings):
     CSRF_HEADER_NAME: str = "X-CSRF-Token"
     CSRF_TOKEN_EXPIRE_MINUTES: int = 120
 
-    # Logging
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    # Rate limiting
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_REDIS_URL: str = ""
+    RATE_LIMIT_MAX_KEYS: int = 10_000
+
+    # Responses
+    RESPONSE_COMPRESSION_MIN_BYTES: int = 1000
+    HOME_FEED_CACHE_SECONDS: int = 30
+    HOME_FEED_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Logging and metrics
     LOG_LEVEL: str = "INFO"
+    METRICS_PORT: int = 0
+    SQL_QUERY_LOG_THRESHOLD: int = 0
 
     # Email
     EMAIL_PROVIDER: str = "none"
@@ -61,6 +90,7 @@ class Settings(BaseSettings):
         "BACKEND_PUBLIC_URL",
         "PASSWORD_RESET_URL_BASE",
         "EMAIL_VERIFICATION_URL_BASE",
+        "S3_ENDPOINT_URL",
         mode="before",
     )
     @classmethod
@@ -86,6 +116,80 @@ class Settings(BaseSettings):
             raise ValueError("EMAIL_PROVIDER must be none or brevo")
         return normalized
 
+    @field_validator("JWT_VERIFY_BACKEND")
+    @classmethod
+    def validate_jwt_verify_backend(cls, value: str) -> str:
+        """Keep token verification backends explicit and predictable."""
+        normalized = value.lower()
+        if normalized not in {"hmac", "jose"}:
+            raise ValueError("JWT_VERIFY_BACKEND must be hmac or jose")
+        return normalized
+
+    @field_validator("BCRYPT_ROUNDS")
+    @classmethod
+    def validate_bcrypt_rounds(cls, value: int) -> int:
+        """Keep the bcrypt cost within the range the algorithm supports."""
+        if not 4 <= value <= 31:
+            raise ValueError("BCRYPT_ROUNDS must be between 4 and 31")
+        return value
+
+    @field_validator("HOME_FEED_CACHE_SECONDS")
+    @classmethod
+    def validate_home_feed_cache_seconds(cls, value: int) -> int:
+        """Keep cached home feeds short-lived so other workers catch up quickly."""
+        if not 0 <= value <= 300:
+            raise ValueError("HOME_FEED_CACHE_SECONDS must be between 0 and 300")
+        return value
+
+    @field_validator("DIRECT_UPLOAD_EXPIRE_SECONDS")
+    @classmethod
+    def validate_direct_upload_expiry(cls, value: int) -> int:
+        """Keep presigned upload URLs within the lifetime S3 allows."""
+        if not 60 <= value <= 604_800:
+            raise ValueError("DIRECT_UPLOAD_EXPIRE_SECONDS must be between 60 and 604800")
+        return value
+
+    @field_validator("S3_MULTIPART_THRESHOLD_MB", "S3_MULTIPART_CHUNK_MB")
+    @classmethod
+    def validate_multipart_sizes(cls, value: int) -> int:
+        """Keep multipart sizes at or above the 5 MB part minimum S3 enforces."""
+        if value < 5:
+            raise ValueError("S3 multipart sizes must be at least 5 MB")
+        return value
+
+    @field_validator("S3_MAX_POOL_CONNECTIONS", "S3_TRANSFER_CONCURRENCY")
+    @classmethod
+    def validate_s3_concurrency(cls, value: int) -> int:
+        """Require at least one S3 connection and transfer thread."""
+        if value < 1:
+            raise ValueError("S3 connection and concurrency settings must be at least 1")
+        return value
+
+    @field_validator("METRICS_PORT")
+    @classmethod
+    def validate_metrics_port(cls, value: int) -> int:
+        """Keep the metrics port a real TCP port, or 0 to turn it off."""
+        if not 0 <= value <= 65535:
+            raise ValueError("METRICS_PORT must be between 0 and 65535")
+        return value
+
+    @field_validator("SQL_QUERY_LOG_THRESHOLD")
+    @classmethod
+    def validate_sql_query_log_threshold(cls, value: int) -> int:
+        """Reject negative statement thresholds."""
+        if value < 0:
+            raise ValueError("SQL_QUERY_LOG_THRESHOLD must be 0 or greater")
+        return value
+
+    @field_validator("RATE_LIMIT_BACKEND")
+    @classmethod
+    def validate_rate_limit_backend(cls, value: str) -> str:
+        """Keep rate limit backend values explicit and predictable."""
+        normalized = value.lower()
+        if normalized not in {"memory", "redis"}:
+            raise ValueError("RATE_LIMIT_BACKEND must be memory or redis")
+        return normalized
+
     @field_validator("AUTH_COOKIE_DOMAIN", mode="before")
     @classmethod
     def empty_cookie_domain_as_none(cls, value: str | None) -> str | None:
@@ -95,6 +199,13 @@ class Settings(BaseSettings):
         value = str(value).strip()
         return value or None
 
+    @model_validator(mode="after")
+    def validate_rate_limit_settings(self):
+        """Require a shared store URL when the Redis rate limiter is selected."""
+        if self.RATE_LIMIT_BACKEND == "redis" and not self.RATE_LIMIT_REDIS_URL:
+            raise ValueError("RATE_LIMIT_REDIS_URL is required when RATE_LIMIT_BACKEND=redis")
+        return self
+
     @model_validator(mode="after")
     def validate_production_auth_settings(self):
         """Prevent unsafe cookie and URL settings in production."""
@@ -2,8 +2,9 @@ import hmac
 import secrets
 from hashlib import sha256
 
-from fastapi import HTTPException, Request, Response
+from fastapi import Response
 from fastapi.responses import JSONResponse
+from starlette.requests import HTTPConnection
 
 from app.core.config import settings
 
@@ -49,26 +50,49 @@ def set_csrf_cookie(response: Response, token: str) -> None:
     )
 
 
-async def csrf_protect(request: Request, call_next):
-    """Reject unsafe cookie-auth requests that do not include a valid CSRF token."""
-    if request.method in SAFE_METHODS:
-        return await call_next(request)
+def has_valid_csrf(connection: HTTPConnection) -> bool:
+    """Check that an unsafe cookie-auth request carries a valid CSRF token.
 
-    has_session_cookie = settings.AUTH_COOKIE_NAME in request.cookies
+    Safe methods and requests without a session cookie, such as bearer-token
+    clients or a signed-out browser, need no token.
+    """
+    if connection.scope["method"] in SAFE_METHODS:
+        return True
+
+    cookies = connection.cookies
+    has_session_cookie = settings.AUTH_COOKIE_NAME in cookies
     if not has_session_cookie:
-        return await call_next(request)
-
-    cookie_token = request.cookies.get(settings.CSRF_COOKIE_NAME)
-    header_token = request.headers.get(settings.CSRF_HEADER_NAME)
-    if (
-        not cookie_token
-        or not header_token
-        or cookie_token != header_token
-        or not validate_csrf_token(header_token)
-    ):
-        return JSONResponse(
-            status_code=403,
-            content={"detail": "Invalid CSRF token"},
-        )
-
-    return await call_next(request)
+        return True
+
+    cookie_token = cookies.get(settings.CSRF_COOKIE_NAME)
+    header_token = connection.headers.get(settings.CSRF_HEADER_NAME)
+    return bool(
+        cookie_token
+        and header_token
+        and cookie_token == header_token
+        and validate_csrf_token(header_token)
+    )
+
+
+class CSRFMiddleware:
+    """Reject unsafe cookie-auth requests that do not include a valid CSRF token.
+
+    This is plain ASGI so requests that pass the check reach the app, and
+    streamed responses leave it, without an extra task or body wrapper.
+    """
+
+    def __init__(self, app):
+        """Wrap an ASGI app with CSRF protection."""
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        """Answer 403 for a failed check, otherwise hand the request on."""
+        if scope["type"] == "http" and not has_valid_csrf(HTTPConnection(scope)):
+            response = JSONResponse(
+                status_code=403,
+                content={"detail": "Invalid CSRF token"},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -1,10 +1,9 @@
 from fastapi import Cookie, Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.core.security import SECRET_KEY, ALGORITHM
+from app.core.tokens import ExpiredTokenError, TokenError, verify_access_token
 from app.db.session import SessionLocal
 from app.models.user import User
 
@@ -51,12 +50,12 @@ def get_user_from_token(token: str, db: Session) -> User:
     """Decode a login token and load the matching active user."""
 
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        subject = payload.get("sub")
-        if not subject:
-            raise ValueError("Missing subject")
-    except Exception:
+        payload = verify_access_token(token)
+    except ExpiredTokenError:
+        raise HTTPException(status_code=401, detail="Session expired")
+    except TokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    subject = payload["sub"]
 
     if str(subject).isdigit():
         user = db.query(User).filter(User.id == int(subject)).first()
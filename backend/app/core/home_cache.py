@@ -0,0 +1,113 @@
+"""Short-lived per-owner cache of assembled home feeds."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Hashable
+
+from app.core.config import settings
+
+
+def user_owner(user_id: int) -> tuple[str, int]:
+    """Return the cache owner for a signed-in user."""
+    return ("user", user_id)
+
+
+def device_owner(device_id: int) -> tuple[str, int]:
+    """Return the cache owner for an anonymous device."""
+    return ("device", device_id)
+
+
+class HomeFeedCache:
+    """Remember recent home feeds per owner until they expire or change.
+
+    Entries are grouped by owner so one write drops every variant of that
+    owner's feed, such as the same feed requested for another timezone. The
+    time of the owner's last write is kept too, so a feed that was being
+    built while the write happened is not stored.
+    """
+
+    def __init__(self, ttl_seconds: int, max_owners: int = 10_000):
+        """Create an empty cache. A TTL of zero turns caching off."""
+        self.ttl_seconds = ttl_seconds
+        self.max_owners = max_owners
+        # owner -> (last write timestamp, variant -> (expiry timestamp, feed))
+        self._owners: OrderedDict[tuple, tuple[float, dict[Hashable, tuple[float, Any]]]] = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether feeds are cached at all."""
+        return self.ttl_seconds > 0
+
+    def now(self) -> float:
+        """Return the clock used for expiry and write times."""
+        return monotonic()
+
+    def get(self, owner: tuple, variant: Hashable) -> Any | None:
+        """Return a cached feed that has not expired, or None."""
+        if not self.enabled:
+            return None
+        now = self.now()
+        with self._lock:
+            entry = self._owners.get(owner)
+            if entry is None:
+                return None
+            cached = entry[1].get(variant)
+            if cached is None:
+                return None
+            expires_at, feed = cached
+            if expires_at <= now:
+                del entry[1][variant]
+                return None
+            self._owners.move_to_end(owner)
+            return feed
+
+    def set(self, owner: tuple, variant: Hashable, feed: Any, built_since: float) -> None:
+        """Cache a feed whose loading began at ``built_since``.
+
+        The feed is dropped if the owner wrote anything after loading began.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            written_at, variants = self._owners.get(owner, (float("-inf"), {}))
+            if written_at >= built_since:
+                return
+            variants[variant] = (self.now() + self.ttl_seconds, feed)
+            self._owners[owner] = (written_at, variants)
+            self._owners.move_to_end(owner)
+            self._evict()
+
+    def invalidate(self, user_id: int | None = None, device_id: int | None = None) -> None:
+        """Forget the cached feeds of a user, a device, or both."""
+        if not self.enabled:
+            return
+        now = self.now()
+        with self._lock:
+            for owner in (
+                user_owner(user_id) if user_id is not None else None,
+                device_owner(device_id) if device_id is not None else None,
+            ):
+                if owner is not None:
+                    self._owners[owner] = (now, {})
+                    self._owners.move_to_end(owner)
+            self._evict()
+
+    def clear(self) -> None:
+        """Forget every cached feed."""
+        with self._lock:
+            self._owners.clear()
+
+    def _evict(self) -> None:
+        """Drop the least recently used owners beyond the size limit."""
+        while len(self._owners) > self.max_owners:
+            self._owners.popitem(last=False)
+
+
+home_feed_cache = HomeFeedCache(
+    settings.HOME_FEED_CACHE_SECONDS,
+    max_owners=settings.HOME_FEED_CACHE_MAX_ENTRIES,
+)
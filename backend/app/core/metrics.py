@@ -0,0 +1,200 @@
+import errno
+import os
+import time
+from contextvars import ContextVar
+
+from fastapi import Request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# prometheus_client reads this when the metrics below are created. When it is
+# set, every worker writes its samples there and any worker can report all of
+# them.
+MULTIPROCESS_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+# Paths that match no route share one label so scanners cannot create
+# a new time series for every URL they try.
+UNMATCHED_ROUTE = "unmatched"
+HTTP_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+# Scope key holding the in-progress gauge child a routed request incremented.
+IN_PROGRESS_SCOPE_KEY = "metrics.in_progress"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time to answer an HTTP request, by route template.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being handled right now, by route template.",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+RESPONSES = Counter(
+    "http_responses",
+    "HTTP responses sent, by route template and status code.",
+    ["method", "route", "status"],
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent in database queries while answering one HTTP request.",
+    ["method", "route"],
+    buckets=DB_TIME_BUCKETS,
+)
+
+# Holds a one-item list for the current request. FastAPI copies the context
+# into the worker thread of a sync endpoint, so queries made there add to
+# the same list.
+request_db_seconds: ContextVar[list[float] | None] = ContextVar("request_db_seconds", default=None)
+
+
+def method_label(scope) -> str:
+    """Return the request method, folding unusual ones into one label."""
+    return scope["method"] if scope["method"] in HTTP_METHODS else "other"
+
+
+def route_label(scope) -> str:
+    """Return the route template a request matched, such as /sessions/{session_id}.
+
+    The router stores the matched route in the scope, so this is only known
+    once routing has happened.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+async def count_in_progress(request: Request) -> None:
+    """Count a routed request as in progress until MetricsMiddleware finishes it."""
+    in_progress = REQUESTS_IN_PROGRESS.labels(method_label(request.scope), route_label(request.scope))
+    in_progress.inc()
+    request.scope[IN_PROGRESS_SCOPE_KEY] = in_progress
+
+
+def record_query_start(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Remember when a query was sent to the database."""
+    context._metrics_query_started = time.perf_counter()
+
+
+def record_query_end(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Add a finished query's time to the current request's total."""
+    total = request_db_seconds.get()
+    started = getattr(context, "_metrics_query_started", None)
+    if total is not None and started is not None:
+        total[0] += time.perf_counter() - started
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every query an engine runs."""
+    if not event.contains(engine, "before_cursor_execute", record_query_start):
+        event.listen(engine, "before_cursor_execute", record_query_start)
+        event.listen(engine, "after_cursor_execute", record_query_end)
+
+
+def metrics_registry():
+    """Return a registry with this process's metrics, or every worker's in multiprocess mode."""
+    if not MULTIPROCESS_DIR:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Return every metric in the Prometheus text format and its content type."""
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int):
+    """Serve metrics on a separate port, returning the server or none when off.
+
+    Each worker tries to listen, and only the first one to bind the port
+    serves it. The others carry on without a listener.
+    """
+    if not port:
+        return None
+    try:
+        server, _ = start_http_server(port, registry=metrics_registry())
+    except OSError as error:
+        if error.errno != errno.EADDRINUSE:
+            raise
+        if MULTIPROCESS_DIR:
+            logger.info("Metrics port %s is served by another worker", port)
+        else:
+            logger.warning(
+                "Metrics port %s is served by another worker; set "
+                "PROMETHEUS_MULTIPROC_DIR so it reports this worker too",
+                port,
+            )
+        return None
+    return server
+
+
+def stop_metrics(server) -> None:
+    """Close the metrics listener and retire this worker's live gauges."""
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+    if MULTIPROCESS_DIR:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """Record latency, status codes, and database time per route.
+
+    In-flight requests are counted by count_in_progress, which runs once the
+    router has matched the route, and released here.
+    """
+
+    def __init__(self, app):
+        """Wrap an ASGI app with request metrics."""
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        """Time the request and count its response."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        db_seconds = [0.0]
+        token = request_db_seconds.set(db_seconds)
+
+        async def send_with_status(message) -> None:
+            """Note the response status on its way out."""
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router has filled in scope["route"] by now.
+            method, route = method_label(scope), route_label(scope)
+            REQUEST_SECONDS.labels(method, route).observe(time.perf_counter() - started)
+            REQUEST_DB_SECONDS.labels(method, route).observe(db_seconds[0])
+            RESPONSES.labels(method, route, str(status)).inc()
+            in_progress = scope.get(IN_PROGRESS_SCOPE_KEY)
+            if in_progress is not None:
+                in_progress.dec()
+            request_db_seconds.reset(token)
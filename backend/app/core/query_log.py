@@ -0,0 +1,139 @@
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.logging import get_logger
+
+
+logger = get_logger(__name__)
+REPEATED_STATEMENTS_LOGGED = 5
+FINGERPRINT_LOG_LENGTH = 200
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+BIND_PARAMETER = re.compile(r"%\([^)]+\)s|%s|\?|:\w+|__\[POSTCOMPILE_\w+\]")
+VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+WHITESPACE = re.compile(r"\s+")
+
+
+def statement_fingerprint(statement: str) -> str:
+    """Reduce a SQL statement to its shape so repeats with different values match."""
+    fingerprint = STRING_LITERAL.sub("?", statement)
+    fingerprint = BIND_PARAMETER.sub("?", fingerprint)
+    fingerprint = NUMBER_LITERAL.sub("?", fingerprint)
+    fingerprint = VALUE_LIST.sub("(...)", fingerprint)
+    return WHITESPACE.sub(" ", fingerprint).strip()
+
+
+class QueryLog:
+    """SQL statements run during one request or block of code."""
+
+    def __init__(self):
+        """Start with no statements."""
+        self.count = 0
+        self.fingerprints: Counter[str] = Counter()
+
+    def record(self, statement: str) -> None:
+        """Count one statement under its fingerprint."""
+        self.count += 1
+        self.fingerprints[statement_fingerprint(statement)] += 1
+
+    def repeated(self) -> list[tuple[str, int]]:
+        """Return statement shapes that ran more than once, most frequent first."""
+        return [
+            (fingerprint, count)
+            for fingerprint, count in self.fingerprints.most_common()
+            if count > 1
+        ]
+
+    def summary(self, limit: int = REPEATED_STATEMENTS_LOGGED) -> str:
+        """Describe the most repeated statements for a log line or failure message."""
+        return "; ".join(
+            f"{count}x {fingerprint[:FINGERPRINT_LOG_LENGTH]}"
+            for fingerprint, count in self.repeated()[:limit]
+        ) or "no repeated statements"
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when code runs more SQL statements than its budget allows."""
+
+
+# Logs can nest, for example a budget check around a request that the
+# development middleware also counts, so every active log sees each statement.
+active_query_logs: ContextVar[tuple[QueryLog, ...]] = ContextVar("active_query_logs", default=())
+
+
+def record_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Add a finished statement to every active query log."""
+    for query_log in active_query_logs.get():
+        query_log.record(statement)
+
+
+def instrument_engine_queries(engine: Engine) -> None:
+    """Count the statements an engine runs while a query log is active."""
+    if not event.contains(engine, "after_cursor_execute", record_statement):
+        event.listen(engine, "after_cursor_execute", record_statement)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryLog]:
+    """Collect the SQL statements run inside the block."""
+    query_log = QueryLog()
+    token = active_query_logs.set(active_query_logs.get() + (query_log,))
+    try:
+        yield query_log
+    finally:
+        active_query_logs.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int, label: str = "block") -> Iterator[QueryLog]:
+    """Fail when the block runs more than ``max_queries`` SQL statements.
+
+    Meant for tests and budget checks, for example::
+
+        with query_budget(3, "list_programs"):
+            client.get("/api/v1/programs/")
+    """
+    with count_queries() as query_log:
+        yield query_log
+    if query_log.count > max_queries:
+        raise QueryBudgetExceeded(
+            f"{label} ran {query_log.count} SQL statements, budget is {max_queries}: "
+            f"{query_log.summary()}"
+        )
+
+
+class QueryCountMiddleware:
+    """Log requests that run more SQL statements than a threshold.
+
+    Intended for development. Each log line lists the statement shapes that
+    repeated, which is usually an N+1 lookup inside a loop.
+    """
+
+    def __init__(self, app, threshold: int):
+        """Wrap an ASGI app with per-request statement counting."""
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        """Count the request's statements and log it when it runs too many."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as query_log:
+            await self.app(scope, receive, send)
+        if query_log.count > self.threshold:
+            logger.warning(
+                "%s %s ran %s SQL statements (threshold %s): %s",
+                scope["method"],
+                scope["path"],
+                query_log.count,
+                self.threshold,
+                query_log.summary(),
+            )
@@ -1,14 +1,148 @@
-from collections import defaultdict, deque
-from time import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
 
 from fastapi import HTTPException, Request
 
+from app.core.config import settings
+from app.core.logging import get_logger
 
-_requests_by_key: dict[str, deque[float]] = defaultdict(deque)
+
+logger = get_logger(__name__)
+
+# Refill the bucket continuously at limit/window tokens per second. Using the
+# server clock keeps every worker and instance on the same timeline.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local window_ms = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now_ms = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_ms')
+local tokens = tonumber(bucket[1])
+local updated_ms = tonumber(bucket[2])
+if tokens == nil or updated_ms == nil then
+  tokens = capacity
+  updated_ms = now_ms
+end
+local elapsed_ms = math.max(0, now_ms - updated_ms)
+tokens = math.min(capacity, tokens + elapsed_ms * capacity / window_ms)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_ms', now_ms)
+redis.call('PEXPIRE', KEYS[1], window_ms)
+return allowed
+"""
+
+
+class RateLimitBackend(ABC):
+    """Interface for counting attempts against a per-key request limit."""
+
+    @abstractmethod
+    def hit(self, key: str, *, limit: int, window_seconds: int) -> bool:
+        """Record one attempt and return whether it is within the limit."""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Sliding-window counter kept in this process with a bounded key count."""
+
+    def __init__(self, max_keys: int = 10_000):
+        """Create an empty counter store that evicts the least recent keys."""
+        self.max_keys = max_keys
+        # key -> (window start, count in current window, count in previous
+        # window, window length in seconds)
+        self._windows: OrderedDict[str, tuple[float, int, int, int]] = OrderedDict()
+        self._lock = Lock()
+
+    def hit(self, key: str, *, limit: int, window_seconds: int) -> bool:
+        """Record one attempt using a weighted two-window estimate."""
+        now = monotonic()
+        with self._lock:
+            window_start, current, previous, _ = self._windows.get(key, (now, 0, 0, window_seconds))
+            elapsed_windows = int((now - window_start) // window_seconds)
+            if elapsed_windows == 1:
+                window_start += window_seconds
+                current, previous = 0, current
+            elif elapsed_windows > 1:
+                window_start, current, previous = now, 0, 0
+
+            previous_weight = 1 - (now - window_start) / window_seconds
+            allowed = previous * previous_weight + current < limit
+            if allowed:
+                current += 1
+
+            self._windows[key] = (window_start, current, previous, window_seconds)
+            self._windows.move_to_end(key)
+            self._evict(now)
+            return allowed
+
+    def _evict(self, now: float) -> None:
+        """Drop idle keys first, then the least recently used ones.
+
+        A key is idle once two of its own windows have passed, so a short
+        login window never evicts a key counted over a longer one.
+        """
+        while self._windows:
+            oldest_key, (window_start, _, _, window_seconds) = next(iter(self._windows.items()))
+            is_idle = now - window_start >= 2 * window_seconds
+            if not is_idle and len(self._windows) <= self.max_keys:
+                break
+            del self._windows[oldest_key]
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Token bucket stored in a Redis-protocol server shared by all workers."""
+
+    def __init__(self, url: str, key_prefix: str = "still:rate-limit:"):
+        """Connect to the shared store and register the bucket script."""
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.key_prefix = key_prefix
+        self._take_token = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def hit(self, key: str, *, limit: int, window_seconds: int) -> bool:
+        """Take one token from the shared bucket in a single atomic call."""
+        allowed = self._take_token(
+            keys=[f"{self.key_prefix}{key}"],
+            args=[limit, window_seconds * 1000],
+        )
+        return bool(int(allowed))
+
+
+_backend: RateLimitBackend | None = None
+_backend_lock = Lock()
+
+
+def create_rate_limit_backend() -> RateLimitBackend:
+    """Build the rate limit backend selected in settings."""
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend(settings.RATE_LIMIT_REDIS_URL)
+    return MemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    """Return the process-wide rate limit backend, creating it on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_rate_limit_backend()
+    return _backend
+
+
+def set_rate_limit_backend(backend: RateLimitBackend | None) -> None:
+    """Replace the process-wide backend, or reset it to the configured one."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
 
 
 def rate_limit_key(request: Request, scope: str) -> str:
-    """Build a basic client key for in-memory rate limiting."""
+    """Build a basic client key for rate limiting."""
     forwarded_for = request.headers.get("x-forwarded-for", "")
     ip_address = forwarded_for.split(",", 1)[0].strip()
     if not ip_address and request.client:
@@ -19,13 +153,18 @@ def rate_limit_key(request: Request, scope: str) -> str:
 def check_rate_limit(request: Request, *, scope: str, limit: int, window_seconds: int) -> None:
     """Allow only a fixed number of requests in a short time window."""
     key = rate_limit_key(request, scope)
-    now = time()
-    requests = _requests_by_key[key]
-    while requests and now - requests[0] > window_seconds:
-        requests.popleft()
-    if len(requests) >= limit:
+    try:
+        allowed = get_rate_limit_backend().hit(
+            key,
+            limit=limit,
+            window_seconds=window_seconds,
+        )
+    except Exception as error:
+        # A rate limit store outage should not lock every user out of sign-in.
+        logger.warning("Rate limit check failed for %s: %s", scope, error)
+        return
+    if not allowed:
         raise HTTPException(
             status_code=429,
             detail="Too many attempts. Please wait and try again.",
         )
-    requests.append(now)
@@ -1,4 +1,8 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import UTC, datetime, timedelta
+from threading import BoundedSemaphore, Lock
+
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -6,17 +10,97 @@ from app.core.config import settings
 SECRET_KEY = settings.JWT_SECRET_KEY
 ALGORITHM = "HS256"
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def build_password_context(rounds: int) -> CryptContext:
+    """Build a bcrypt context that treats any other cost as outdated.
+
+    Hashes made with more or fewer rounds than configured are flagged by
+    needs_update, so lowering BCRYPT_ROUNDS rehashes on sign-in just like
+    raising it does.
+    """
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+pwd_context = build_password_context(settings.BCRYPT_ROUNDS)
+
+_hash_pool: ProcessPoolExecutor | None = None
+_hash_pool_lock = Lock()
+_hash_slots = BoundedSemaphore(max(1, settings.PASSWORD_HASH_MAX_PENDING))
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when too many password hashes are already waiting to run."""
+
+
+def _hash_in_worker(password: str) -> str:
+    """Hash a password inside a password hashing worker process."""
+    return pwd_context.hash(password)
+
+
+def _verify_in_worker(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify a password and return a replacement hash when the cost changed."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def get_password_hash_pool() -> ProcessPoolExecutor | None:
+    """Return the shared hashing pool, or none when hashing runs inline."""
+    global _hash_pool
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return None
+    if _hash_pool is None:
+        with _hash_pool_lock:
+            if _hash_pool is None:
+                # Spawned workers avoid forking a process that already runs
+                # server threads and open database connections.
+                _hash_pool = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _hash_pool
+
+
+def shutdown_password_hash_pool() -> None:
+    """Stop the hashing worker processes when the application shuts down."""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(wait=False, cancel_futures=True)
+            _hash_pool = None
+
+
+def run_password_job(function, *args):
+    """Run a bcrypt job in the hashing pool, rejecting work when it is full."""
+    if not _hash_slots.acquire(blocking=False):
+        raise PasswordHasherBusy("Too many password checks are already waiting")
+    try:
+        pool = get_password_hash_pool()
+        if pool is None:
+            return function(*args)
+        return pool.submit(function, *args).result()
+    finally:
+        _hash_slots.release()
 
 
 def hash_password(password: str):
     """Turn a plain password into a safe value for storage."""
-    return pwd_context.hash(password)
+    return run_password_job(_hash_in_worker, password)
 
 
 def verify_password(plain_password, hashed_password):
     """Check whether a plain password matches the saved password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    is_valid, _ = verify_password_and_update(plain_password, hashed_password)
+    return is_valid
+
+
+def verify_password_and_update(plain_password, hashed_password) -> tuple[bool, str | None]:
+    """Check a password and return a new hash when the saved one is outdated."""
+    return run_password_job(_verify_in_worker, plain_password, hashed_password)
 
 
 def create_access_token(data: dict):
@@ -0,0 +1,174 @@
+"""Access token verification with a bounded cache of verified tokens."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hmac
+import json
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+from time import time
+
+from jose import JWTError, jwt
+
+from app.core.config import settings
+from app.core.security import ALGORITHM, SECRET_KEY
+
+
+class TokenError(Exception):
+    """Base class for access tokens that cannot be trusted."""
+
+
+class MalformedTokenError(TokenError):
+    """The token is not a well-formed JWT."""
+
+
+class InvalidSignatureError(TokenError):
+    """The token signature does not match the server secret."""
+
+
+class ExpiredTokenError(TokenError):
+    """The token was valid but its expiry time has passed."""
+
+
+class InvalidClaimsError(TokenError):
+    """The token is missing claims the API depends on."""
+
+
+def b64url_decode(segment: str) -> bytes:
+    """Decode one unpadded base64url JWT segment."""
+    try:
+        return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+    except (binascii.Error, ValueError) as error:
+        raise MalformedTokenError("Token segment is not base64url") from error
+
+
+class HmacTokenDecoder:
+    """Verify HS256 tokens with a one-shot HMAC digest and plain JSON parsing."""
+
+    def __init__(self, secret: str, algorithm: str = ALGORITHM):
+        """Keep the encoded secret so each check does no key setup."""
+        if algorithm != "HS256":
+            raise ValueError("HmacTokenDecoder only supports HS256")
+        self.secret = secret.encode("utf-8")
+        self.algorithm = algorithm
+
+    def decode(self, token: str) -> dict:
+        """Check the signature and return the token claims."""
+        parts = token.split(".")
+        if not token.isascii() or len(parts) != 3:
+            raise MalformedTokenError("Token is not a compact JWT")
+        header_segment, payload_segment, signature_segment = parts
+
+        try:
+            header = json.loads(b64url_decode(header_segment))
+        except ValueError as error:
+            raise MalformedTokenError("Token header is not JSON") from error
+        if not isinstance(header, dict) or header.get("alg") != self.algorithm:
+            raise InvalidSignatureError("Token uses an unexpected algorithm")
+
+        expected_signature = hmac.digest(
+            self.secret,
+            f"{header_segment}.{payload_segment}".encode("ascii"),
+            "sha256",
+        )
+        if not hmac.compare_digest(expected_signature, b64url_decode(signature_segment)):
+            raise InvalidSignatureError("Token signature does not match")
+
+        try:
+            payload = json.loads(b64url_decode(payload_segment))
+        except ValueError as error:
+            raise MalformedTokenError("Token payload is not JSON") from error
+        if not isinstance(payload, dict):
+            raise MalformedTokenError("Token payload must be an object")
+        return payload
+
+
+class JoseTokenDecoder:
+    """Verify tokens with python-jose for algorithms the HMAC path skips."""
+
+    def __init__(self, secret: str, algorithm: str = ALGORITHM):
+        """Remember the secret and algorithm used to sign tokens."""
+        self.secret = secret
+        self.algorithm = algorithm
+
+    def decode(self, token: str) -> dict:
+        """Check the signature and return the token claims."""
+        try:
+            # Expiry is checked by TokenVerifier so both decoders behave alike.
+            return jwt.decode(
+                token,
+                self.secret,
+                algorithms=[self.algorithm],
+                options={"verify_exp": False},
+            )
+        except JWTError as error:
+            raise InvalidSignatureError(str(error)) from error
+
+
+class TokenVerifier:
+    """Decode access tokens and remember verified ones until they expire."""
+
+    def __init__(self, decoder, max_entries: int = 10_000):
+        """Create an empty cache in front of a token decoder."""
+        self.decoder = decoder
+        self.max_entries = max_entries
+        # sha256(token) -> (expiry timestamp, verified claims)
+        self._cache: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = Lock()
+
+    def verify(self, token: str) -> dict:
+        """Return trusted claims for a token or raise a TokenError."""
+        cache_key = sha256(token.encode("utf-8")).digest()
+        now = time()
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                expires_at, payload = cached
+                if expires_at > now:
+                    self._cache.move_to_end(cache_key)
+                    return payload
+                del self._cache[cache_key]
+
+        payload = self.decoder.decode(token)
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)) or isinstance(expires_at, bool):
+            raise InvalidClaimsError("Token is missing an expiry time")
+        if expires_at <= now:
+            raise ExpiredTokenError("Token has expired")
+        if not payload.get("sub"):
+            raise InvalidClaimsError("Token is missing a subject")
+
+        with self._lock:
+            self._cache[cache_key] = (float(expires_at), payload)
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return payload
+
+    def clear(self) -> None:
+        """Forget every cached token."""
+        with self._lock:
+            self._cache.clear()
+
+
+def create_token_verifier() -> TokenVerifier:
+    """Build the token verifier selected in settings."""
+    if settings.JWT_VERIFY_BACKEND == "jose":
+        decoder = JoseTokenDecoder(SECRET_KEY)
+    else:
+        decoder = HmacTokenDecoder(SECRET_KEY)
+    return TokenVerifier(decoder, max_entries=settings.TOKEN_CACHE_MAX_ENTRIES)
+
+
+token_verifier = create_token_verifier()
+
+
+def verify_access_token(token: str) -> dict:
+    """Return the verified claims for a login token.
+
+    The returned dictionary is shared with the cache and must not be changed.
+    """
+    return token_verifier.verify(token)
@@ -1,10 +1,33 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.v1.router import api_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.core.csrf import csrf_protect
+from app.core.csrf import CSRFMiddleware
 from app.core.logging import setup_logging
+from app.core.metrics import (
+    MetricsMiddleware,
+    count_in_progress,
+    instrument_engine,
+    start_metrics_server,
+    stop_metrics,
+)
+from app.core.query_log import QueryCountMiddleware, instrument_engine_queries
+from app.core.security import shutdown_password_hash_pool
+from app.db.session import engine
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the metrics listener and release process-wide resources on stop."""
+    metrics_server = start_metrics_server(settings.METRICS_PORT)
+    yield
+    stop_metrics(metrics_server)
+    shutdown_password_hash_pool()
 
 
 def create_app() -> FastAPI:
@@ -17,6 +40,9 @@ def create_app() -> FastAPI:
         openapi_url="/api/v1/openapi.json",
         docs_url="/api/v1/docs",
         redoc_url="/api/v1/redoc",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+        dependencies=[Depends(count_in_progress)],
     )
 
     # CORS (frontend access)
@@ -28,7 +54,24 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    app.middleware("http")(csrf_protect)
+    app.add_middleware(CSRFMiddleware)
+
+    # Wraps every middleware added before it, so all responses are compressed.
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES,
+    )
+
+    if settings.SQL_QUERY_LOG_THRESHOLD:
+        app.add_middleware(
+            QueryCountMiddleware,
+            threshold=settings.SQL_QUERY_LOG_THRESHOLD,
+        )
+
+    # Outermost, so latency includes every other middleware.
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine)
+    instrument_engine_queries(engine)
 
     # Register API routers
     app.include_router(api_router, prefix="/api/v1")
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, JSON, String, Text, text
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class MediaJob(Base):
+    """An offline media processing task for one meditation."""
+    __tablename__ = "media_jobs"
+    __table_args__ = (
+        Index("ix_media_jobs_kind_status", "kind", "status", "id"),
+        # One active job per source, so concurrent requests cannot queue the
+        # same work twice.
+        Index(
+            "uq_media_jobs_active_source",
+            "meditation_id",
+            "kind",
+            "source_url",
+            unique=True,
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    meditation_id = Column(
+        Integer,
+        ForeignKey("meditations.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    kind = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="pending", server_default="pending")
+    source_url = Column(String, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    error = Column(Text, nullable=True)
+    result = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
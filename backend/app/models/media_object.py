@@ -0,0 +1,20 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class MediaObject(Base):
+    """An S3 object stored under the hash of its content."""
+    __tablename__ = "media_objects"
+
+    id = Column(Integer, primary_key=True)
+    object_key = Column(String, nullable=False, unique=True)
+    sha256 = Column(String(64), nullable=False, index=True)
+    size_bytes = Column(BigInteger, nullable=False)
+    content_type = Column(String, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
@@ -14,9 +14,23 @@ class Meditation(Base):
     duration_sec = Column(Integer, nullable=False)
     level = Column(String, nullable=False)
     audio_url = Column(String, nullable=True)
+    audio_renditions = Column(
+        JSON,
+        nullable=False,
+        default=dict,
+        server_default=text("'{}'::json"),
+    )
+    measured_duration_sec = Column(Integer, nullable=True)
+    hls_manifest_url = Column(String, nullable=True)
     description = Column(Text, nullable=False, default="", server_default="")
     teacher_name = Column(String, nullable=False, default="", server_default="")
     artwork_url = Column(String, nullable=True)
+    artwork_variants = Column(
+        JSON,
+        nullable=False,
+        default=dict,
+        server_default=text("'{}'::json"),
+    )
     tags = Column(
         JSON,
         nullable=False,
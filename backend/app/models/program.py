@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint, text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, JSON, String, Text, UniqueConstraint, text
 from sqlalchemy.sql import func
 
 from app.db.base import Base
@@ -12,6 +12,7 @@ class Program(Base):
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False, default="", server_default="")
     artwork_url = Column(String, nullable=True)
+    artwork_variants = Column(JSON, nullable=False, default=dict, server_default=text("'{}'::json"))
     level = Column(String, nullable=False, default="beginner", server_default="beginner")
     goal = Column(String, nullable=False, default="", server_default="")
     is_published = Column(Boolean, nullable=False, default=True, server_default=text("true"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, text
 from sqlalchemy.sql import func
 from app.db.base import Base
 
@@ -6,6 +6,38 @@ from app.db.base import Base
 class MeditationSession(Base):
     """One listening attempt for a meditation on a specific device."""
     __tablename__ = "meditation_sessions"
+    __table_args__ = (
+        # Anonymous reads and the sign-in merge look sessions up by device.
+        Index(
+            "ix_meditation_sessions_anonymous_device_id",
+            "device_id",
+            postgresql_where=text("user_id IS NULL"),
+        ),
+        # One unfinished session per owner, meditation, and program. Starting
+        # playback upserts against these, so concurrent starts share a session.
+        Index(
+            "uq_meditation_sessions_open_user",
+            "user_id",
+            "meditation_id",
+            text("coalesce(program_id, 0)"),
+            unique=True,
+            postgresql_where=text("completed_at IS NULL AND user_id IS NOT NULL"),
+        ),
+        Index(
+            "uq_meditation_sessions_open_device",
+            "device_id",
+            "meditation_id",
+            text("coalesce(program_id, 0)"),
+            unique=True,
+            postgresql_where=text("completed_at IS NULL AND user_id IS NULL"),
+        ),
+        Index(
+            "uq_meditation_sessions_start_key",
+            "start_key",
+            unique=True,
+            postgresql_where=text("start_key IS NOT NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     meditation_id = Column(Integer, ForeignKey("meditations.id"))
@@ -22,6 +54,8 @@ class MeditationSession(Base):
         index=True,
     )
     device_id = Column(Integer)
+    # Idempotency key sent by the client that started the session.
+    start_key = Column(String(64), nullable=True)
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
     last_listened_at = Column(DateTime(timezone=True), nullable=True)
@@ -42,17 +76,23 @@ class MeditationSession(Base):
 class MeditationSessionActivity(Base):
     """A small record of listening time used to build daily progress."""
     __tablename__ = "meditation_session_activity"
+    # Range-partitioned by month on recorded_at. Partitions are created and
+    # retired with app.cli.activity_partitions.
+    __table_args__ = (
+        Index("ix_meditation_session_activity_session_id", "session_id", "recorded_at"),
+        {"postgresql_partition_by": "RANGE (recorded_at)"},
+    )
 
-    id = Column(Integer, primary_key=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     session_id = Column(
         Integer,
         ForeignKey("meditation_sessions.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     seconds_listened = Column(Integer, nullable=False)
     recorded_at = Column(
         DateTime(timezone=True),
+        primary_key=True,
         nullable=False,
         server_default=func.now(),
     )
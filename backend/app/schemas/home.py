@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+from app.schemas.ai import AIRecommendedMeditation
+from app.schemas.favorite import FavoriteListResponse
+from app.schemas.program import UserProgramRead
+from app.schemas.session import ProgressSummary, SessionHistoryItem, SessionHistoryResponse
+
+
+class HomeFeedResponse(BaseModel):
+    """Every section of the home screen, built from one shared load."""
+    progress: ProgressSummary
+    continue_listening: list[SessionHistoryItem]
+    history: SessionHistoryResponse
+    favorites: FavoriteListResponse
+    programs: list[UserProgramRead]
+    recommendations: list[AIRecommendedMeditation]
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Literal
 from urllib.parse import urlparse
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
@@ -174,5 +175,51 @@ class MeditationRead(MeditationBase):
     id: int
     is_published: bool
     created_at: datetime
+    audio_renditions: dict[str, str] = Field(default_factory=dict)
+    hls_manifest_url: str | None = None
+    artwork_variants: dict[str, dict[str, str]] = Field(default_factory=dict)
+    measured_duration_sec: int | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class DirectUploadRequest(BaseModel):
+    """A file an administrator wants to upload straight to S3."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    kind: Literal["audio", "artwork"]
+    filename: str = Field(min_length=1, max_length=255)
+    content_type: str = Field(min_length=1, max_length=100)
+    size_bytes: int = Field(gt=0)
+
+
+class DirectUploadPart(BaseModel):
+    """A presigned URL for one part of a multipart upload."""
+    part_number: int
+    url: str
+    size_bytes: int
+
+
+class DirectUploadTicket(BaseModel):
+    """Where the browser should send a file, and which headers to use."""
+    kind: Literal["audio", "artwork"]
+    key: str
+    expires_in: int
+    headers: dict[str, str] = Field(default_factory=dict)
+    url: str | None = None
+    upload_id: str | None = None
+    parts: list[DirectUploadPart] = Field(default_factory=list)
+
+
+class CompletedUploadPart(BaseModel):
+    """An uploaded part and the ETag S3 returned for it."""
+    part_number: int = Field(ge=1, le=10_000)
+    etag: str = Field(min_length=1, max_length=200)
+
+
+class DirectUploadFinalize(BaseModel):
+    """A finished direct upload to check and attach to a meditation."""
+    kind: Literal["audio", "artwork"]
+    key: str = Field(min_length=1, max_length=1_024)
+    upload_id: str | None = None
+    parts: list[CompletedUploadPart] = Field(default_factory=list)
@@ -69,6 +69,7 @@ class ProgramRead(ProgramBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    artwork_variants: dict[str, dict[str, str]] = Field(default_factory=dict)
     is_enrolled: bool = False
     enrollment_started_at: datetime | None = None
     enrollment_completed_at: datetime | None = None
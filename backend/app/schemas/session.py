@@ -1,4 +1,5 @@
 from datetime import date, datetime
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -8,6 +9,7 @@ class SessionStart(BaseModel):
     meditation_id: int = Field(gt=0)
     device_id: int = Field(gt=0)
     program_id: int | None = Field(default=None, gt=0)
+    audio_quality: Literal["low", "medium", "high", "original"] | None = None
 
 
 class SessionProgress(BaseModel):
@@ -34,6 +36,8 @@ class SessionRead(BaseModel):
     last_listened_at: datetime | None
     seconds_listened: int
     last_position_sec: int
+    audio_url: str | None = None
+    hls_manifest_url: str | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -95,4 +99,6 @@ class DeviceSyncResponse(BaseModel):
     """Summary of anonymous sessions linked to the signed-in user."""
     device_id: int
     user_id: int
-    attached_sessions: int
+    attached_sessions: int = 0
+    removed_duplicate_sessions: int = 0
+    detached_program_sessions: int = 0
@@ -0,0 +1,308 @@
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import subprocess
+from pathlib import Path, PurePath
+from tempfile import TemporaryDirectory
+from typing import NamedTuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.media_job import MediaJob
+from app.models.meditation import Meditation
+from app.services.media_jobs import enqueue_media_job
+from app.services.s3_service import S3Service
+
+
+logger = get_logger(__name__)
+AUDIO_RENDITIONS_JOB = "audio_renditions"
+AUDIO_HLS_JOB = "audio_hls"
+AUDIO_JOB_KINDS = (AUDIO_RENDITIONS_JOB, AUDIO_HLS_JOB)
+HLS_SEGMENT_SECONDS = 6
+HLS_UPLOAD_WORKERS = 8
+# Segment keys include the source hash, so they never change once written.
+HLS_CACHE_CONTROL = "public, max-age=31536000, immutable"
+HLS_CONTENT_TYPES = {
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".ts": "video/mp2t",
+}
+# EBU R128 style targets suited to quiet spoken-word audio.
+LOUDNESS_FILTER = "loudnorm=I=-16:TP=-1.5:LRA=11"
+# Allowed gap between the measured length and duration_sec before a job
+# flags the meditation for review.
+DURATION_TOLERANCE_SEC = 5
+DURATION_TOLERANCE_RATIO = 0.02
+
+
+class AudioRendition(NamedTuple):
+    """Encoder settings for one rendition of a meditation's audio."""
+    name: str
+    bitrate: str
+    channels: int
+
+
+AUDIO_RENDITIONS = (
+    AudioRendition("low", "48k", 1),
+    AudioRendition("medium", "96k", 2),
+    AudioRendition("high", "160k", 2),
+)
+
+
+class MediaProcessingError(RuntimeError):
+    """Raised when ffmpeg or the source file cannot be processed."""
+
+
+def run_media_tool(command: list[str]) -> str:
+    """Run ffmpeg or ffprobe and return its standard output."""
+    try:
+        completed = subprocess.run(
+            command,
+            check=True,
+            capture_output=True,
+            text=True,
+            stdin=subprocess.DEVNULL,
+        )
+    except FileNotFoundError as error:
+        raise MediaProcessingError(f"{command[0]} is not installed") from error
+    except subprocess.CalledProcessError as error:
+        message = (error.stderr or "").strip().splitlines()
+        raise MediaProcessingError(
+            f"{PurePath(command[0]).name} failed: {message[-1] if message else error.returncode}"
+        ) from error
+    return completed.stdout
+
+
+def probe_duration(path: Path) -> float:
+    """Return the playing time of an audio file in seconds."""
+    output = run_media_tool(
+        [
+            settings.FFPROBE_PATH,
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "json",
+            str(path),
+        ]
+    )
+    try:
+        return float(json.loads(output)["format"]["duration"])
+    except (KeyError, TypeError, ValueError) as error:
+        raise MediaProcessingError("ffprobe did not report a duration") from error
+
+
+def render_audio(source: Path, destination: Path, rendition: AudioRendition) -> None:
+    """Encode one loudness-normalized AAC rendition of the source audio."""
+    run_media_tool(
+        [
+            settings.FFMPEG_PATH,
+            "-nostdin",
+            "-y",
+            "-v",
+            "error",
+            "-i",
+            str(source),
+            "-vn",
+            "-map_metadata",
+            "-1",
+            "-af",
+            LOUDNESS_FILTER,
+            "-ac",
+            str(rendition.channels),
+            "-c:a",
+            "aac",
+            "-b:a",
+            rendition.bitrate,
+            "-movflags",
+            "+faststart",
+            str(destination),
+        ]
+    )
+
+
+def segment_audio(source: Path, directory: Path, rendition: AudioRendition) -> None:
+    """Encode one rendition as fixed-length HLS segments and a media playlist."""
+    directory.mkdir(parents=True, exist_ok=True)
+    run_media_tool(
+        [
+            settings.FFMPEG_PATH,
+            "-nostdin",
+            "-y",
+            "-v",
+            "error",
+            "-i",
+            str(source),
+            "-vn",
+            "-map_metadata",
+            "-1",
+            "-af",
+            LOUDNESS_FILTER,
+            "-ac",
+            str(rendition.channels),
+            "-c:a",
+            "aac",
+            "-b:a",
+            rendition.bitrate,
+            "-f",
+            "hls",
+            "-hls_time",
+            str(HLS_SEGMENT_SECONDS),
+            "-hls_playlist_type",
+            "vod",
+            "-hls_segment_filename",
+            str(directory / "segment_%05d.ts"),
+            str(directory / "index.m3u8"),
+        ]
+    )
+
+
+def master_playlist() -> str:
+    """Build the HLS master playlist that lists every rendition."""
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
+    for rendition in AUDIO_RENDITIONS:
+        # Advertise the audio bitrate plus roughly 10% MPEG-TS overhead.
+        bandwidth = int(int(rendition.bitrate.removesuffix("k")) * 1000 * 1.1)
+        lines.append(f'#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},CODECS="mp4a.40.2"')
+        lines.append(f"{rendition.name}/index.m3u8")
+    return "\n".join(lines) + "\n"
+
+
+def fetch_source_audio(s3: S3Service, source_url: str, directory: Path) -> Path:
+    """Download a meditation's uploaded audio into a working directory."""
+    key = s3.key_from_url(source_url)
+    if key is None:
+        raise MediaProcessingError("Audio is not stored in the media bucket")
+    source = directory / f"source{PurePath(key).suffix.lower()}"
+    s3.download_file(key, str(source))
+    return source
+
+
+def duration_mismatch(expected_sec: int, measured_sec: float) -> bool:
+    """Check whether the saved duration is noticeably wrong."""
+    tolerance = max(DURATION_TOLERANCE_SEC, expected_sec * DURATION_TOLERANCE_RATIO)
+    return abs(expected_sec - measured_sec) > tolerance
+
+
+def enqueue_audio_processing(
+    db: Session,
+    meditation: Meditation,
+    kinds: tuple[str, ...] = AUDIO_JOB_KINDS,
+) -> list[MediaJob | None]:
+    """Queue renditions and HLS packaging for a meditation's current audio.
+
+    Returns one entry per kind, None where that job was already queued, or an
+    empty list when the meditation has no audio.
+    """
+    if not meditation.audio_url:
+        return []
+    return [
+        enqueue_media_job(db, meditation.id, kind, meditation.audio_url)
+        for kind in kinds
+    ]
+
+
+def process_audio_renditions(db: Session, job: MediaJob) -> dict:
+    """Build renditions for a claimed job and save their URLs on the meditation."""
+    meditation = db.query(Meditation).filter(Meditation.id == job.meditation_id).first()
+    if meditation is None:
+        raise MediaProcessingError("Meditation no longer exists")
+
+    s3 = S3Service()
+    renditions: dict[str, str] = {}
+    with TemporaryDirectory(prefix="still-audio-") as working_directory:
+        directory = Path(working_directory)
+        # Release the connection while files download and encode.
+        db.rollback()
+        source = fetch_source_audio(s3, job.source_url, directory)
+        measured_sec = probe_duration(source)
+        for rendition in AUDIO_RENDITIONS:
+            destination = directory / f"{rendition.name}.m4a"
+            render_audio(source, destination, rendition)
+            with destination.open("rb") as rendition_file:
+                renditions[rendition.name] = s3.upload_file(
+                    rendition_file,
+                    destination.name,
+                    "audio/mp4",
+                    prefix="audio/renditions",
+                )
+
+    measured_duration_sec = round(measured_sec)
+    is_mismatch = duration_mismatch(meditation.duration_sec, measured_sec)
+    if is_mismatch:
+        logger.warning(
+            "Duration mismatch for meditation_id=%s: saved=%ss measured=%ss",
+            meditation.id,
+            meditation.duration_sec,
+            measured_duration_sec,
+        )
+
+    # Another upload may have replaced the audio while this job ran.
+    if meditation.audio_url == job.source_url:
+        meditation.audio_renditions = renditions
+        meditation.measured_duration_sec = measured_duration_sec
+    return {
+        "renditions": renditions,
+        "measured_duration_sec": measured_duration_sec,
+        "duration_sec": meditation.duration_sec,
+        "duration_mismatch": is_mismatch,
+        "applied": meditation.audio_url == job.source_url,
+    }
+
+
+def process_audio_hls(db: Session, job: MediaJob) -> dict:
+    """Package a claimed job's audio as HLS and save the master playlist URL."""
+    meditation = db.query(Meditation).filter(Meditation.id == job.meditation_id).first()
+    if meditation is None:
+        raise MediaProcessingError("Meditation no longer exists")
+
+    s3 = S3Service()
+    with TemporaryDirectory(prefix="still-hls-") as working_directory:
+        directory = Path(working_directory)
+        db.rollback()
+        source = fetch_source_audio(s3, job.source_url, directory)
+        with source.open("rb") as source_file:
+            source_hash = hashlib.file_digest(source_file, "sha256").hexdigest()
+
+        package = directory / "hls"
+        for rendition in AUDIO_RENDITIONS:
+            segment_audio(source, package / rendition.name, rendition)
+        (package / "master.m3u8").write_text(master_playlist())
+
+        key_prefix = f"audio/hls/{source_hash}"
+        files = sorted(path for path in package.rglob("*") if path.is_file())
+        # Upload playlists last so players never see a playlist whose
+        # segments are still missing.
+        segments = [path for path in files if path.suffix != ".m3u8"]
+        playlists = [path for path in files if path.suffix == ".m3u8"]
+        playlists.sort(key=lambda path: path.name == "master.m3u8")
+
+        def upload(path: Path) -> str:
+            """Upload one packaged file under the job's key prefix."""
+            return s3.upload_path(
+                path,
+                f"{key_prefix}/{path.relative_to(package).as_posix()}",
+                HLS_CONTENT_TYPES[path.suffix],
+                cache_control=HLS_CACHE_CONTROL,
+            )
+
+        with ThreadPoolExecutor(max_workers=HLS_UPLOAD_WORKERS) as executor:
+            list(executor.map(upload, segments))
+        manifest_url = [upload(path) for path in playlists][-1]
+
+    applied = meditation.audio_url == job.source_url
+    if applied:
+        meditation.hls_manifest_url = manifest_url
+    return {
+        "manifest_url": manifest_url,
+        "segments": len(segments),
+        "applied": applied,
+    }
+
+
+AUDIO_JOB_HANDLERS = {
+    AUDIO_RENDITIONS_JOB: process_audio_renditions,
+    AUDIO_HLS_JOB: process_audio_hls,
+}
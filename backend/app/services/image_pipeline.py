@@ -0,0 +1,93 @@
+from io import BytesIO
+from typing import NamedTuple
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.core.logging import get_logger
+from app.services.s3_service import S3Service
+
+
+logger = get_logger(__name__)
+ARTWORK_VARIANT_WIDTHS = (320, 640, 1280)
+ARTWORK_VARIANT_PREFIX = "artwork/variants"
+
+
+class ImageFormat(NamedTuple):
+    """Encoder settings for one responsive artwork format."""
+    name: str
+    pillow_format: str
+    content_type: str
+    quality: int
+
+
+ARTWORK_FORMATS = (
+    ImageFormat("avif", "AVIF", "image/avif", 50),
+    ImageFormat("webp", "WEBP", "image/webp", 80),
+)
+
+
+class ArtworkProcessingError(ValueError):
+    """Raised when artwork cannot be decoded as an image."""
+
+
+def load_artwork(file_obj) -> Image.Image:
+    """Decode artwork, apply its EXIF rotation, and drop everything but pixels."""
+    try:
+        image = Image.open(file_obj)
+        image = ImageOps.exif_transpose(image)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as error:
+        raise ArtworkProcessingError("Artwork could not be read as an image") from error
+
+    mode = "RGBA" if image.mode in {"RGBA", "LA", "PA"} or "transparency" in image.info else "RGB"
+    # Copying the pixels into a new image leaves EXIF, XMP, and ICC data behind.
+    stripped = Image.new(mode, image.size)
+    stripped.paste(image.convert(mode))
+    return stripped
+
+
+def variant_widths(original_width: int) -> list[int]:
+    """Return the target widths for an image without upscaling it."""
+    widths = [width for width in ARTWORK_VARIANT_WIDTHS if width < original_width]
+    widths.append(min(original_width, ARTWORK_VARIANT_WIDTHS[-1]))
+    return sorted(set(widths))
+
+
+def encode_variant(image: Image.Image, width: int, image_format: ImageFormat) -> BytesIO:
+    """Resize artwork to a width and encode it in one format."""
+    height = max(1, round(image.height * width / image.width))
+    resized = image if width == image.width else image.resize((width, height), Image.Resampling.LANCZOS)
+    output = BytesIO()
+    resized.save(output, image_format.pillow_format, quality=image_format.quality)
+    output.seek(0)
+    return output
+
+
+def build_artwork_variants(file_obj, s3: S3Service | None = None) -> dict[str, dict[str, str]]:
+    """Upload resized WebP and AVIF copies of artwork and return their URLs.
+
+    The result maps format to width to URL, for example
+    ``{"webp": {"320": "https://..."}}``.
+    """
+    s3 = s3 or S3Service()
+    image = load_artwork(file_obj)
+    variants: dict[str, dict[str, str]] = {}
+    for image_format in ARTWORK_FORMATS:
+        urls = variants.setdefault(image_format.name, {})
+        for width in variant_widths(image.width):
+            encoded = encode_variant(image, width, image_format)
+            urls[str(width)] = s3.upload_file(
+                encoded,
+                f"{width}w.{image_format.name}",
+                image_format.content_type,
+                prefix=ARTWORK_VARIANT_PREFIX,
+            )
+    return variants
+
+
+def artwork_variants_or_empty(file_obj, s3: S3Service | None = None) -> dict[str, dict[str, str]]:
+    """Build artwork variants, keeping the upload working if the image is unusual."""
+    try:
+        return build_artwork_variants(file_obj, s3)
+    except ArtworkProcessingError as error:
+        logger.warning("Skipped artwork variants: %s", error)
+        return {}
@@ -0,0 +1,92 @@
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger
+from app.models.media_job import MediaJob
+
+
+logger = get_logger(__name__)
+ACTIVE_JOB_STATUSES = ("pending", "running")
+# A running job whose worker has not finished it within this time is assumed
+# to be abandoned, for example because the worker was killed, and is claimed
+# again. It must comfortably exceed the longest HLS encode.
+RUNNING_JOB_LEASE = timedelta(hours=2)
+
+
+def enqueue_media_job(
+    db: Session,
+    meditation_id: int,
+    kind: str,
+    source_url: str,
+) -> MediaJob | None:
+    """Queue a processing job and return it, or None if the source is already queued.
+
+    The caller commits, so queuing can share a transaction with the change
+    that made the job necessary. A unique index allows one active job per
+    source, so a concurrent request that queues the same job first wins.
+    """
+    already_queued = db.query(MediaJob.id).filter(
+        MediaJob.meditation_id == meditation_id,
+        MediaJob.kind == kind,
+        MediaJob.source_url == source_url,
+        MediaJob.status.in_(ACTIVE_JOB_STATUSES),
+    ).first()
+    if already_queued is not None:
+        return None
+
+    job = MediaJob(meditation_id=meditation_id, kind=kind, source_url=source_url)
+    try:
+        with db.begin_nested():
+            db.add(job)
+    except IntegrityError:
+        return None
+    return job
+
+
+def claim_next_media_job(db: Session, kind: str) -> MediaJob | None:
+    """Mark the oldest pending job of a kind as running and return it.
+
+    Running jobs whose lease has expired are claimed again. Rows are locked
+    with SKIP LOCKED so several workers can drain the queue without picking
+    the same job.
+    """
+    lease_expired_before = datetime.now(UTC) - RUNNING_JOB_LEASE
+    job = db.query(MediaJob).filter(
+        MediaJob.kind == kind,
+        or_(
+            MediaJob.status == "pending",
+            and_(MediaJob.status == "running", MediaJob.started_at < lease_expired_before),
+        ),
+    ).order_by(MediaJob.id.asc()).with_for_update(skip_locked=True).first()
+    if job is None:
+        db.rollback()
+        return None
+
+    job.status = "running"
+    job.attempts += 1
+    job.started_at = datetime.now(UTC)
+    job.error = None
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def finish_media_job(db: Session, job: MediaJob, result: dict) -> None:
+    """Record a successful job."""
+    job.status = "succeeded"
+    job.result = result
+    job.finished_at = datetime.now(UTC)
+    db.commit()
+
+
+def fail_media_job(db: Session, job: MediaJob, error: Exception) -> None:
+    """Record why a job failed so it can be inspected and queued again."""
+    db.rollback()
+    job.status = "failed"
+    job.error = str(error) or error.__class__.__name__
+    job.finished_at = datetime.now(UTC)
+    db.commit()
+    logger.warning("Media job %s (%s) failed: %s", job.id, job.kind, job.error)
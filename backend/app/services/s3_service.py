@@ -1,21 +1,183 @@
-import uuid
-from pathlib import PurePath
-from urllib.parse import quote
+import hashlib
+from contextlib import contextmanager
+from pathlib import Path, PurePath
+from tempfile import SpooledTemporaryFile
+from threading import Lock
+from time import perf_counter
+from urllib.parse import quote, unquote
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from sqlalchemy.exc import IntegrityError
+
 from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.media_object import MediaObject
+
+HASH_CHUNK_BYTES = 1024 * 1024
+SPOOL_MAX_MEMORY_BYTES = 16 * 1024 * 1024
+# Direct uploads at or above this size are split into presigned parts.
+MULTIPART_UPLOAD_THRESHOLD_BYTES = 100 * 1024 * 1024
+MULTIPART_UPLOAD_PART_BYTES = 64 * 1024 * 1024
+MEGABYTE = 1024 * 1024
+
+_client = None
+_client_lock = Lock()
+
+
+def get_s3_client():
+    """Return the process-wide S3 client, creating it on first use.
+
+    boto3 clients are safe to share between threads, so every request and
+    import worker reuses one connection pool and one set of credentials.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = boto3.session.Session().client(
+                    "s3",
+                    aws_access_key_id=settings.AWS_ACCESS_KEY,
+                    aws_secret_access_key=settings.AWS_SECRET_KEY,
+                    region_name=settings.AWS_REGION,
+                    endpoint_url=settings.S3_ENDPOINT_URL or None,
+                    config=Config(
+                        max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                        retries={"mode": "standard"},
+                    ),
+                )
+    return _client
+
+
+def reset_s3_client() -> None:
+    """Forget the shared client so the next call builds a new one."""
+    global _client
+    with _client_lock:
+        _client = None
+
+
+transfer_config = TransferConfig(
+    multipart_threshold=settings.S3_MULTIPART_THRESHOLD_MB * MEGABYTE,
+    multipart_chunksize=settings.S3_MULTIPART_CHUNK_MB * MEGABYTE,
+    max_concurrency=settings.S3_TRANSFER_CONCURRENCY,
+)
+
+
+class UploadMetrics:
+    """Running totals for uploads sent from this process."""
+
+    def __init__(self):
+        """Start with empty totals."""
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear every total."""
+        with self._lock:
+            self.uploads = 0
+            self.uploaded_bytes = 0
+            self.upload_seconds = 0.0
+            self.reused = 0
+            self.reused_bytes = 0
+            self.failures = 0
+
+    def record_upload(self, size_bytes: int, seconds: float) -> None:
+        """Count one finished transfer."""
+        with self._lock:
+            self.uploads += 1
+            self.uploaded_bytes += size_bytes
+            self.upload_seconds += seconds
+
+    def record_reuse(self, size_bytes: int) -> None:
+        """Count content that was already stored and did not need sending."""
+        with self._lock:
+            self.reused += 1
+            self.reused_bytes += size_bytes
+
+    def record_failure(self) -> None:
+        """Count a transfer that raised an error."""
+        with self._lock:
+            self.failures += 1
+
+    def snapshot(self) -> dict:
+        """Return the totals and the average transfer throughput."""
+        with self._lock:
+            throughput = self.uploaded_bytes / self.upload_seconds if self.upload_seconds else 0.0
+            return {
+                "uploads": self.uploads,
+                "uploaded_bytes": self.uploaded_bytes,
+                "upload_seconds": round(self.upload_seconds, 3),
+                "throughput_bytes_per_second": round(throughput, 1),
+                "reused": self.reused,
+                "reused_bytes": self.reused_bytes,
+                "failures": self.failures,
+            }
+
+
+upload_metrics = UploadMetrics()
+
+
+@contextmanager
+def hashed_stream(file_obj):
+    """Hash a file while reading it and yield the digest, size, and a rewound stream."""
+    digest = hashlib.sha256()
+    size = 0
+    if file_obj.seekable():
+        start = file_obj.tell()
+        while chunk := file_obj.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+            size += len(chunk)
+        file_obj.seek(start)
+        yield digest.hexdigest(), size, file_obj
+        return
+
+    # Streams that cannot rewind are copied aside once so the upload can
+    # start after the hash, and therefore the object key, is known.
+    with SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY_BYTES) as spool:
+        while chunk := file_obj.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+            size += len(chunk)
+            spool.write(chunk)
+        spool.seek(0)
+        yield digest.hexdigest(), size, spool
+
+
+def is_known_media(key: str) -> bool:
+    """Check the local table of media that has already been uploaded."""
+    db = SessionLocal()
+    try:
+        return db.query(MediaObject.id).filter(MediaObject.object_key == key).first() is not None
+    finally:
+        db.close()
+
+
+def remember_media(key: str, sha256: str, size_bytes: int, content_type: str) -> None:
+    """Record an uploaded object so the same content is not sent again."""
+    db = SessionLocal()
+    try:
+        db.add(
+            MediaObject(
+                object_key=key,
+                sha256=sha256,
+                size_bytes=size_bytes,
+                content_type=content_type,
+            )
+        )
+        db.commit()
+    except IntegrityError:
+        # Another upload of the same content recorded it first.
+        db.rollback()
+    finally:
+        db.close()
 
 
 class S3Service:
     """Small helper for uploading media files to S3."""
     def __init__(self):
-        """Create the S3 client using the configured AWS settings."""
-        self.client = boto3.client(
-            "s3",
-            aws_access_key_id=settings.AWS_ACCESS_KEY,
-            aws_secret_access_key=settings.AWS_SECRET_KEY,
-            region_name=settings.AWS_REGION,
-        )
+        """Use the shared S3 client for the configured bucket."""
+        self.client = get_s3_client()
 
     def upload_file(
         self,
@@ -24,26 +186,205 @@ class S3Service:
         content_type: str,
         prefix: str = "",
     ):
-        """Upload a file and return the public URL for it."""
-        safe_filename = PurePath(filename.replace("\\", "/")).name
-        unique_filename = f"{uuid.uuid4()}-{safe_filename}"
-        key = f"{prefix.strip('/')}/{unique_filename}" if prefix else unique_filename
+        """Upload a file under its content hash and return the public URL for it.
 
-        self.client.upload_fileobj(
-            file_obj,
+        Identical content maps to the same key, so repeat uploads skip the
+        transfer when the object is already known or already in the bucket.
+        """
+        with hashed_stream(file_obj) as (sha256, size_bytes, stream):
+            key = self.content_key(sha256, filename, prefix)
+            if is_known_media(key):
+                upload_metrics.record_reuse(size_bytes)
+                return self.generate_public_url(key)
+
+            if self.object_exists(key):
+                upload_metrics.record_reuse(size_bytes)
+            else:
+                started = perf_counter()
+                try:
+                    self.client.upload_fileobj(
+                        stream,
+                        settings.AWS_S3_BUCKET,
+                        key,
+                        ExtraArgs={
+                            "ContentType": content_type,
+                            "ContentDisposition": "inline",
+                            "Metadata": {"sha256": sha256},
+                        },
+                        Config=transfer_config,
+                    )
+                except Exception:
+                    upload_metrics.record_failure()
+                    raise
+                upload_metrics.record_upload(size_bytes, perf_counter() - started)
+            remember_media(key, sha256, size_bytes, content_type)
+
+        return self.generate_public_url(key)
+
+    def upload_path(
+        self,
+        path: Path,
+        key: str,
+        content_type: str,
+        cache_control: str | None = None,
+    ):
+        """Upload a local file to an exact key and return the public URL for it."""
+        extra_args = {"ContentType": content_type, "ContentDisposition": "inline"}
+        if cache_control:
+            extra_args["CacheControl"] = cache_control
+        started = perf_counter()
+        try:
+            self.client.upload_file(
+                str(path),
+                settings.AWS_S3_BUCKET,
+                key,
+                ExtraArgs=extra_args,
+                Config=transfer_config,
+            )
+        except Exception:
+            upload_metrics.record_failure()
+            raise
+        upload_metrics.record_upload(path.stat().st_size, perf_counter() - started)
+        return self.generate_public_url(key)
+
+    def content_key(self, sha256: str, filename: str, prefix: str = "") -> str:
+        """Build the object key for content with the given hash."""
+        suffix = PurePath(filename.replace("\\", "/")).suffix.lower()
+        content_filename = f"{sha256}{suffix}"
+        return f"{prefix.strip('/')}/{content_filename}" if prefix else content_filename
+
+    def object_exists(self, key: str) -> bool:
+        """Check whether an object is already stored in the bucket."""
+        return self.object_metadata(key) is not None
+
+    def object_metadata(self, key: str) -> dict | None:
+        """Return the HEAD response for an object, or none when it is missing."""
+        try:
+            return self.client.head_object(Bucket=settings.AWS_S3_BUCKET, Key=key)
+        except ClientError as error:
+            if error.response.get("Error", {}).get("Code") in {"404", "NoSuchKey", "NotFound"}:
+                return None
+            raise
+
+    def delete_object(self, key: str) -> None:
+        """Remove an object from the bucket."""
+        self.client.delete_object(Bucket=settings.AWS_S3_BUCKET, Key=key)
+
+    def create_direct_upload(
+        self,
+        key: str,
+        content_type: str,
+        size_bytes: int,
+        expires_in: int,
+    ) -> dict:
+        """Presign a PUT, or a set of multipart part URLs, for one object.
+
+        Each URL signs the exact Content-Length, so S3 rejects bodies that
+        differ from the size the upload was approved for.
+        """
+        if size_bytes < MULTIPART_UPLOAD_THRESHOLD_BYTES:
+            url = self.client.generate_presigned_url(
+                "put_object",
+                Params={
+                    "Bucket": settings.AWS_S3_BUCKET,
+                    "Key": key,
+                    "ContentType": content_type,
+                    "ContentDisposition": "inline",
+                    "ContentLength": size_bytes,
+                },
+                ExpiresIn=expires_in,
+            )
+            return {
+                "url": url,
+                "headers": {"Content-Type": content_type, "Content-Disposition": "inline"},
+            }
+
+        upload = self.client.create_multipart_upload(
+            Bucket=settings.AWS_S3_BUCKET,
+            Key=key,
+            ContentType=content_type,
+            ContentDisposition="inline",
+        )
+        parts = []
+        for offset in range(0, size_bytes, MULTIPART_UPLOAD_PART_BYTES):
+            part_size = min(MULTIPART_UPLOAD_PART_BYTES, size_bytes - offset)
+            part_number = len(parts) + 1
+            parts.append(
+                {
+                    "part_number": part_number,
+                    "size_bytes": part_size,
+                    "url": self.client.generate_presigned_url(
+                        "upload_part",
+                        Params={
+                            "Bucket": settings.AWS_S3_BUCKET,
+                            "Key": key,
+                            "UploadId": upload["UploadId"],
+                            "PartNumber": part_number,
+                            "ContentLength": part_size,
+                        },
+                        ExpiresIn=expires_in,
+                    ),
+                }
+            )
+        return {"upload_id": upload["UploadId"], "parts": parts, "headers": {}}
+
+    def complete_multipart_upload(
+        self,
+        key: str,
+        upload_id: str,
+        parts: list[tuple[int, str]],
+    ) -> None:
+        """Join uploaded parts into the final object."""
+        self.client.complete_multipart_upload(
+            Bucket=settings.AWS_S3_BUCKET,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"PartNumber": part_number, "ETag": etag}
+                    for part_number, etag in sorted(parts)
+                ]
+            },
+        )
+
+    def abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        """Discard the parts of an unfinished multipart upload."""
+        self.client.abort_multipart_upload(
+            Bucket=settings.AWS_S3_BUCKET,
+            Key=key,
+            UploadId=upload_id,
+        )
+
+    def download_file(self, key: str, path: str) -> None:
+        """Copy an object from the bucket to a local file."""
+        self.client.download_file(
             settings.AWS_S3_BUCKET,
             key,
-            ExtraArgs={
-                "ContentType": content_type,
-                "ContentDisposition": "inline",
-            },
+            path,
+            Config=transfer_config,
         )
 
-        return self.generate_public_url(key)
+    def download_fileobj(self, key: str, file_obj) -> None:
+        """Copy an object from the bucket into an open binary file."""
+        self.client.download_fileobj(
+            settings.AWS_S3_BUCKET,
+            key,
+            file_obj,
+            Config=transfer_config,
+        )
+
+    def key_from_url(self, url: str) -> str | None:
+        """Return the object key behind one of our public URLs, if it is one."""
+        base_url = self.generate_public_url("")
+        if not url.startswith(base_url):
+            return None
+        return unquote(url[len(base_url):]) or None
 
     def generate_public_url(self, key: str):
         """Build the public S3 URL for an uploaded object."""
         encoded_key = quote(key, safe="/")
+        if settings.S3_ENDPOINT_URL:
+            return f"{settings.S3_ENDPOINT_URL}/{settings.AWS_S3_BUCKET}/{encoded_key}"
         return (
             f"https://{settings.AWS_S3_BUCKET}.s3."
             f"{settings.AWS_REGION}.amazonaws.com/{encoded_key}"
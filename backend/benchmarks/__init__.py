@@ -0,0 +1 @@
+"""Reproducible performance benchmarks for backend hot paths."""
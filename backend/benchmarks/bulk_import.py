@@ -0,0 +1,132 @@
+"""Measure bulk CSV imports for meditations and programs.
+
+Run from the backend directory against a development database:
+
+  python -m benchmarks.bulk_import --rows 10000
+
+The benchmark imports generated rows once to create them and again to update
+them, then reports the elapsed time and the number of SQL statements sent for
+each pass. Every row it creates is deleted before it exits.
+"""
+
+import argparse
+import io
+import time
+import uuid
+
+from fastapi import UploadFile
+from sqlalchemy import event
+
+from app.api.v1.admin.meditations import bulk_import_meditations
+from app.api.v1.admin.programs import bulk_import_programs
+from app.db.session import SessionLocal, engine
+from app.models.meditation import Meditation
+from app.models.program import Program, ProgramMeditation
+
+
+class StatementCounter:
+    """Count SQL statements sent through the application engine."""
+
+    def __init__(self):
+        """Start with no statements counted."""
+        self.count = 0
+
+    def __call__(self, *args, **kwargs) -> None:
+        """Record one statement from a before_cursor_execute event."""
+        self.count += 1
+
+
+def meditation_csv(prefix: str, rows: int, description: str) -> bytes:
+    """Build a meditation import CSV with generated rows."""
+    lines = ["title,description,duration_sec,level,category,is_published"]
+    lines.extend(
+        f"{prefix} meditation {index},{description},{300 + index % 600},beginner,sleep,true"
+        for index in range(rows)
+    )
+    return "\n".join(lines).encode("utf-8")
+
+
+def program_csv(prefix: str, rows: int, meditations_per_program: int) -> bytes:
+    """Build a program import CSV that references generated meditations."""
+    lines = ["title,level,meditation_titles,is_published"]
+    for index in range(rows):
+        titles = "|".join(
+            f"{prefix} meditation {(index + offset) % rows}"
+            for offset in range(meditations_per_program)
+        )
+        lines.append(f"{prefix} program {index},beginner,{titles},true")
+    return "\n".join(lines).encode("utf-8")
+
+
+def timed_import(label: str, import_function, content: bytes, counter: StatementCounter) -> None:
+    """Run one import pass and print its summary."""
+    db = SessionLocal()
+    try:
+        counter.count = 0
+        started = time.perf_counter()
+        upload = UploadFile(io.BytesIO(content), filename="benchmark.csv")
+        if import_function is bulk_import_meditations:
+            result = import_function(csv_file=upload, media_zip=None, db=db)
+        else:
+            result = import_function(csv_file=upload, artwork_zip=None, db=db)
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+    print(
+        f"{label:<20} {elapsed:8.2f} s  {counter.count:6d} statements  "
+        f"created={result['created']} updated={result['updated']} skipped={result['skipped']}"
+    )
+
+
+def clean_up(prefix: str) -> None:
+    """Delete the programs and meditations created by the benchmark."""
+    db = SessionLocal()
+    try:
+        program_ids = db.query(Program.id).filter(Program.title.startswith(prefix))
+        db.query(ProgramMeditation).filter(
+            ProgramMeditation.program_id.in_(program_ids.scalar_subquery())
+        ).delete(synchronize_session=False)
+        db.query(Program).filter(Program.title.startswith(prefix)).delete(
+            synchronize_session=False
+        )
+        db.query(Meditation).filter(Meditation.title.startswith(prefix)).delete(
+            synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def main() -> None:
+    """Run the import benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--meditations-per-program", type=int, default=5)
+    args = parser.parse_args()
+
+    prefix = f"Benchmark {uuid.uuid4().hex[:8]}"
+    counter = StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        timed_import(
+            "meditations create",
+            bulk_import_meditations,
+            meditation_csv(prefix, args.rows, "first pass"),
+            counter,
+        )
+        timed_import(
+            "meditations update",
+            bulk_import_meditations,
+            meditation_csv(prefix, args.rows, "second pass"),
+            counter,
+        )
+        programs = program_csv(prefix, args.rows, args.meditations_per_program)
+        timed_import("programs create", bulk_import_programs, programs, counter)
+        timed_import("programs update", bulk_import_programs, programs, counter)
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+        clean_up(prefix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Measure the per-request cost of the CSRF middleware.
+
+Run from the backend directory:
+
+  python -m benchmarks.csrf_middleware --requests 20000
+
+The benchmark drives a small app directly through ASGI, with no server or
+database, so the numbers show middleware overhead only. It compares no
+middleware, the previous BaseHTTPMiddleware version of the CSRF check, and
+the pure ASGI CSRFMiddleware, for a JSON POST and a streamed CSV download.
+"""
+
+import argparse
+import asyncio
+import time
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import HTTPConnection, Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core.config import settings
+from app.core.csrf import CSRFMiddleware, create_csrf_token, has_valid_csrf
+
+
+async def base_http_csrf(request: Request, call_next):
+    """Run the CSRF check the way the old app.middleware("http") hook did."""
+    if not has_valid_csrf(HTTPConnection(request.scope)):
+        return JSONResponse(status_code=403, content={"detail": "Invalid CSRF token"})
+    return await call_next(request)
+
+
+async def save_progress(request: Request) -> JSONResponse:
+    """Stand in for a small JSON write endpoint."""
+    return JSONResponse({"ok": True})
+
+
+async def export_rows(request: Request) -> StreamingResponse:
+    """Stand in for a CSV export streamed in many chunks."""
+    async def rows():
+        """Yield one CSV line at a time."""
+        for index in range(100):
+            yield f"{index},meditation,600\n".encode()
+
+    return StreamingResponse(rows(), media_type="text/csv")
+
+
+def build_app(middleware: list[Middleware]) -> Starlette:
+    """Build the benchmark app with the given middleware stack."""
+    return Starlette(
+        routes=[
+            Route("/progress", save_progress, methods=["POST"]),
+            Route("/export", export_rows, methods=["POST"]),
+        ],
+        middleware=middleware,
+    )
+
+
+def request_scope(path: str, token: str) -> dict:
+    """Build an authenticated POST scope that passes the CSRF check."""
+    cookie = f"{settings.AUTH_COOKIE_NAME}=session; {settings.CSRF_COOKIE_NAME}={token}"
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("ascii"),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"benchmark"),
+            (b"cookie", cookie.encode("latin-1")),
+            (settings.CSRF_HEADER_NAME.lower().encode("latin-1"), token.encode("latin-1")),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+
+
+async def call(app, scope: dict) -> int:
+    """Send one request through the app and return the response status."""
+    status = 0
+    request_sent = False
+    response_complete = asyncio.Event()
+
+    async def receive():
+        """Provide an empty request body, then wait for the client to leave."""
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await response_complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        """Record the status and notice the end of the body."""
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body", False):
+            response_complete.set()
+
+    await app(dict(scope), receive, send)
+    return status
+
+
+async def microseconds_per_request(app, scope: dict, requests: int) -> float:
+    """Return the average wall time of one request in microseconds."""
+    for _ in range(min(requests, 200)):
+        await call(app, scope)
+    started = time.perf_counter()
+    for _ in range(requests):
+        status = await call(app, scope)
+        if status != 200:
+            raise RuntimeError(f"Benchmark request returned {status}")
+    return (time.perf_counter() - started) * 1_000_000 / requests
+
+
+async def run(requests: int) -> None:
+    """Time each middleware stack for both endpoints and print the results."""
+    token = create_csrf_token()
+    stacks = {
+        "none": build_app([]),
+        "BaseHTTPMiddleware": build_app([Middleware(BaseHTTPMiddleware, dispatch=base_http_csrf)]),
+        "CSRFMiddleware": build_app([Middleware(CSRFMiddleware)]),
+    }
+    for path in ("/progress", "/export"):
+        scope = request_scope(path, token)
+        print(f"POST {path} ({requests} requests):")
+        for name, app in stacks.items():
+            microseconds = await microseconds_per_request(app, scope, requests)
+            print(f"  {name:<19} {microseconds:8.1f} us/request")
+
+
+def main() -> None:
+    """Run the CSRF middleware benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
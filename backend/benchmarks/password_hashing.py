@@ -0,0 +1,113 @@
+"""Measure heartbeat latency while a burst of logins checks passwords.
+
+Run from the backend directory:
+
+  python -m benchmarks.password_hashing --logins 40 --seconds 10
+
+Heartbeats and logins both run through the AnyIO worker threads that FastAPI
+uses for synchronous endpoints. The benchmark runs once with bcrypt inline in
+those threads and once with the bounded hashing process pool.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import anyio.to_thread
+
+from app.core import security
+from app.core.config import settings
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Return a nearest-rank percentile from a list of samples."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def heartbeat_work() -> None:
+    """Stand in for the small amount of Python work a heartbeat performs."""
+    sum(range(2_000))
+
+
+def login_work(saved_hash: str) -> bool:
+    """Check one password the way the login endpoint does."""
+    try:
+        security.verify_password("correct horse battery staple", saved_hash)
+    except security.PasswordHasherBusy:
+        return False
+    return True
+
+
+async def run_scenario(workers: int, logins: int, seconds: float, interval: float) -> dict:
+    """Run heartbeats alongside continuous login traffic and collect latencies."""
+    settings.PASSWORD_HASH_WORKERS = workers
+    saved_hash = security.pwd_context.hash("correct horse battery staple")
+    if workers > 0:
+        # Warm the pool so process start-up does not count as heartbeat latency.
+        security.verify_password("warm-up", saved_hash)
+
+    deadline = time.perf_counter() + seconds
+    latencies: list[float] = []
+    completed_logins = 0
+    rejected_logins = 0
+
+    async def login_loop() -> None:
+        nonlocal completed_logins, rejected_logins
+        while time.perf_counter() < deadline:
+            if await anyio.to_thread.run_sync(login_work, saved_hash):
+                completed_logins += 1
+            else:
+                # A rejected client receives 503 with Retry-After and backs off.
+                rejected_logins += 1
+                await asyncio.sleep(0.1)
+
+    async def heartbeat_loop() -> None:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            await anyio.to_thread.run_sync(heartbeat_work)
+            latencies.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(interval)
+
+    await asyncio.gather(heartbeat_loop(), *(login_loop() for _ in range(logins)))
+    security.shutdown_password_hash_pool()
+    return {
+        "mode": f"pool ({workers} workers)" if workers > 0 else "inline",
+        "heartbeats": len(latencies),
+        "logins": completed_logins,
+        "rejected": rejected_logins,
+        "p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+def main() -> None:
+    """Print heartbeat latency for inline and pooled password hashing."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=40, help="concurrent login loops")
+    parser.add_argument("--seconds", type=float, default=10.0, help="duration per scenario")
+    parser.add_argument("--interval", type=float, default=0.05, help="seconds between heartbeats")
+    parser.add_argument("--workers", type=int, default=2, help="hashing pool size")
+    args = parser.parse_args()
+
+    configured_workers = settings.PASSWORD_HASH_WORKERS
+    try:
+        for workers in (0, args.workers):
+            result = asyncio.run(
+                run_scenario(workers, args.logins, args.seconds, args.interval)
+            )
+            print(
+                f"{result['mode']:<18} heartbeats={result['heartbeats']:<5} "
+                f"logins={result['logins']:<5} rejected={result['rejected']:<5} "
+                f"p50={result['p50_ms']:.1f}ms p99={result['p99_ms']:.1f}ms"
+            )
+    finally:
+        settings.PASSWORD_HASH_WORKERS = configured_workers
+
+
+if __name__ == "__main__":
+    main()
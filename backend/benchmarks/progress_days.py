@@ -0,0 +1,141 @@
+"""Compare Python and SQL grouping of listening activity by local day.
+
+Run from the backend directory against a development PostgreSQL database:
+
+  python -m benchmarks.progress_days --activity-rows 50000 --timezone Asia/Kolkata
+
+The benchmark gives one anonymous device a year of sessions with the
+requested number of activity rows. Some sessions have less activity than
+their listened seconds, so both paths also reconcile a residual. Each path
+then groups the history by local day several times. Seeded rows are deleted
+before it exits.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.api.v1.sessions import (
+    daily_seconds_in_python,
+    daily_seconds_in_sql,
+    owned_sessions_query,
+    parse_timezone,
+)
+from app.db.session import SessionLocal, engine
+from app.models.session import MeditationSession, MeditationSessionActivity
+from benchmarks.listening_load import clean_up, seed_meditations
+from benchmarks.password_hashing import percentile
+
+
+HEARTBEATS_PER_SESSION = 100
+HEARTBEAT_SECONDS = 15
+# Share of sessions whose listened seconds exceed their activity rows, like
+# sessions that began before activity tracking.
+RESIDUAL_SHARE = 0.1
+
+
+def seed_device(meditation_ids: list[int], device_id: int, activity_rows: int) -> None:
+    """Give an anonymous device sessions spread over the last year."""
+    db = SessionLocal()
+    try:
+        now = datetime.now(UTC)
+        session_count = max(1, activity_rows // HEARTBEATS_PER_SESSION)
+        session_rows = []
+        for _ in range(session_count):
+            started_at = now - timedelta(minutes=random.randint(60, 365 * 24 * 60))
+            listened = HEARTBEATS_PER_SESSION * HEARTBEAT_SECONDS
+            if random.random() < RESIDUAL_SHARE:
+                listened += random.randint(60, 600)
+            session_rows.append(
+                {
+                    "meditation_id": random.choice(meditation_ids),
+                    "device_id": device_id,
+                    "started_at": started_at,
+                    "last_listened_at": started_at + timedelta(seconds=listened),
+                    "completed_at": started_at + timedelta(seconds=listened),
+                    "seconds_listened": listened,
+                    "last_position_sec": listened,
+                }
+            )
+        sessions = db.execute(
+            insert(MeditationSession).returning(MeditationSession.id, MeditationSession.started_at),
+            session_rows,
+        ).all()
+        db.execute(
+            insert(MeditationSessionActivity),
+            [
+                {
+                    "session_id": session.id,
+                    "seconds_listened": HEARTBEAT_SECONDS,
+                    "recorded_at": session.started_at + timedelta(seconds=HEARTBEAT_SECONDS * beat),
+                }
+                for session in sessions
+                for beat in range(1, HEARTBEATS_PER_SESSION + 1)
+            ],
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def measure(path, device_id: int, timezone, repeats: int) -> tuple[list[float], dict]:
+    """Time one grouping path and return its durations and last result."""
+    db = SessionLocal()
+    try:
+        sessions = owned_sessions_query(db, device_id, None).filter(
+            MeditationSession.seconds_listened > 0,
+        ).all()
+        durations = []
+        result = {}
+        for _ in range(repeats):
+            started = time.perf_counter()
+            result = path(db, sessions, timezone)
+            durations.append((time.perf_counter() - started) * 1000)
+        return durations, result
+    finally:
+        db.close()
+
+
+def main() -> None:
+    """Seed a long listening history and time both grouping paths."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--activity-rows", type=int, default=50_000)
+    parser.add_argument("--timezone", default="Asia/Kolkata")
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+    if engine.dialect.name != "postgresql":
+        sys.exit("This benchmark needs PostgreSQL.")
+
+    timezone = parse_timezone(args.timezone)
+    prefix = f"Benchmark {uuid.uuid4().hex[:8]}"
+    device_id = random.randint(2_000_000_000, 2_100_000_000)
+    try:
+        meditations = seed_meditations(prefix, 10)
+        seed_device([meditation_id for meditation_id, _ in meditations], device_id, args.activity_rows)
+        # Warm the connection pool and PostgreSQL's buffers before timing.
+        measure(daily_seconds_in_sql, device_id, timezone, 1)
+
+        python_ms, python_days = measure(daily_seconds_in_python, device_id, timezone, args.repeats)
+        sql_ms, sql_days = measure(daily_seconds_in_sql, device_id, timezone, args.repeats)
+    finally:
+        clean_up(prefix)
+
+    print(f"{args.activity_rows} activity rows, {len(sql_days)} local days in {args.timezone}")
+    print(f"  {'path':<8} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, durations in (("python", python_ms), ("sql", sql_ms)):
+        print(
+            f"  {name:<8} {statistics.mean(durations):9.2f} "
+            f"{percentile(durations, 50):9.2f} {percentile(durations, 95):9.2f}"
+        )
+    if python_days != sql_days:
+        sys.exit("The two paths returned different daily totals.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Check the SQL statement budgets of the busiest read endpoints.
+
+Run from the backend directory against a development database:
+
+  python -m benchmarks.query_budgets
+
+The script seeds programs and an anonymous listening history, requests each
+endpoint through the full ASGI stack, and compares the statements it ran
+with the budget below. It prints the repeated statement shapes for any
+endpoint over budget and exits with status 1. Seeded rows are deleted before
+it exits.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from app.core.query_log import QueryBudgetExceeded, query_budget
+from app.db.session import SessionLocal
+from app.models.meditation import Meditation
+from app.models.session import MeditationSession, MeditationSessionActivity
+from benchmarks.response_size import clean_up as clean_up_programs
+from benchmarks.response_size import fetch, seed as seed_programs
+
+
+PROGRAMS = 20
+MEDITATIONS_PER_PROGRAM = 5
+SESSIONS = 40
+# list_programs still loads each program's meditations separately in
+# program_to_read, so its budget grows with the page size.
+QUERY_BUDGETS = {
+    "list_programs": 1 + PROGRAMS,
+    "progress_summary": 2,
+    "session_history": 2,
+}
+
+
+def seed_history(prefix: str, device_id: int) -> None:
+    """Give an anonymous device listening sessions with activity rows."""
+    db = SessionLocal()
+    try:
+        meditation_ids = [
+            meditation_id
+            for meditation_id, in db.query(Meditation.id).filter(Meditation.title.startswith(prefix))
+        ]
+        now = datetime.now(UTC)
+        for index in range(SESSIONS):
+            started_at = now - timedelta(days=index)
+            meditation_session = MeditationSession(
+                meditation_id=random.choice(meditation_ids),
+                device_id=device_id,
+                started_at=started_at,
+                last_listened_at=started_at + timedelta(minutes=10),
+                completed_at=started_at + timedelta(minutes=10) if index % 2 else None,
+                seconds_listened=600,
+                last_position_sec=600,
+            )
+            db.add(meditation_session)
+            db.flush()
+            db.add_all(
+                MeditationSessionActivity(
+                    session_id=meditation_session.id,
+                    seconds_listened=300,
+                    recorded_at=started_at + timedelta(minutes=minute),
+                )
+                for minute in (5, 10)
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def clean_up_history(device_id: int) -> None:
+    """Delete the benchmark device's sessions and their activity."""
+    db = SessionLocal()
+    try:
+        session_ids = db.query(MeditationSession.id).filter(MeditationSession.device_id == device_id)
+        db.query(MeditationSessionActivity).filter(
+            MeditationSessionActivity.session_id.in_(session_ids.scalar_subquery())
+        ).delete(synchronize_session=False)
+        db.query(MeditationSession).filter(MeditationSession.device_id == device_id).delete(
+            synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def main() -> None:
+    """Request each endpoint and report its statement count against the budget."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+
+    prefix = f"Benchmark {uuid.uuid4().hex[:8]}"
+    device_id = random.randint(2_000_000_000, 2_100_000_000)
+    seed_programs(prefix, PROGRAMS, MEDITATIONS_PER_PROGRAM)
+    over_budget = False
+    try:
+        seed_history(prefix, device_id)
+        paths = {
+            "list_programs": f"/api/v1/programs/?limit={PROGRAMS}",
+            "progress_summary": f"/api/v1/sessions/progress/{device_id}",
+            "session_history": f"/api/v1/sessions/history/{device_id}?limit=20",
+        }
+        for name, path in paths.items():
+            budget = QUERY_BUDGETS[name]
+            try:
+                with query_budget(budget, name) as query_log:
+                    asyncio.run(fetch(path, "identity"))
+            except QueryBudgetExceeded as error:
+                over_budget = True
+                print(f"  {name:<17} OVER  {error}")
+                continue
+            print(f"  {name:<17} ok    {query_log.count:3d} of {budget} statements")
+    finally:
+        clean_up_history(device_id)
+        clean_up_programs(prefix)
+    if over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Measure JSON serialization CPU and compressed size for list_programs.
+
+Run from the backend directory against a development database:
+
+  python -m benchmarks.response_size --programs 50 --meditations 10
+
+The benchmark seeds published programs, calls GET /programs/ through the full
+ASGI stack with each Accept-Encoding, and times rendering the same payload
+with the standard and orjson response classes. Seeded rows are deleted
+before it exits.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.api.v1.programs import list_programs
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.meditation import Meditation
+from app.models.program import Program, ProgramMeditation
+
+
+def seed(prefix: str, programs: int, meditations_per_program: int) -> None:
+    """Create published programs that each list their own meditations."""
+    db = SessionLocal()
+    try:
+        for program_index in range(programs):
+            program = Program(
+                title=f"{prefix} program {program_index}",
+                description=f"A gentle series for settling the mind before sleep, part {program_index}.",
+                level="beginner",
+                goal="sleep",
+                artwork_url=f"https://example.com/artwork/{program_index}.jpg",
+            )
+            db.add(program)
+            db.flush()
+            for position in range(1, meditations_per_program + 1):
+                meditation = Meditation(
+                    title=f"{prefix} meditation {program_index}-{position}",
+                    category="sleep",
+                    duration_sec=600 + position * 60,
+                    level="beginner",
+                    audio_url=f"https://example.com/audio/{program_index}-{position}.mp3",
+                    artwork_url=f"https://example.com/artwork/{program_index}-{position}.jpg",
+                    description=f"Breathe slowly and let each thought pass. Session {position} of program {program_index}.",
+                    teacher_name="Sample Teacher",
+                    tags=["sleep", "breath", "body scan"],
+                    benefits=["Fall asleep faster", "Calm a busy mind"],
+                )
+                db.add(meditation)
+                db.flush()
+                db.add(
+                    ProgramMeditation(
+                        program_id=program.id,
+                        meditation_id=meditation.id,
+                        position=position,
+                    )
+                )
+        db.commit()
+    finally:
+        db.close()
+
+
+def clean_up(prefix: str) -> None:
+    """Delete the programs and meditations created by the benchmark."""
+    db = SessionLocal()
+    try:
+        program_ids = db.query(Program.id).filter(Program.title.startswith(prefix))
+        db.query(ProgramMeditation).filter(
+            ProgramMeditation.program_id.in_(program_ids.scalar_subquery())
+        ).delete(synchronize_session=False)
+        db.query(Program).filter(Program.title.startswith(prefix)).delete(
+            synchronize_session=False
+        )
+        db.query(Meditation).filter(Meditation.title.startswith(prefix)).delete(
+            synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def fetch(path: str, accept_encoding: str) -> tuple[dict[str, str], bytes]:
+    """Send one GET request through the ASGI app and collect the response."""
+    query_string = b""
+    if "?" in path:
+        path, query = path.split("?", 1)
+        query_string = query.encode("ascii")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("ascii"),
+        "root_path": "",
+        "query_string": query_string,
+        "headers": [(b"host", b"benchmark"), (b"accept-encoding", accept_encoding.encode("ascii"))],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+    headers: dict[str, str] = {}
+    body = bytearray()
+    request_sent = False
+    response_complete = asyncio.Event()
+
+    async def receive():
+        """Provide an empty request body, then wait for the client to leave."""
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await response_complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        """Collect the response headers and body."""
+        if message["type"] == "http.response.start":
+            headers.update(
+                (name.decode("latin-1"), value.decode("latin-1"))
+                for name, value in message["headers"]
+            )
+        elif message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_complete.set()
+
+    await app(scope, receive, send)
+    return headers, bytes(body)
+
+
+def cpu_per_render(response_class, content, iterations: int) -> float:
+    """Return the average CPU milliseconds to render one response body."""
+    started = time.process_time()
+    for _ in range(iterations):
+        response_class(content)
+    return (time.process_time() - started) * 1000 / iterations
+
+
+def main() -> None:
+    """Run the response size benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--programs", type=int, default=50)
+    parser.add_argument("--meditations", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    prefix = f"Benchmark {uuid.uuid4().hex[:8]}"
+    seed(prefix, args.programs, args.meditations)
+    try:
+        path = f"/api/v1/programs/?limit={min(args.programs, 100)}"
+        print("Bytes on the wire for GET /programs/:")
+        for accept_encoding in ("identity", "gzip", "br"):
+            headers, body = asyncio.run(fetch(path, accept_encoding))
+            print(
+                f"  {accept_encoding:<9} {len(body):9d} bytes  "
+                f"content-encoding={headers.get('content-encoding', 'none')}"
+            )
+
+        db = SessionLocal()
+        try:
+            programs = list_programs(limit=min(args.programs, 100), offset=0, db=db, current_user=None)
+        finally:
+            db.close()
+        content = jsonable_encoder(programs)
+        print(f"Render CPU per response ({args.iterations} iterations):")
+        for response_class in (JSONResponse, ORJSONResponse):
+            milliseconds = cpu_per_render(response_class, content, args.iterations)
+            print(f"  {response_class.__name__:<14} {milliseconds:7.3f} ms")
+    finally:
+        clean_up(prefix)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,8 @@ from app.core.config import settings
 from app.db.base import Base
 from app.models.email_verification import EmailVerificationToken  # noqa: F401
 from app.models.favorite import UserFavorite  # noqa: F401
+from app.models.media_job import MediaJob  # noqa: F401
+from app.models.media_object import MediaObject  # noqa: F401
 from app.models.meditation import Meditation  # noqa: F401
 from app.models.preference import UserPreference  # noqa: F401
 from app.models.program import Program, ProgramMeditation, UserProgram  # noqa: F401
@@ -0,0 +1,39 @@
+"""add content-addressed media objects
+
+Revision ID: 20260801_0018
+Revises: 20260725_0017
+Create Date: 2026-08-01 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "20260801_0018"
+down_revision: Union[str, None] = "20260725_0017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the table of media already uploaded under a content hash."""
+    op.create_table(
+        "media_objects",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("object_key", sa.String(), nullable=False),
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("content_type", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("object_key"),
+    )
+    op.create_index(op.f("ix_media_objects_sha256"), "media_objects", ["sha256"], unique=False)
+
+
+def downgrade() -> None:
+    """Forget which media objects were uploaded by content hash."""
+    op.drop_index(op.f("ix_media_objects_sha256"), table_name="media_objects")
+    op.drop_table("media_objects")
@@ -0,0 +1,53 @@
+"""add audio renditions and media jobs
+
+Revision ID: 20260805_0019
+Revises: 20260801_0018
+Create Date: 2026-08-05 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "20260805_0019"
+down_revision: Union[str, None] = "20260801_0018"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Store rendition URLs on meditations and queue media processing jobs."""
+    op.add_column(
+        "meditations",
+        sa.Column("audio_renditions", sa.JSON(), server_default=sa.text("'{}'::json"), nullable=False),
+    )
+    op.add_column("meditations", sa.Column("measured_duration_sec", sa.Integer(), nullable=True))
+    op.create_table(
+        "media_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("meditation_id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), server_default="pending", nullable=False),
+        sa.Column("source_url", sa.String(), nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["meditation_id"], ["meditations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_media_jobs_meditation_id"), "media_jobs", ["meditation_id"], unique=False)
+    op.create_index("ix_media_jobs_kind_status", "media_jobs", ["kind", "status", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Remove media jobs and stored rendition details."""
+    op.drop_index("ix_media_jobs_kind_status", table_name="media_jobs")
+    op.drop_index(op.f("ix_media_jobs_meditation_id"), table_name="media_jobs")
+    op.drop_table("media_jobs")
+    op.drop_column("meditations", "measured_duration_sec")
+    op.drop_column("meditations", "audio_renditions")
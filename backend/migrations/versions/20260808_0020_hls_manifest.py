@@ -0,0 +1,27 @@
+"""add hls manifest url to meditations
+
+Revision ID: 20260808_0020
+Revises: 20260805_0019
+Create Date: 2026-08-08 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "20260808_0020"
+down_revision: Union[str, None] = "20260805_0019"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Store the HLS master playlist built for each meditation's audio."""
+    op.add_column("meditations", sa.Column("hls_manifest_url", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove HLS playlist URLs from meditations."""
+    op.drop_column("meditations", "hls_manifest_url")
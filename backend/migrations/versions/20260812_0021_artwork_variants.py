@@ -0,0 +1,35 @@
+"""add responsive artwork variants
+
+Revision ID: 20260812_0021
+Revises: 20260808_0020
+Create Date: 2026-08-12 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "20260812_0021"
+down_revision: Union[str, None] = "20260808_0020"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Store resized artwork URLs for meditations and programs."""
+    op.add_column(
+        "meditations",
+        sa.Column("artwork_variants", sa.JSON(), server_default=sa.text("'{}'::json"), nullable=False),
+    )
+    op.add_column(
+        "programs",
+        sa.Column("artwork_variants", sa.JSON(), server_default=sa.text("'{}'::json"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Remove resized artwork URLs."""
+    op.drop_column("programs", "artwork_variants")
+    op.drop_column("meditations", "artwork_variants")
@@ -0,0 +1,148 @@
+"""partition listening activity by month
+
+Revision ID: 20260816_0022
+Revises: 20260812_0021
+Create Date: 2026-08-16 00:00:00.000000
+
+Rows are copied into the partitioned table inside the migration, so expect
+it to take a while on a large activity table. Partitions that were
+detached with app.cli.activity_partitions are not copied back on downgrade.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "20260816_0022"
+down_revision: Union[str, None] = "20260812_0021"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months of empty partitions created ahead of today.
+MONTHS_AHEAD = 3
+
+
+def upgrade() -> None:
+    """Move listening activity into a table range-partitioned by month."""
+    op.execute("ALTER TABLE meditation_session_activity RENAME TO meditation_session_activity_legacy")
+    op.execute(
+        "ALTER TABLE meditation_session_activity_legacy "
+        "RENAME CONSTRAINT meditation_session_activity_pkey TO meditation_session_activity_legacy_pkey"
+    )
+    op.execute(
+        "ALTER INDEX ix_meditation_session_activity_session_id "
+        "RENAME TO ix_meditation_session_activity_legacy_session_id"
+    )
+    # The primary key must include the partition column.
+    op.execute(
+        """
+        CREATE TABLE meditation_session_activity (
+            id integer NOT NULL DEFAULT nextval('meditation_session_activity_id_seq'),
+            session_id integer NOT NULL,
+            seconds_listened integer NOT NULL,
+            recorded_at timestamp with time zone NOT NULL DEFAULT now(),
+            CONSTRAINT meditation_session_activity_pkey PRIMARY KEY (id, recorded_at),
+            CONSTRAINT meditation_session_activity_session_id_fkey FOREIGN KEY (session_id)
+                REFERENCES meditation_sessions (id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (recorded_at)
+        """
+    )
+    op.execute(
+        "ALTER SEQUENCE meditation_session_activity_id_seq OWNED BY meditation_session_activity.id"
+    )
+    op.create_index(
+        "ix_meditation_session_activity_session_id",
+        "meditation_session_activity",
+        ["session_id", "recorded_at"],
+        unique=False,
+    )
+    # Catches rows outside every monthly partition so a missed maintenance
+    # run never rejects a heartbeat.
+    op.execute(
+        "CREATE TABLE meditation_session_activity_default "
+        "PARTITION OF meditation_session_activity DEFAULT"
+    )
+    op.execute(
+        sa.text(
+            f"""
+            DO $$
+            DECLARE
+                month timestamp := date_trunc(
+                    'month',
+                    COALESCE((SELECT min(recorded_at) FROM meditation_session_activity_legacy), now())
+                        AT TIME ZONE 'UTC'
+                );
+                last_month timestamp := date_trunc('month', now() AT TIME ZONE 'UTC')
+                    + interval '{MONTHS_AHEAD} months';
+            BEGIN
+                WHILE month <= last_month LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF meditation_session_activity '
+                        'FOR VALUES FROM (%L) TO (%L)',
+                        'meditation_session_activity_p' || to_char(month, 'YYYY_MM'),
+                        month AT TIME ZONE 'UTC',
+                        (month + interval '1 month') AT TIME ZONE 'UTC'
+                    );
+                    month := month + interval '1 month';
+                END LOOP;
+            END $$
+            """
+        )
+    )
+    op.execute(
+        """
+        INSERT INTO meditation_session_activity (id, session_id, seconds_listened, recorded_at)
+        SELECT id, session_id, seconds_listened, recorded_at
+        FROM meditation_session_activity_legacy
+        """
+    )
+    op.execute("DROP TABLE meditation_session_activity_legacy")
+
+
+def downgrade() -> None:
+    """Return listening activity to a single unpartitioned table."""
+    op.execute(
+        """
+        CREATE TABLE meditation_session_activity_unpartitioned (
+            id integer NOT NULL DEFAULT nextval('meditation_session_activity_id_seq'),
+            session_id integer NOT NULL,
+            seconds_listened integer NOT NULL,
+            recorded_at timestamp with time zone NOT NULL DEFAULT now(),
+            CONSTRAINT meditation_session_activity_unpartitioned_pkey PRIMARY KEY (id),
+            CONSTRAINT meditation_session_activity_unpartitioned_session_id_fkey
+                FOREIGN KEY (session_id) REFERENCES meditation_sessions (id) ON DELETE CASCADE
+        )
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO meditation_session_activity_unpartitioned (id, session_id, seconds_listened, recorded_at)
+        SELECT id, session_id, seconds_listened, recorded_at
+        FROM meditation_session_activity
+        """
+    )
+    op.execute(
+        "ALTER SEQUENCE meditation_session_activity_id_seq "
+        "OWNED BY meditation_session_activity_unpartitioned.id"
+    )
+    op.execute("DROP TABLE meditation_session_activity")
+    op.execute(
+        "ALTER TABLE meditation_session_activity_unpartitioned RENAME TO meditation_session_activity"
+    )
+    op.execute(
+        "ALTER TABLE meditation_session_activity "
+        "RENAME CONSTRAINT meditation_session_activity_unpartitioned_pkey TO meditation_session_activity_pkey"
+    )
+    op.execute(
+        "ALTER TABLE meditation_session_activity "
+        "RENAME CONSTRAINT meditation_session_activity_unpartitioned_session_id_fkey "
+        "TO meditation_session_activity_session_id_fkey"
+    )
+    op.create_index(
+        "ix_meditation_session_activity_session_id",
+        "meditation_session_activity",
+        ["session_id"],
+        unique=False,
+    )
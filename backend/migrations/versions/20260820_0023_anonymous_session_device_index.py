@@ -0,0 +1,33 @@
+"""index anonymous sessions by device
+
+Revision ID: 20260820_0023
+Revises: 20260816_0022
+Create Date: 2026-08-20 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "20260820_0023"
+down_revision: Union[str, None] = "20260816_0022"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Find a device's anonymous sessions without scanning every session."""
+    op.create_index(
+        "ix_meditation_sessions_anonymous_device_id",
+        "meditation_sessions",
+        ["device_id"],
+        unique=False,
+        postgresql_where=sa.text("user_id IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Remove the anonymous session device index."""
+    op.drop_index("ix_meditation_sessions_anonymous_device_id", table_name="meditation_sessions")
@@ -0,0 +1,111 @@
+"""allow one unfinished session per owner and meditation
+
+Revision ID: 20260824_0024
+Revises: 20260820_0023
+Create Date: 2026-08-24 00:00:00.000000
+
+Concurrent starts could create duplicate unfinished sessions. They are folded
+into the most recently played session of each group before the unique
+indexes are created, the same way app.api.v1.session_merge does it.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "20260824_0024"
+down_revision: Union[str, None] = "20260820_0023"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Fold duplicate unfinished sessions and enforce one per owner."""
+    op.add_column("meditation_sessions", sa.Column("start_key", sa.String(length=64), nullable=True))
+
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE open_session_duplicates ON COMMIT DROP AS
+        SELECT id, keeper_id
+        FROM (
+            SELECT
+                id,
+                first_value(id) OVER (
+                    PARTITION BY
+                        user_id,
+                        CASE WHEN user_id IS NULL THEN device_id END,
+                        meditation_id,
+                        coalesce(program_id, 0)
+                    ORDER BY last_listened_at DESC NULLS LAST, started_at DESC, id DESC
+                ) AS keeper_id
+            FROM meditation_sessions
+            WHERE completed_at IS NULL
+        ) AS ranked
+        WHERE id <> keeper_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE meditation_sessions AS keeper
+        SET
+            seconds_listened = least(totals.seconds_listened, meditations.duration_sec),
+            last_listened_at = totals.last_listened_at
+        FROM (
+            SELECT
+                groups.keeper_id,
+                sum(sessions.seconds_listened) AS seconds_listened,
+                max(sessions.last_listened_at) AS last_listened_at
+            FROM (
+                SELECT keeper_id, id FROM open_session_duplicates
+                UNION ALL
+                SELECT DISTINCT keeper_id, keeper_id FROM open_session_duplicates
+            ) AS groups
+            JOIN meditation_sessions AS sessions ON sessions.id = groups.id
+            GROUP BY groups.keeper_id
+        ) AS totals, meditations
+        WHERE keeper.id = totals.keeper_id AND meditations.id = keeper.meditation_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE meditation_session_activity AS activity
+        SET session_id = duplicates.keeper_id
+        FROM open_session_duplicates AS duplicates
+        WHERE activity.session_id = duplicates.id
+        """
+    )
+    op.execute(
+        "DELETE FROM meditation_sessions WHERE id IN (SELECT id FROM open_session_duplicates)"
+    )
+
+    op.create_index(
+        "uq_meditation_sessions_open_user",
+        "meditation_sessions",
+        ["user_id", "meditation_id", sa.text("coalesce(program_id, 0)")],
+        unique=True,
+        postgresql_where=sa.text("completed_at IS NULL AND user_id IS NOT NULL"),
+    )
+    op.create_index(
+        "uq_meditation_sessions_open_device",
+        "meditation_sessions",
+        ["device_id", "meditation_id", sa.text("coalesce(program_id, 0)")],
+        unique=True,
+        postgresql_where=sa.text("completed_at IS NULL AND user_id IS NULL"),
+    )
+    op.create_index(
+        "uq_meditation_sessions_start_key",
+        "meditation_sessions",
+        ["start_key"],
+        unique=True,
+        postgresql_where=sa.text("start_key IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Drop the unfinished-session uniqueness rules. Folded sessions stay folded."""
+    op.drop_index("uq_meditation_sessions_start_key", table_name="meditation_sessions")
+    op.drop_index("uq_meditation_sessions_open_device", table_name="meditation_sessions")
+    op.drop_index("uq_meditation_sessions_open_user", table_name="meditation_sessions")
+    op.drop_column("meditation_sessions", "start_key")
@@ -0,0 +1,56 @@
+"""allow one active media job per source
+
+Revision ID: 20260828_0025
+Revises: 20260824_0024
+Create Date: 2026-08-28 00:00:00.000000
+
+Concurrent requests could queue the same job twice. The newer duplicates are
+marked failed before the unique index is created, so the oldest job of each
+source keeps its place in the queue.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "20260828_0025"
+down_revision: Union[str, None] = "20260824_0024"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Retire duplicate active jobs and enforce one per source."""
+    op.execute(
+        """
+        UPDATE media_jobs AS duplicate
+        SET
+            status = 'failed',
+            error = 'Superseded by an identical queued job',
+            finished_at = now()
+        WHERE duplicate.status IN ('pending', 'running')
+            AND EXISTS (
+                SELECT 1
+                FROM media_jobs AS keeper
+                WHERE keeper.meditation_id = duplicate.meditation_id
+                    AND keeper.kind = duplicate.kind
+                    AND keeper.source_url = duplicate.source_url
+                    AND keeper.status IN ('pending', 'running')
+                    AND keeper.id < duplicate.id
+            )
+        """
+    )
+    op.create_index(
+        "uq_media_jobs_active_source",
+        "media_jobs",
+        ["meditation_id", "kind", "source_url"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('pending', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    """Drop the active job uniqueness rule. Retired duplicates stay failed."""
+    op.drop_index("uq_media_jobs_active_source", table_name="media_jobs")
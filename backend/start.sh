@@ -2,5 +2,12 @@
 set -eu
 
 alembic upgrade head
+python -m app.cli.activity_partitions
+
+# Samples from a previous run would be added to the new workers' numbers.
+if [ -n "${PROMETHEUS_MULTIPROC_DIR:-}" ]; then
+  rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+  mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
 
 exec uvicorn app.main:app --host 0.0.0.0 --port "${PORT:-8000}"
@@ -0,0 +1,165 @@
+"""Shared test setup.
+
+Tests run without external services: settings point at a throwaway SQLite
+file and a moto S3 bucket before any application module is imported. Tests
+of PostgreSQL-only SQL use the ``postgresql_db`` fixture, which runs them
+against an empty database named by TEST_POSTGRESQL_URL and skips them when
+it is not set.
+"""
+
+import os
+import tempfile
+from contextlib import AbstractContextManager
+from functools import partial
+from itertools import count
+from pathlib import Path
+from typing import Callable
+
+TEST_DIRECTORY = Path(tempfile.mkdtemp(prefix="still-tests-"))
+TEST_POSTGRESQL_URL = os.environ.get("TEST_POSTGRESQL_URL", "")
+
+os.environ.update(
+    {
+        "DATABASE_URL": f"sqlite:///{TEST_DIRECTORY / 'test.db'}",
+        "AWS_ACCESS_KEY": "testing",
+        "AWS_SECRET_KEY": "testing",
+        "AWS_REGION": "us-east-1",
+        "AWS_S3_BUCKET": "still-test-media",
+        "S3_ENDPOINT_URL": "",
+        "RATE_LIMIT_BACKEND": "memory",
+        "PASSWORD_HASH_WORKERS": "0",
+        "BCRYPT_ROUNDS": "4",
+        "SQL_QUERY_LOG_THRESHOLD": "0",
+    }
+)
+
+import boto3  # noqa: E402
+import pytest  # noqa: E402
+from moto import mock_aws  # noqa: E402
+from sqlalchemy import ColumnDefault, create_engine, event  # noqa: E402
+
+from app.cli.activity_partitions import ACTIVITY_TABLE, DEFAULT_PARTITION  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.query_log import QueryLog, query_budget as check_query_budget  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402,F401  (imports every model)
+from app.services.s3_service import reset_s3_client, upload_metrics  # noqa: E402
+
+
+def adapt_schema_for_sqlite() -> None:
+    """Translate the PostgreSQL-only parts of the models for SQLite.
+
+    Partial indexes keep their WHERE clause, JSON defaults written as
+    PostgreSQL casts fall back to the models' Python defaults, and the
+    partitioned activity table gets ids from a counter.
+    """
+    for table in Base.metadata.tables.values():
+        for index in table.indexes:
+            where = index.dialect_options["postgresql"]["where"]
+            if where is not None:
+                index.dialect_options["sqlite"]["where"] = where
+        for column in table.columns:
+            default = getattr(column.server_default, "arg", None)
+            if default is not None and "::" in str(default):
+                column.server_default = None
+    # SQLite only autoincrements a single-column primary key, so activity ids
+    # come from a counter, well above the ids tests pick themselves.
+    activity_id = Base.metadata.tables["meditation_session_activity"].c.id
+    activity_id.autoincrement = False
+    activity_id.default = ColumnDefault(partial(next, count(1_000_000)))
+
+
+def add_sqlite_functions(dbapi_connection, connection_record) -> None:
+    """Provide the PostgreSQL functions the app calls that SQLite lacks."""
+    dbapi_connection.create_function("least", -1, min, deterministic=True)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database_schema():
+    """Create every table once for the test run."""
+    adapt_schema_for_sqlite()
+    event.listen(engine, "connect", add_sqlite_functions)
+    Base.metadata.create_all(engine)
+    yield
+    engine.dispose()
+
+
+@pytest.fixture
+def db():
+    """Yield a database session and empty every table afterward."""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        empty_tables(engine)
+
+
+def empty_tables(bind) -> None:
+    """Delete every row, children first."""
+    with bind.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+
+@pytest.fixture(scope="session")
+def postgresql_engine(database_schema):
+    """Create every table in the TEST_POSTGRESQL_URL database for the run."""
+    if not TEST_POSTGRESQL_URL:
+        pytest.skip("set TEST_POSTGRESQL_URL to run PostgreSQL-only tests")
+    postgresql = create_engine(TEST_POSTGRESQL_URL)
+    Base.metadata.drop_all(postgresql)
+    Base.metadata.create_all(postgresql)
+    with postgresql.begin() as connection:
+        # Production keeps monthly partitions; tests only need the default one.
+        connection.exec_driver_sql(
+            f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {ACTIVITY_TABLE} DEFAULT"
+        )
+        # Like the migration, let SQL inserts without an id take one from a
+        # sequence; ORM inserts still use the counter from adapt_schema_for_sqlite.
+        connection.exec_driver_sql(f"CREATE SEQUENCE IF NOT EXISTS {ACTIVITY_TABLE}_id_seq")
+        connection.exec_driver_sql(
+            f"ALTER TABLE {ACTIVITY_TABLE} ALTER COLUMN id SET DEFAULT nextval('{ACTIVITY_TABLE}_id_seq')"
+        )
+    yield postgresql
+    Base.metadata.drop_all(postgresql)
+    with postgresql.begin() as connection:
+        connection.exec_driver_sql(f"DROP SEQUENCE IF EXISTS {ACTIVITY_TABLE}_id_seq")
+    postgresql.dispose()
+
+
+@pytest.fixture
+def postgresql_db(postgresql_engine):
+    """Yield a PostgreSQL session and empty every table afterward."""
+    session = SessionLocal(bind=postgresql_engine)
+    try:
+        yield session
+    finally:
+        session.close()
+        empty_tables(postgresql_engine)
+
+
+@pytest.fixture
+def s3():
+    """Yield a boto3 client for an empty moto bucket used by S3Service."""
+    with mock_aws():
+        reset_s3_client()
+        upload_metrics.reset()
+        client = boto3.client("s3", region_name=settings.AWS_REGION)
+        client.create_bucket(Bucket=settings.AWS_S3_BUCKET)
+        yield client
+        reset_s3_client()
+
+
+
+@pytest.fixture
+def query_budget(request) -> Callable[[int], AbstractContextManager[QueryLog]]:
+    """Return a context manager that fails the test past a SQL statement count.
+
+    Use it as ``with query_budget(2): ...`` around the code under test.
+    """
+    def within(max_queries: int) -> AbstractContextManager[QueryLog]:
+        return check_query_budget(max_queries, request.node.name)
+
+    return within
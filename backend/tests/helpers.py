@@ -0,0 +1,111 @@
+"""Small builders shared by several test modules."""
+
+import asyncio
+import struct
+import zipfile
+from io import BytesIO
+
+from fastapi import UploadFile
+from PIL import Image
+
+from app.core.config import settings
+
+
+def bucket_keys(client) -> list[str]:
+    """Return every object key in the test bucket."""
+    response = client.list_objects_v2(Bucket=settings.AWS_S3_BUCKET)
+    return sorted(item["Key"] for item in response.get("Contents", []))
+
+
+def csv_upload(text: str, filename: str = "meditations.csv") -> UploadFile:
+    """Wrap CSV text as an uploaded file."""
+    return UploadFile(file=BytesIO(text.encode("utf-8")), filename=filename)
+
+
+def zip_upload(members: dict[str, bytes], filename: str = "media.zip") -> UploadFile:
+    """Build an uploaded ZIP holding the given members."""
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return UploadFile(file=buffer, filename=filename)
+
+
+def png_bytes(width: int = 400, height: int = 300) -> bytes:
+    """Return a small solid PNG image."""
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), (40, 90, 120)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def tamper_zip(upload: UploadFile, *, file_size: int | None = None, crc: int | None = None) -> UploadFile:
+    """Rewrite the first central directory entry of a ZIP upload.
+
+    zipfile trusts these fields, so a smaller file_size makes the member's
+    header lie about its size and a different crc makes its checksum fail.
+    """
+    data = bytearray(upload.file.read())
+    entry = data.index(b"PK\x01\x02")
+    if crc is not None:
+        struct.pack_into("<I", data, entry + 16, crc)
+    if file_size is not None:
+        struct.pack_into("<I", data, entry + 24, file_size)
+    return UploadFile(file=BytesIO(bytes(data)), filename=upload.filename)
+
+
+def call_asgi(
+    app,
+    method: str,
+    path: str,
+    headers: dict[str, str] | None = None,
+    body: bytes = b"",
+) -> tuple[int, dict[str, str], bytes]:
+    """Send one HTTP request straight to an ASGI app and collect the response.
+
+    Returns the status, the headers with lower-case names, and the body.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (name.lower().encode(), value.encode()) for name, value in (headers or {}).items()
+        ],
+        "client": ("203.0.113.7", 50000),
+        "server": ("testserver", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    response: dict = {"status": None, "headers": {}, "body": b""}
+
+    async def run() -> None:
+        finished = asyncio.Event()
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            # Like a real client, only disconnect once the response is done.
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = {
+                    name.decode().lower(): value.decode() for name, value in message.get("headers", [])
+                }
+            elif message["type"] == "http.response.body":
+                response["body"] += message.get("body", b"")
+                if not message.get("more_body", False):
+                    finished.set()
+
+        await app(scope, receive, send)
+
+    asyncio.run(run())
+    return response["status"], response["headers"], response["body"]
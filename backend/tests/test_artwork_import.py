@@ -0,0 +1,86 @@
+from app.api.v1.admin import meditations as admin_meditations
+from app.api.v1.admin.meditations import bulk_import_meditations
+from app.api.v1.admin.programs import bulk_import_programs
+from app.models.meditation import Meditation
+from app.models.program import Program
+from tests.helpers import bucket_keys, csv_upload, png_bytes, zip_upload
+
+ARTWORK = png_bytes()
+
+
+def assert_has_variants(artwork_variants: dict) -> None:
+    assert set(artwork_variants) == {"avif", "webp"}
+    assert set(artwork_variants["webp"]) == {"320", "400"}
+
+
+def test_meditation_import_builds_variants_for_zip_artwork(db, s3, monkeypatch):
+    extracted = []
+    real_extract = admin_meditations.extract_zip_member
+
+    def extract_zip_member(archive, member, max_bytes):
+        extracted.append(member)
+        return real_extract(archive, member, max_bytes)
+
+    monkeypatch.setattr(admin_meditations, "extract_zip_member", extract_zip_member)
+
+    db.add(Meditation(
+        title="Calm",
+        category="sleep",
+        duration_sec=300,
+        level="beginner",
+        artwork_url="https://media.example.com/artwork/old.png",
+        artwork_variants={"webp": {"320": "https://media.example.com/old.webp"}},
+    ))
+    db.commit()
+
+    result = bulk_import_meditations(
+        csv_file=csv_upload(
+            "title,category,duration_sec,level,artwork_url,artwork_filename\n"
+            "Calm,sleep,300,beginner,https://media.example.com/artwork/new.png,\n"
+            "Focus,focus,300,beginner,,focus.png\n"
+            "Rest,sleep,300,beginner,,focus.png\n"
+        ),
+        media_zip=zip_upload({"artwork/focus.png": ARTWORK}),
+        db=db,
+    )
+
+    assert result["warnings"] == []
+    meditations = {meditation.title: meditation for meditation in db.query(Meditation)}
+    assert meditations["Calm"].artwork_variants == {}
+    assert_has_variants(meditations["Focus"].artwork_variants)
+    assert meditations["Rest"].artwork_variants == meditations["Focus"].artwork_variants
+    # One original and four variants, uploaded once for both rows from a
+    # single read of the member.
+    assert len(bucket_keys(s3)) == 5
+    assert extracted == ["artwork/focus.png"]
+
+
+def test_program_import_builds_variants_for_zip_artwork(db, s3):
+    meditation = Meditation(title="Calm", category="sleep", duration_sec=300, level="beginner", is_published=True)
+    db.add(meditation)
+    db.add(Program(
+        title="Evening",
+        level="beginner",
+        artwork_url="https://media.example.com/artwork/old.png",
+        artwork_variants={"webp": {"320": "https://media.example.com/old.webp"}},
+    ))
+    db.commit()
+
+    result = bulk_import_programs(
+        csv_file=csv_upload(
+            "title,level,artwork_url,artwork_filename,meditation_ids\n"
+            f"Evening,beginner,https://media.example.com/artwork/new.png,,{meditation.id}\n"
+            f"Sleep Week,beginner,,calm.png,{meditation.id}\n"
+            f"Rest Week,beginner,,calm.png,{meditation.id}\n"
+        ),
+        artwork_zip=zip_upload({"artwork/calm.png": ARTWORK}),
+        db=db,
+    )
+
+    assert result["created"] == 2
+    assert result["updated"] == 1
+    programs = {program.title: program for program in db.query(Program)}
+    assert programs["Evening"].artwork_variants == {}
+    assert_has_variants(programs["Sleep Week"].artwork_variants)
+    assert programs["Rest Week"].artwork_variants == programs["Sleep Week"].artwork_variants
+    assert len(bucket_keys(s3)) == 5
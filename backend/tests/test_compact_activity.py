@@ -0,0 +1,118 @@
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+from itertools import count
+from math import ceil
+
+import pytest
+from sqlalchemy import select
+
+from app.cli.compact_activity import compact_activity
+from app.models.meditation import Meditation
+from app.models.session import MeditationSession, MeditationSessionActivity
+
+CUTOFF = datetime(2026, 2, 1, tzinfo=UTC)
+OLD_START = datetime(2026, 1, 5, 10, 0, tzinfo=UTC)
+RECENT_START = datetime(2026, 2, 10, 10, 0, tzinfo=UTC)
+# Heartbeats as minutes after the start: three in the 10:00 bucket, two in
+# the 10:15 bucket (10:15 itself starts the new bucket), one alone at 10:30.
+HEARTBEAT_MINUTES = (0, 5, 14.99, 15, 20, 30)
+
+
+@pytest.fixture
+def activity(postgresql_db):
+    """Five old sessions with mergeable heartbeats and one recent session."""
+    db = postgresql_db
+    meditation = Meditation(title="Calm", category="sleep", duration_sec=3600, level="beginner")
+    db.add(meditation)
+    db.flush()
+    device_ids = count(1)
+
+    def add_session(started_at):
+        meditation_session = MeditationSession(
+            meditation_id=meditation.id,
+            device_id=next(device_ids),
+            started_at=started_at,
+            seconds_listened=60 * len(HEARTBEAT_MINUTES),
+        )
+        db.add(meditation_session)
+        db.flush()
+        db.add_all(
+            MeditationSessionActivity(
+                session_id=meditation_session.id,
+                recorded_at=started_at + timedelta(minutes=minutes),
+                seconds_listened=60,
+            )
+            for minutes in HEARTBEAT_MINUTES
+        )
+        return meditation_session.id
+
+    old_ids = [add_session(OLD_START + timedelta(days=day)) for day in range(5)]
+    recent_id = add_session(RECENT_START)
+    db.commit()
+    return old_ids, recent_id
+
+
+def activity_rows(db) -> dict[int, list[tuple[datetime, int]]]:
+    """Return each session's activity as (recorded_at, seconds) in time order."""
+    rows = defaultdict(list)
+    for session_id, recorded_at, seconds in db.execute(
+        select(
+            MeditationSessionActivity.session_id,
+            MeditationSessionActivity.recorded_at,
+            MeditationSessionActivity.seconds_listened,
+        ).order_by(MeditationSessionActivity.session_id, MeditationSessionActivity.recorded_at)
+    ):
+        rows[session_id].append((recorded_at, seconds))
+    return dict(rows)
+
+
+def seconds_per_session(db) -> dict[int, int]:
+    return {
+        session_id: sum(seconds for _, seconds in rows)
+        for session_id, rows in activity_rows(db).items()
+    }
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 10_000])
+def test_old_activity_is_merged_per_15_minute_bucket(postgresql_db, postgresql_engine, activity, batch_size):
+    old_ids, recent_id = activity
+    seconds_before = seconds_per_session(postgresql_db)
+    recent_before = activity_rows(postgresql_db)[recent_id]
+
+    batches, removed, added = compact_activity(postgresql_engine, CUTOFF, batch_size)
+
+    assert batches == ceil((old_ids[-1] - old_ids[0] + 1) / batch_size)
+    # Per session: 3 rows become one and 2 rows become one.
+    assert (removed, added) == (5 * len(old_ids), 2 * len(old_ids))
+    postgresql_db.expire_all()
+    assert seconds_per_session(postgresql_db) == seconds_before
+    rows = activity_rows(postgresql_db)
+    for day, session_id in enumerate(old_ids):
+        start = OLD_START + timedelta(days=day)
+        # Each merged row keeps the earliest time in its bucket.
+        assert rows[session_id] == [
+            (start, 180),
+            (start + timedelta(minutes=15), 120),
+            (start + timedelta(minutes=30), 60),
+        ]
+    assert rows[recent_id] == recent_before
+
+
+def test_rerunning_changes_nothing(postgresql_db, postgresql_engine, activity):
+    compact_activity(postgresql_engine, CUTOFF, 2)
+    rows_after_first_run = activity_rows(postgresql_db)
+
+    _, removed, added = compact_activity(postgresql_engine, CUTOFF, 2)
+
+    assert (removed, added) == (0, 0)
+    postgresql_db.expire_all()
+    assert activity_rows(postgresql_db) == rows_after_first_run
+
+
+def test_dry_run_counts_without_changing_rows(postgresql_db, postgresql_engine, activity):
+    rows_before = activity_rows(postgresql_db)
+
+    dry_run = compact_activity(postgresql_engine, CUTOFF, 2, dry_run=True)
+
+    assert activity_rows(postgresql_db) == rows_before
+    assert compact_activity(postgresql_engine, CUTOFF, 2) == dry_run
@@ -0,0 +1,94 @@
+import gzip
+
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+
+from app.core.compression import CompressionMiddleware
+from tests.helpers import call_asgi
+
+BODY = b"breathe in, breathe out. " * 100
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/text")
+    def text():
+        return PlainTextResponse(BODY, headers={"Vary": "Cookie"})
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse(BODY[:100])
+
+    @app.get("/encoded")
+    def encoded():
+        return Response(gzip.compress(BODY), media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/artwork")
+    def artwork():
+        return Response(BODY, media_type="image/png")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([BODY[:10], BODY[10:]]), media_type="text/csv")
+
+    return app
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip, br", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("gzip", "gzip"),
+        ("*", "br"),
+        ("br;q=0, gzip;q=0", None),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_encoding_is_negotiated(app, accept_encoding, expected):
+    status, headers, body = call_asgi(app, "GET", "/text", {"Accept-Encoding": accept_encoding})
+
+    assert status == 200
+    assert headers.get("content-encoding") == expected
+    decoded = {"br": brotli.decompress, "gzip": gzip.decompress, None: bytes}[expected](body)
+    assert decoded == BODY
+
+
+def test_compressed_response_has_vary_and_new_length(app):
+    _, headers, body = call_asgi(app, "GET", "/text", {"Accept-Encoding": "gzip"})
+
+    assert headers["vary"] == "Cookie, Accept-Encoding"
+    assert headers["content-length"] == str(len(body))
+    assert len(body) < len(BODY)
+
+
+def test_small_responses_are_left_alone(app):
+    _, headers, body = call_asgi(app, "GET", "/small", {"Accept-Encoding": "gzip, br"})
+
+    assert "content-encoding" not in headers
+    assert body == BODY[:100]
+    assert headers["content-length"] == "100"
+
+
+@pytest.mark.parametrize("path", ["/encoded", "/artwork"])
+def test_encoded_and_media_responses_pass_through(app, path):
+    _, headers, body = call_asgi(app, "GET", path, {"Accept-Encoding": "br"})
+
+    assert headers.get("content-encoding") == ("gzip" if path == "/encoded" else None)
+    assert "accept-encoding" not in headers.get("vary", "").lower()
+    assert body == (gzip.compress(BODY) if path == "/encoded" else BODY)
+
+
+def test_streamed_responses_are_compressed_chunk_by_chunk(app):
+    _, headers, body = call_asgi(app, "GET", "/stream", {"Accept-Encoding": "gzip"})
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert gzip.decompress(body) == BODY
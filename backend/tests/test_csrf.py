@@ -0,0 +1,90 @@
+import pytest
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.core.csrf import CSRFMiddleware, create_csrf_token
+from tests.helpers import call_asgi
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.add_middleware(CSRFMiddleware)
+
+    @app.api_route("/progress", methods=["GET", "HEAD", "OPTIONS", "POST", "PUT", "DELETE"])
+    def progress():
+        return {"ok": True}
+
+    return app
+
+
+def request_headers(*, session=True, csrf_cookie=None, csrf_header=None) -> dict[str, str]:
+    cookies = []
+    if session:
+        cookies.append(f"{settings.AUTH_COOKIE_NAME}=session-token")
+    if csrf_cookie:
+        cookies.append(f"{settings.CSRF_COOKIE_NAME}={csrf_cookie}")
+    headers = {"Cookie": "; ".join(cookies)} if cookies else {}
+    if csrf_header:
+        headers[settings.CSRF_HEADER_NAME] = csrf_header
+    return headers
+
+
+@pytest.mark.parametrize("method", ["POST", "PUT", "DELETE"])
+def test_matching_token_is_accepted(app, method):
+    token = create_csrf_token()
+
+    status, _, _ = call_asgi(app, method, "/progress", request_headers(csrf_cookie=token, csrf_header=token))
+
+    assert status == 200
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        pytest.param(request_headers(csrf_cookie="{token}"), id="missing header"),
+        pytest.param(request_headers(csrf_header="{token}"), id="missing cookie"),
+        pytest.param(request_headers(csrf_cookie="{token}", csrf_header="{other}"), id="mismatched"),
+        pytest.param(request_headers(csrf_cookie="{forged}", csrf_header="{forged}"), id="bad signature"),
+    ],
+)
+def test_unsafe_request_without_a_valid_token_is_rejected(app, headers):
+    values = {"token": create_csrf_token(), "other": create_csrf_token(), "forged": "abc.def"}
+    headers = {name: value.format(**values) for name, value in headers.items()}
+
+    status, _, body = call_asgi(app, "POST", "/progress", headers)
+
+    assert status == 403
+    assert body == b'{"detail":"Invalid CSRF token"}'
+
+
+def test_expired_token_cookie_needs_a_fresh_token(app):
+    # The browser drops the token cookie after CSRF_TOKEN_EXPIRE_MINUTES,
+    # so a page still holding the old value sends only the header.
+    stale = create_csrf_token()
+    status, _, _ = call_asgi(app, "POST", "/progress", request_headers(csrf_header=stale))
+    assert status == 403
+
+    fresh = create_csrf_token()
+    status, _, _ = call_asgi(app, "POST", "/progress", request_headers(csrf_cookie=fresh, csrf_header=fresh))
+    assert status == 200
+
+
+@pytest.mark.parametrize("method", ["GET", "HEAD", "OPTIONS"])
+def test_safe_methods_need_no_token(app, method):
+    status, _, _ = call_asgi(app, method, "/progress", request_headers())
+
+    assert status == 200
+
+
+def test_requests_without_a_session_cookie_are_exempt(app):
+    # Signed-out browsers and bearer-token clients cannot be tricked into
+    # sending a session, so there is nothing to protect.
+    status, _, _ = call_asgi(
+        app,
+        "POST",
+        "/progress",
+        {**request_headers(session=False), "Authorization": "Bearer token"},
+    )
+
+    assert status == 200
@@ -0,0 +1,167 @@
+import moto.s3.models
+import pytest
+import requests
+from fastapi import HTTPException
+
+from app.api.v1.admin.meditations import (
+    MAX_AUDIO_BYTES,
+    create_direct_upload,
+    finalize_direct_upload,
+)
+from app.core.config import settings
+from app.models.media_job import MediaJob
+from app.models.meditation import Meditation
+from app.schemas.meditation import DirectUploadFinalize, DirectUploadRequest
+from app.services import s3_service
+from tests.helpers import bucket_keys
+
+AUDIO = b"ID3 pretend mp3 audio"
+
+
+@pytest.fixture
+def meditation(db):
+    meditation = Meditation(title="Calm", category="sleep", duration_sec=300, level="beginner")
+    db.add(meditation)
+    db.commit()
+    return meditation
+
+
+@pytest.fixture
+def small_multipart(monkeypatch):
+    """Switch to multipart for tiny files so tests do not send 100 MB."""
+    monkeypatch.setattr(s3_service, "MULTIPART_UPLOAD_THRESHOLD_BYTES", 10)
+    monkeypatch.setattr(s3_service, "MULTIPART_UPLOAD_PART_BYTES", 8)
+    monkeypatch.setattr(moto.s3.models, "S3_UPLOAD_PART_MIN_SIZE", 1)
+
+
+def request_upload(db, meditation_id: int, size_bytes: int, content_type: str = "audio/mpeg"):
+    return create_direct_upload(
+        meditation_id,
+        DirectUploadRequest(
+            kind="audio",
+            filename="calm.mp3",
+            content_type=content_type,
+            size_bytes=size_bytes,
+        ),
+        db=db,
+    )
+
+
+def open_multipart_uploads(s3) -> list[dict]:
+    return s3.list_multipart_uploads(Bucket=settings.AWS_S3_BUCKET).get("Uploads", [])
+
+
+def test_single_put_upload_is_attached(db, s3, meditation):
+    ticket = request_upload(db, meditation.id, len(AUDIO))
+    assert ticket.upload_id is None
+    assert ticket.key.startswith(f"audio/direct/{meditation.id}/")
+
+    response = requests.put(ticket.url, data=AUDIO, headers=ticket.headers)
+    assert response.status_code == 200
+
+    result = finalize_direct_upload(
+        meditation.id,
+        DirectUploadFinalize(kind="audio", key=ticket.key),
+        db=db,
+    )
+
+    assert result.audio_url == s3_service.S3Service().generate_public_url(ticket.key)
+    assert {job.kind for job in db.query(MediaJob)} == {"audio_renditions", "audio_hls"}
+
+
+def test_multipart_upload_is_completed(db, s3, meditation, small_multipart):
+    ticket = request_upload(db, meditation.id, len(AUDIO))
+    assert ticket.upload_id is not None
+    assert [part.size_bytes for part in ticket.parts] == [8, 8, 5]
+
+    parts = []
+    offset = 0
+    for part in ticket.parts:
+        response = requests.put(part.url, data=AUDIO[offset:offset + part.size_bytes])
+        assert response.status_code == 200
+        parts.append({"part_number": part.part_number, "etag": response.headers["ETag"]})
+        offset += part.size_bytes
+
+    result = finalize_direct_upload(
+        meditation.id,
+        DirectUploadFinalize(kind="audio", key=ticket.key, upload_id=ticket.upload_id, parts=parts),
+        db=db,
+    )
+
+    assert result.audio_url.endswith(ticket.key)
+    stored = s3.get_object(Bucket=settings.AWS_S3_BUCKET, Key=ticket.key)
+    assert stored["Body"].read() == AUDIO
+    assert open_multipart_uploads(s3) == []
+
+
+def test_failed_multipart_completion_is_aborted(db, s3, meditation, small_multipart):
+    ticket = request_upload(db, meditation.id, len(AUDIO))
+    requests.put(ticket.parts[0].url, data=AUDIO[:8])
+
+    with pytest.raises(HTTPException) as error:
+        finalize_direct_upload(
+            meditation.id,
+            DirectUploadFinalize(
+                kind="audio",
+                key=ticket.key,
+                upload_id=ticket.upload_id,
+                parts=[{"part_number": 1, "etag": '"not-the-etag"'}],
+            ),
+            db=db,
+        )
+
+    assert error.value.status_code == 400
+    assert open_multipart_uploads(s3) == []
+    assert bucket_keys(s3) == []
+
+
+def test_key_of_another_meditation_is_rejected(db, s3, meditation):
+    other = Meditation(title="Focus", category="focus", duration_sec=300, level="beginner")
+    db.add(other)
+    db.commit()
+    ticket = request_upload(db, other.id, len(AUDIO))
+    requests.put(ticket.url, data=AUDIO, headers=ticket.headers)
+
+    with pytest.raises(HTTPException) as error:
+        finalize_direct_upload(
+            meditation.id,
+            DirectUploadFinalize(kind="audio", key=ticket.key),
+            db=db,
+        )
+
+    assert error.value.status_code == 400
+    assert error.value.detail == "Upload key does not belong to this meditation"
+    db.refresh(meditation)
+    assert meditation.audio_url is None
+
+
+def test_oversized_request_is_refused_before_presigning(db, s3, meditation):
+    with pytest.raises(HTTPException) as error:
+        request_upload(db, meditation.id, MAX_AUDIO_BYTES + 1)
+
+    assert error.value.status_code == 400
+    assert error.value.detail == "Audio must be 2 GB or smaller"
+    assert open_multipart_uploads(s3) == []
+
+
+def test_wrong_file_type_is_deleted_at_finalize(db, s3, meditation):
+    ticket = request_upload(db, meditation.id, len(AUDIO))
+    # Stand in for a client that ignored the signed headers.
+    s3.put_object(
+        Bucket=settings.AWS_S3_BUCKET,
+        Key=ticket.key,
+        Body=b"<html></html>",
+        ContentType="text/html",
+    )
+
+    with pytest.raises(HTTPException) as error:
+        finalize_direct_upload(
+            meditation.id,
+            DirectUploadFinalize(kind="audio", key=ticket.key),
+            db=db,
+        )
+
+    assert error.value.detail == "File must be audio"
+    assert bucket_keys(s3) == []
+    db.refresh(meditation)
+    assert meditation.audio_url is None
@@ -0,0 +1,149 @@
+import asyncio
+import csv
+from io import StringIO
+
+import pytest
+
+from app.api.v1.admin import export_utils
+from app.api.v1.admin.export_utils import CSVExportResponse, stream_csv, stream_export
+from app.api.v1.admin.meditations import MEDITATION_EXPORT_FIELDS, meditation_export_rows
+from app.core.security import create_access_token
+from app.db.session import SessionLocal
+from app.main import app as api_app
+from app.models.meditation import Meditation
+from app.models.program import Program, ProgramMeditation
+from app.models.user import User
+from tests.helpers import call_asgi
+
+
+@pytest.fixture
+def admin_headers(db) -> dict[str, str]:
+    admin = User(email="admin@example.com", hashed_password="x", is_admin=True)
+    db.add(admin)
+    db.commit()
+    token = create_access_token({"sub": str(admin.id), "is_admin": True})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def read_csv(text: str) -> list[dict[str, str]]:
+    return list(csv.DictReader(StringIO(text)))
+
+
+def add_meditations(db, *titles: str) -> list[Meditation]:
+    meditations = [
+        Meditation(
+            title=title,
+            category="sleep",
+            duration_sec=300,
+            level="beginner",
+            tags=["calm", "night"],
+            benefits=["rest", "focus"],
+        )
+        for title in titles
+    ]
+    db.add_all(meditations)
+    db.commit()
+    return meditations
+
+
+def test_stream_csv_yields_chunks_that_read_back(monkeypatch):
+    monkeypatch.setattr(export_utils, "EXPORT_CHUNK_BYTES", 100)
+    rows = [{"id": number, "title": f"Meditation, part {number}"} for number in range(20)]
+
+    chunks = list(stream_csv(["id", "title"], rows))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) >= 100 for chunk in chunks[:-1])
+    assert read_csv("".join(chunks)) == [
+        {"id": str(row["id"]), "title": row["title"]} for row in rows
+    ]
+
+
+def test_stream_csv_writes_a_header_for_no_rows():
+    assert list(stream_csv(["id", "title"], [])) == ["id,title\r\n"]
+
+
+def test_meditation_export_reads_back(db, admin_headers):
+    add_meditations(db, "Calm", "Focus")
+
+    status, headers, body = call_asgi(api_app, "GET", "/api/v1/admin/meditations/export.csv", admin_headers)
+
+    assert status == 200
+    assert headers["content-disposition"] == 'attachment; filename="meditations-backup.csv"'
+    assert headers["content-type"] == "text/csv; charset=utf-8"
+    rows = read_csv(body.decode())
+    assert list(rows[0]) == MEDITATION_EXPORT_FIELDS
+    assert [(row["title"], row["tags"], row["benefits"]) for row in rows] == [
+        ("Calm", "calm,night", "rest|focus"),
+        ("Focus", "calm,night", "rest|focus"),
+    ]
+
+
+def test_program_export_has_one_row_per_program(db, admin_headers):
+    calm, focus, rest = add_meditations(db, "Calm", "Focus", "Rest")
+    empty = Program(title="Empty Week")
+    single = Program(title="Single Week")
+    several = Program(title="Several Week")
+    db.add_all([empty, single, several])
+    db.flush()
+    db.add_all([
+        ProgramMeditation(program_id=single.id, meditation_id=focus.id, position=0),
+        # Positions, not ids, set the order.
+        ProgramMeditation(program_id=several.id, meditation_id=rest.id, position=0),
+        ProgramMeditation(program_id=several.id, meditation_id=calm.id, position=1),
+        ProgramMeditation(program_id=several.id, meditation_id=focus.id, position=2),
+    ])
+    db.commit()
+
+    status, _, body = call_asgi(api_app, "GET", "/api/v1/admin/programs/export.csv", admin_headers)
+
+    assert status == 200
+    rows = read_csv(body.decode())
+    assert [(row["title"], row["meditation_ids"], row["meditation_titles"]) for row in rows] == [
+        ("Empty Week", "", ""),
+        ("Single Week", str(focus.id), "Focus"),
+        ("Several Week", f"{rest.id}|{calm.id}|{focus.id}", "Rest|Calm|Focus"),
+    ]
+
+
+def test_export_session_closes_when_the_client_disconnects(db, monkeypatch):
+    add_meditations(db, *(f"Meditation {number}" for number in range(50)))
+    monkeypatch.setattr(export_utils, "EXPORT_CHUNK_BYTES", 100)
+    closed = []
+
+    def session_local():
+        session = SessionLocal()
+        real_close = session.close
+
+        def close():
+            closed.append(session)
+            real_close()
+
+        session.close = close
+        return session
+
+    monkeypatch.setattr(export_utils, "SessionLocal", session_local)
+    response = CSVExportResponse(stream_export(MEDITATION_EXPORT_FIELDS, meditation_export_rows))
+    bodies = []
+
+    async def receive():
+        # Leave after the first two chunks of a much longer download.
+        while len(bodies) < 2:
+            await asyncio.sleep(0.01)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            bodies.append(message["body"])
+            # A slow network: the disconnect lands while a chunk is being sent.
+            await asyncio.sleep(0.05)
+
+    async def download() -> int:
+        await response({"type": "http", "asgi": {"version": "3.0"}}, receive, send)
+        # Counted before the event loop shuts down and collects generators.
+        return len(closed)
+
+    closed_when_response_ended = asyncio.run(download())
+
+    assert 2 <= len(bodies) < 50
+    assert closed_when_response_ended == 1
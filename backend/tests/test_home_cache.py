@@ -0,0 +1,129 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from app.api.v1.home import home_feed
+from app.api.v1.sessions import invalidate_home_feed
+from app.core.home_cache import HomeFeedCache, device_owner, home_feed_cache, user_owner
+from app.models.meditation import Meditation
+from app.models.session import MeditationSession
+
+DEVICE_ID = 515
+VARIANT = ("UTC", 10, 3, 3)
+
+
+class ManualClockCache(HomeFeedCache):
+    """A cache whose clock only moves when a test advances it."""
+
+    def __init__(self, ttl_seconds: int, max_owners: int = 10_000):
+        super().__init__(ttl_seconds, max_owners)
+        self.clock = 100.0
+
+    def now(self) -> float:
+        return self.clock
+
+
+@pytest.fixture
+def shared_cache():
+    """Start and end each test with the app's home feed cache empty."""
+    home_feed_cache.clear()
+    yield home_feed_cache
+    home_feed_cache.clear()
+
+
+def test_feeds_expire_after_the_ttl():
+    cache = ManualClockCache(ttl_seconds=30)
+    cache.set(user_owner(1), VARIANT, "feed", cache.now())
+
+    cache.clock += 29
+    assert cache.get(user_owner(1), VARIANT) == "feed"
+    cache.clock += 1
+    assert cache.get(user_owner(1), VARIANT) is None
+
+
+def test_invalidate_drops_every_variant_of_an_owner_only():
+    cache = ManualClockCache(ttl_seconds=30)
+    for variant in (VARIANT, ("Asia/Kolkata", 10, 3, 3)):
+        cache.set(user_owner(1), variant, "feed", cache.now())
+    cache.set(device_owner(1), VARIANT, "device feed", cache.now())
+
+    cache.invalidate(user_id=1)
+
+    assert cache.get(user_owner(1), VARIANT) is None
+    assert cache.get(user_owner(1), ("Asia/Kolkata", 10, 3, 3)) is None
+    assert cache.get(device_owner(1), VARIANT) == "device feed"
+
+
+def test_feed_built_before_a_write_is_not_stored():
+    cache = ManualClockCache(ttl_seconds=30)
+    built_since = cache.now()
+    cache.invalidate(user_id=1)
+
+    cache.set(user_owner(1), VARIANT, "stale feed", built_since)
+    assert cache.get(user_owner(1), VARIANT) is None
+
+    cache.clock += 1
+    cache.set(user_owner(1), VARIANT, "fresh feed", cache.now())
+    assert cache.get(user_owner(1), VARIANT) == "fresh feed"
+
+
+def test_least_recently_used_owners_are_evicted():
+    cache = ManualClockCache(ttl_seconds=30, max_owners=2)
+    for user_id in (1, 2):
+        cache.set(user_owner(user_id), VARIANT, f"feed {user_id}", cache.now())
+    cache.get(user_owner(1), VARIANT)
+
+    cache.set(user_owner(3), VARIANT, "feed 3", cache.now())
+
+    assert cache.get(user_owner(1), VARIANT) == "feed 1"
+    assert cache.get(user_owner(2), VARIANT) is None
+    assert cache.get(user_owner(3), VARIANT) == "feed 3"
+
+
+def test_zero_ttl_turns_caching_off():
+    cache = ManualClockCache(ttl_seconds=0)
+    cache.set(user_owner(1), VARIANT, "feed", cache.now())
+
+    assert cache.get(user_owner(1), VARIANT) is None
+
+
+def test_clear_forgets_every_feed():
+    cache = ManualClockCache(ttl_seconds=30)
+    cache.set(user_owner(1), VARIANT, "feed", cache.now())
+
+    cache.clear()
+
+    assert cache.get(user_owner(1), VARIANT) is None
+
+
+def request_home_feed(db):
+    return home_feed(
+        DEVICE_ID,
+        timezone_name="UTC",
+        history_limit=10,
+        continue_limit=3,
+        recommendation_limit=3,
+        db=db,
+        current_user=None,
+    )
+
+
+def test_home_feed_is_cached_until_the_device_listens(db, shared_cache):
+    meditation = Meditation(title="Calm", category="sleep", duration_sec=600, level="beginner")
+    db.add(meditation)
+    db.commit()
+
+    first = request_home_feed(db)
+    assert first.history.total == 0
+    assert request_home_feed(db) is first
+
+    db.add(MeditationSession(
+        meditation_id=meditation.id,
+        device_id=DEVICE_ID,
+        started_at=datetime.now(UTC),
+        seconds_listened=300,
+    ))
+    db.commit()
+    invalidate_home_feed(DEVICE_ID, None)
+
+    assert request_home_feed(db).history.total == 1
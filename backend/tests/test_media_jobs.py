@@ -0,0 +1,102 @@
+from datetime import UTC, datetime
+
+from app.api.v1.admin.meditations import bulk_import_meditations
+from app.models.media_job import MediaJob
+from app.models.meditation import Meditation
+from app.services.audio_pipeline import AUDIO_HLS_JOB, AUDIO_JOB_KINDS, enqueue_audio_processing
+from app.services.media_jobs import RUNNING_JOB_LEASE, claim_next_media_job, enqueue_media_job
+from tests.helpers import csv_upload, zip_upload
+
+AUDIO_URL = "https://media.example.com/audio/calm.mp3"
+
+
+def add_meditation(db, **values) -> Meditation:
+    meditation = Meditation(title="Calm", category="sleep", duration_sec=300, level="beginner", **values)
+    db.add(meditation)
+    db.commit()
+    return meditation
+
+
+def queued_jobs(db) -> list[tuple[str, str, str]]:
+    rows = db.query(Meditation.title, MediaJob.kind, MediaJob.source_url).join(
+        Meditation,
+        Meditation.id == MediaJob.meditation_id,
+    ).filter(MediaJob.status == "pending").order_by(Meditation.title, MediaJob.kind).all()
+    return [tuple(row) for row in rows]
+
+
+def test_enqueue_skips_a_source_that_is_already_queued(db):
+    meditation = add_meditation(db, audio_url=AUDIO_URL)
+
+    first = enqueue_audio_processing(db, meditation)
+    db.commit()
+    second = enqueue_audio_processing(db, meditation)
+    db.commit()
+
+    assert all(job is not None for job in first)
+    assert second == [None, None]
+    assert db.query(MediaJob).count() == len(AUDIO_JOB_KINDS)
+
+
+def test_enqueue_queues_again_after_the_job_finished(db):
+    meditation = add_meditation(db, audio_url=AUDIO_URL)
+    job = enqueue_media_job(db, meditation.id, AUDIO_HLS_JOB, AUDIO_URL)
+    job.status = "finished"
+    db.commit()
+
+    assert enqueue_media_job(db, meditation.id, AUDIO_HLS_JOB, AUDIO_URL) is not None
+
+
+def test_claim_skips_running_jobs_within_their_lease(db):
+    meditation = add_meditation(db, audio_url=AUDIO_URL)
+    enqueue_media_job(db, meditation.id, AUDIO_HLS_JOB, AUDIO_URL)
+    db.commit()
+
+    claimed = claim_next_media_job(db, AUDIO_HLS_JOB)
+
+    assert claimed.status == "running"
+    assert claim_next_media_job(db, AUDIO_HLS_JOB) is None
+
+
+def test_claim_reclaims_a_running_job_past_its_lease(db):
+    meditation = add_meditation(db, audio_url=AUDIO_URL)
+    job = enqueue_media_job(db, meditation.id, AUDIO_HLS_JOB, AUDIO_URL)
+    db.commit()
+    claim_next_media_job(db, AUDIO_HLS_JOB)
+    job.started_at = datetime.now(UTC) - RUNNING_JOB_LEASE - RUNNING_JOB_LEASE / 10
+    db.commit()
+
+    reclaimed = claim_next_media_job(db, AUDIO_HLS_JOB)
+
+    assert reclaimed.id == job.id
+    assert reclaimed.attempts == 2
+
+
+def test_bulk_import_queues_jobs_for_new_and_replaced_audio(db, s3):
+    add_meditation(db, audio_url=AUDIO_URL, audio_renditions={"low": AUDIO_URL})
+    add_meditation(db, audio_url=AUDIO_URL).title = "Unchanged"
+    db.commit()
+
+    result = bulk_import_meditations(
+        csv_file=csv_upload(
+            "title,category,duration_sec,level,audio_url,audio_filename\n"
+            "Calm,sleep,300,beginner,https://media.example.com/audio/calm-v2.mp3,\n"
+            "Unchanged,sleep,300,beginner,,\n"
+            "Focus,focus,300,beginner,,focus.mp3\n"
+            "Silent,focus,300,beginner,,\n"
+        ),
+        media_zip=zip_upload({"audio/focus.mp3": b"focus audio"}),
+        db=db,
+    )
+
+    assert result["created"] == 2
+    assert result["updated"] == 2
+    jobs = queued_jobs(db)
+    assert [(title, kind) for title, kind, _ in jobs] == [
+        ("Calm", kind) for kind in sorted(AUDIO_JOB_KINDS)
+    ] + [("Focus", kind) for kind in sorted(AUDIO_JOB_KINDS)]
+    assert {url for title, _, url in jobs if title == "Calm"} == {
+        "https://media.example.com/audio/calm-v2.mp3"
+    }
+    calm = db.query(Meditation).filter(Meditation.title == "Calm").one()
+    assert calm.audio_renditions == {}
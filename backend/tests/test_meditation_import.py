@@ -0,0 +1,134 @@
+import pytest
+from botocore.exceptions import ClientError
+from fastapi import HTTPException
+
+from app.api.v1.admin import meditations as admin_meditations
+from app.api.v1.admin.meditations import IMPORT_UPLOAD_ATTEMPTS, bulk_import_meditations
+from app.models.meditation import Meditation
+from app.services.s3_service import S3Service, upload_metrics
+from tests.helpers import bucket_keys, csv_upload, zip_upload
+
+HEADER = "title,category,duration_sec,level,audio_filename\n"
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(admin_meditations, "sleep", lambda seconds: None)
+
+
+def flaky_upload(monkeypatch, failures: int) -> list[str]:
+    """Make S3 uploads fail a number of times before they succeed."""
+    calls = []
+    real_upload = S3Service.upload_file
+
+    def upload_file(self, file_obj, filename, content_type, prefix=""):
+        calls.append(filename)
+        if len(calls) <= failures:
+            raise ClientError({"Error": {"Code": "SlowDown", "Message": "Slow down"}}, "PutObject")
+        return real_upload(self, file_obj, filename, content_type, prefix=prefix)
+
+    monkeypatch.setattr(S3Service, "upload_file", upload_file)
+    return calls
+
+
+def test_missing_columns_are_rejected_before_any_upload(db, s3):
+    with pytest.raises(HTTPException) as error:
+        bulk_import_meditations(
+            csv_file=csv_upload("title,audio_filename\nCalm,calm.mp3\n"),
+            media_zip=zip_upload({"audio/calm.mp3": b"calm audio"}),
+            db=db,
+        )
+
+    assert error.value.status_code == 400
+    assert bucket_keys(s3) == []
+
+
+def test_invalid_rows_upload_nothing(db, s3):
+    result = bulk_import_meditations(
+        csv_file=csv_upload(
+            HEADER
+            + "Calm,sleep,not-a-number,beginner,calm.mp3\n"
+            + "Focus,focus,300,beginner,focus.mp3\n"
+        ),
+        media_zip=zip_upload({"audio/calm.mp3": b"calm audio", "audio/focus.mp3": b"focus audio"}),
+        db=db,
+    )
+
+    assert result["created"] == 1
+    assert result["skipped"] == 1
+    assert result["errors"][0].startswith("Row 2:")
+    assert upload_metrics.snapshot()["uploads"] == 1
+    assert len(bucket_keys(s3)) == 1
+    assert db.query(Meditation.title).scalar() == "Focus"
+
+
+def test_shared_file_is_uploaded_once(db, s3):
+    result = bulk_import_meditations(
+        csv_file=csv_upload(
+            HEADER
+            + "Calm,sleep,300,beginner,bell.mp3\n"
+            + "Rest,sleep,300,beginner,bell.mp3\n"
+        ),
+        media_zip=zip_upload({"audio/bell.mp3": b"bell audio"}),
+        db=db,
+    )
+
+    assert result["created"] == 2
+    assert upload_metrics.snapshot()["uploads"] == 1
+    assert upload_metrics.snapshot()["reused"] == 0
+    audio_urls = {url for url, in db.query(Meditation.audio_url)}
+    assert len(audio_urls) == 1
+    assert bucket_keys(s3) == [f"audio/{audio_urls.pop().rsplit('/', 1)[1]}"]
+
+
+def test_new_title_with_different_files_is_a_duplicate(db, s3):
+    result = bulk_import_meditations(
+        csv_file=csv_upload(
+            HEADER
+            + "Calm,sleep,300,beginner,calm.mp3\n"
+            + "Calm,sleep,600,beginner,other.mp3\n"
+            + "Calm,sleep,900,beginner,calm.mp3\n"
+        ),
+        media_zip=zip_upload({"audio/calm.mp3": b"calm audio", "audio/other.mp3": b"other audio"}),
+        db=db,
+    )
+
+    assert (result["created"], result["updated"], result["skipped"]) == (1, 1, 1)
+    assert result["errors"] == ["Row 3: duplicate of row 2 for 'Calm' with different media"]
+    assert upload_metrics.snapshot()["uploads"] == 1
+    assert len(bucket_keys(s3)) == 1
+    meditation = db.query(Meditation).one()
+    assert meditation.duration_sec == 900
+
+
+def test_failed_upload_is_retried(db, s3, monkeypatch):
+    calls = flaky_upload(monkeypatch, failures=IMPORT_UPLOAD_ATTEMPTS - 1)
+
+    result = bulk_import_meditations(
+        csv_file=csv_upload(HEADER + "Calm,sleep,300,beginner,calm.mp3\n"),
+        media_zip=zip_upload({"audio/calm.mp3": b"calm audio"}),
+        db=db,
+    )
+
+    assert len(calls) == IMPORT_UPLOAD_ATTEMPTS
+    assert result["warnings"] == []
+    assert db.query(Meditation.audio_url).scalar() is not None
+    assert len(bucket_keys(s3)) == 1
+
+
+def test_upload_that_keeps_failing_becomes_a_warning(db, s3, monkeypatch):
+    calls = flaky_upload(monkeypatch, failures=IMPORT_UPLOAD_ATTEMPTS)
+
+    result = bulk_import_meditations(
+        csv_file=csv_upload(HEADER + "Calm,sleep,300,beginner,calm.mp3\n"),
+        media_zip=zip_upload({"audio/calm.mp3": b"calm audio"}),
+        db=db,
+    )
+
+    assert len(calls) == IMPORT_UPLOAD_ATTEMPTS
+    assert result["created"] == 1
+    assert len(result["warnings"]) == 1
+    assert result["warnings"][0].startswith("Row 2: upload failed for audio/calm.mp3")
+    # The row is still saved, just without audio.
+    assert db.query(Meditation.audio_url).scalar() is None
+    assert bucket_keys(s3) == []
@@ -0,0 +1,133 @@
+import socket
+
+import pytest
+from fastapi import Depends, FastAPI
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+
+from app.core.metrics import (
+    UNMATCHED_ROUTE,
+    MetricsMiddleware,
+    count_in_progress,
+    instrument_engine,
+    record_query_end,
+    request_db_seconds,
+    start_metrics_server,
+    stop_metrics,
+)
+from app.core.security import create_access_token
+from app.db.session import SessionLocal, engine
+from app.main import app as api_app
+from app.models.user import User
+from tests.helpers import call_asgi
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def metrics_app():
+    """A small app wired the same way create_app wires metrics."""
+    instrument_engine(engine)
+    app = FastAPI(dependencies=[Depends(count_in_progress)])
+    app.add_middleware(MetricsMiddleware)
+    seen = {}
+
+    @app.get("/metrics-test/items/{item_id}")
+    def read_item(item_id: int):
+        seen["in_progress"] = sample(
+            "http_requests_in_progress", method="GET", route="/metrics-test/items/{item_id}"
+        )
+        return {"id": item_id}
+
+    @app.get("/metrics-test/query")
+    def run_query():
+        db = SessionLocal()
+        try:
+            db.execute(text("SELECT 1")).scalar()
+        finally:
+            db.close()
+        return {}
+
+    app.state.seen = seen
+    return app
+
+
+def test_requests_are_labelled_by_route_template(metrics_app):
+    route = "/metrics-test/items/{item_id}"
+    before = sample("http_responses_total", method="GET", route=route, status="200")
+
+    for item_id in (1, 2):
+        status, _, _ = call_asgi(metrics_app, "GET", f"/metrics-test/items/{item_id}")
+        assert status == 200
+
+    assert sample("http_responses_total", method="GET", route=route, status="200") == before + 2
+    assert metrics_app.state.seen["in_progress"] >= 1
+    assert sample("http_requests_in_progress", method="GET", route=route) == 0
+    assert sample("http_request_duration_seconds_count", method="GET", route=route) >= 2
+
+
+def test_unknown_paths_share_one_label(metrics_app):
+    before = sample("http_responses_total", method="GET", route=UNMATCHED_ROUTE, status="404")
+
+    call_asgi(metrics_app, "GET", "/metrics-test/nothing-here")
+    call_asgi(metrics_app, "GET", "/metrics-test/also-missing")
+
+    assert sample("http_responses_total", method="GET", route=UNMATCHED_ROUTE, status="404") == before + 2
+    assert sample("http_responses_total", method="GET", route="/metrics-test/nothing-here", status="404") == 0
+
+
+def test_database_time_is_added_to_the_request(metrics_app):
+    route = "/metrics-test/query"
+    before_count = sample("http_request_db_seconds_count", method="GET", route=route)
+    before_sum = sample("http_request_db_seconds_sum", method="GET", route=route)
+
+    call_asgi(metrics_app, "GET", route)
+
+    assert sample("http_request_db_seconds_count", method="GET", route=route) == before_count + 1
+    assert sample("http_request_db_seconds_sum", method="GET", route=route) > before_sum
+
+
+def test_queries_outside_a_request_are_ignored():
+    class Context:
+        _metrics_query_started = 0.0
+
+    record_query_end(None, None, "SELECT 1", {}, Context(), False)
+
+    assert request_db_seconds.get() is None
+
+
+def test_only_the_first_worker_serves_the_metrics_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    first = start_metrics_server(port)
+    try:
+        assert first is not None
+        # A second worker finds the port taken and carries on without it.
+        assert start_metrics_server(port) is None
+    finally:
+        stop_metrics(first)
+
+
+@pytest.mark.parametrize(
+    ("is_admin", "authenticated", "expected_status"),
+    [(False, False, 401), (False, True, 403), (True, True, 200)],
+)
+def test_admin_metrics_requires_an_admin(db, is_admin, authenticated, expected_status):
+    user = User(email="listener@example.com", hashed_password="x", is_admin=is_admin)
+    db.add(user)
+    db.commit()
+    headers = {}
+    if authenticated:
+        token = create_access_token({"sub": str(user.id), "is_admin": is_admin})
+        headers["Authorization"] = f"Bearer {token}"
+
+    status, response_headers, body = call_asgi(api_app, "GET", "/api/v1/admin/metrics", headers)
+
+    assert status == expected_status
+    if expected_status == 200:
+        assert response_headers["content-type"].startswith("text/plain")
+        assert b"http_request_duration_seconds" in body
@@ -0,0 +1,109 @@
+from threading import BoundedSemaphore
+
+import pytest
+from fastapi import HTTPException, Response
+from starlette.requests import Request
+
+from app.api.v1.auth import hash_new_password, login
+from app.core import security
+from app.core.config import settings
+from app.core.security import (
+    build_password_context,
+    get_password_hash_pool,
+    hash_password,
+    shutdown_password_hash_pool,
+    verify_password,
+)
+from app.models.user import User
+from app.schemas.auth import UserLogin
+
+
+@pytest.fixture
+def hash_workers(monkeypatch):
+    """Hash in a real worker process and stop it after the test."""
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 1)
+    yield
+    shutdown_password_hash_pool()
+
+
+def login_request() -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/api/v1/auth/login",
+            "headers": [],
+            "client": ("203.0.113.7", 50000),
+        }
+    )
+
+
+def test_hash_and_verify_in_the_process_pool(hash_workers):
+    hashed = hash_password("quiet mind")
+
+    assert get_password_hash_pool() is not None
+    assert verify_password("quiet mind", hashed)
+    assert not verify_password("loud mind", hashed)
+
+
+def test_hash_inline_without_workers(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 0)
+    calls = []
+    real_hash = security._hash_in_worker
+
+    def hash_in_worker(password):
+        calls.append(password)
+        return real_hash(password)
+
+    monkeypatch.setattr(security, "_hash_in_worker", hash_in_worker)
+
+    hashed = hash_password("quiet mind")
+
+    assert get_password_hash_pool() is None
+    # The patched function only runs when hashing happens in this process.
+    assert calls == ["quiet mind"]
+    assert verify_password("quiet mind", hashed)
+
+
+def test_full_hashing_queue_returns_503(monkeypatch):
+    slots = BoundedSemaphore(1)
+    monkeypatch.setattr(security, "_hash_slots", slots)
+    slots.acquire()
+
+    with pytest.raises(HTTPException) as error:
+        hash_new_password("quiet mind")
+
+    assert error.value.status_code == 503
+    assert error.value.headers == {"Retry-After": "2"}
+    slots.release()
+    assert verify_password("quiet mind", hash_new_password("quiet mind"))
+
+
+@pytest.mark.parametrize("new_rounds", [settings.BCRYPT_ROUNDS + 1, settings.BCRYPT_ROUNDS])
+def test_login_rehashes_when_rounds_change(db, monkeypatch, new_rounds):
+    old_hash = hash_password("quiet mind")
+    user = User(email="listener@example.com", hashed_password=old_hash)
+    db.add(user)
+    db.commit()
+    monkeypatch.setattr(security, "pwd_context", build_password_context(new_rounds))
+
+    login(
+        UserLogin(email="listener@example.com", password="quiet mind"),
+        Response(),
+        login_request(),
+        db=db,
+    )
+
+    db.refresh(user)
+    if new_rounds == settings.BCRYPT_ROUNDS:
+        assert user.hashed_password == old_hash
+    else:
+        assert user.hashed_password.startswith(f"$2b${new_rounds:02d}$")
+        assert verify_password("quiet mind", user.hashed_password)
+
+
+def test_lowered_rounds_also_count_as_outdated():
+    hashed = build_password_context(5).hash("quiet mind")
+
+    assert build_password_context(4).needs_update(hashed)
+    assert not build_password_context(5).needs_update(hashed)
@@ -0,0 +1,112 @@
+from datetime import UTC, datetime
+from itertools import count
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.api.v1.sessions import daily_seconds_in_python, daily_seconds_in_sql
+from app.models.meditation import Meditation
+from app.models.session import MeditationSession, MeditationSessionActivity
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def at(local: str) -> datetime:
+    """Return a New York wall-clock time as UTC."""
+    return datetime.fromisoformat(local).replace(tzinfo=NEW_YORK).astimezone(UTC)
+
+
+@pytest.fixture
+def sessions_across_dst(postgresql_db):
+    """Sessions around the March 2026 clock change and local midnights."""
+    db = postgresql_db
+    meditation = Meditation(title="Calm", category="sleep", duration_sec=3600, level="beginner")
+    db.add(meditation)
+    db.flush()
+    activity_id = 0
+    device_ids = count(1)
+
+    def add_session(started_at, activity, seconds_listened, completed_at=None, last_listened_at=None):
+        nonlocal activity_id
+        meditation_session = MeditationSession(
+            meditation_id=meditation.id,
+            # Separate devices, since a device has one unfinished session per meditation.
+            device_id=next(device_ids),
+            started_at=started_at,
+            completed_at=completed_at,
+            last_listened_at=last_listened_at,
+            seconds_listened=seconds_listened,
+        )
+        db.add(meditation_session)
+        db.flush()
+        for recorded_at, seconds in activity:
+            activity_id += 1
+            db.add(MeditationSessionActivity(
+                id=activity_id,
+                session_id=meditation_session.id,
+                recorded_at=recorded_at,
+                seconds_listened=seconds,
+            ))
+        return meditation_session
+
+    sessions = [
+        # Crosses local midnight into the day the clocks spring forward.
+        add_session(
+            at("2026-03-07T23:50:00"),
+            [(at("2026-03-07T23:55:00"), 300), (at("2026-03-08T00:05:00"), 600)],
+            900,
+            completed_at=at("2026-03-08T00:05:00"),
+        ),
+        # 01:59 and 03:01 local are two minutes apart on the 23-hour day.
+        add_session(
+            at("2026-03-08T01:55:00"),
+            [(at("2026-03-08T01:59:00"), 240), (datetime(2026, 3, 8, 7, 1, tzinfo=UTC), 120)],
+            360,
+            last_listened_at=datetime(2026, 3, 8, 7, 1, tzinfo=UTC),
+        ),
+        # The last minutes of the short day are already the next day in UTC.
+        add_session(
+            at("2026-03-08T23:30:00"),
+            [(at("2026-03-08T23:45:00"), 900)],
+            900,
+        ),
+        # Partly tracked: the residual falls on the completion day.
+        add_session(
+            at("2026-03-09T23:40:00"),
+            [(at("2026-03-09T23:50:00"), 600)],
+            1500,
+            completed_at=at("2026-03-10T00:10:00"),
+        ),
+        # No activity at all: everything is residual on last_listened_at.
+        add_session(
+            at("2026-03-10T22:00:00"),
+            [],
+            420,
+            last_listened_at=at("2026-03-11T00:30:00"),
+        ),
+        # Untracked and never played past the start.
+        add_session(at("2026-03-06T12:00:00"), [], 60),
+    ]
+    db.commit()
+    return sessions
+
+
+@pytest.mark.parametrize("timezone", [NEW_YORK, ZoneInfo("Asia/Kolkata"), ZoneInfo("UTC")])
+def test_sql_and_python_day_totals_match(postgresql_db, sessions_across_dst, timezone):
+    in_python = daily_seconds_in_python(postgresql_db, sessions_across_dst, timezone)
+    in_sql = daily_seconds_in_sql(postgresql_db, sessions_across_dst, timezone)
+
+    assert in_sql == dict(in_python)
+
+
+def test_new_york_day_totals_follow_the_clock_change(postgresql_db, sessions_across_dst):
+    totals = daily_seconds_in_sql(postgresql_db, sessions_across_dst, NEW_YORK)
+
+    assert totals == {
+        datetime(2026, 3, 6).date(): 60,
+        datetime(2026, 3, 7).date(): 300,
+        datetime(2026, 3, 8).date(): 600 + 360 + 900,
+        datetime(2026, 3, 9).date(): 600,
+        datetime(2026, 3, 10).date(): 900,
+        datetime(2026, 3, 11).date(): 420,
+    }
@@ -0,0 +1,100 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.api.v1.programs import list_programs
+from app.api.v1.sessions import progress_summary, session_history
+from app.core.query_log import QueryBudgetExceeded
+from app.models.meditation import Meditation
+from app.models.program import Program, ProgramMeditation
+from app.models.session import MeditationSession, MeditationSessionActivity
+
+# The budgets below match QUERY_BUDGETS in benchmarks/query_budgets.py,
+# which checks the same endpoints against PostgreSQL.
+PROGRAMS = 5
+SESSIONS = 12
+DEVICE_ID = 4242
+
+
+@pytest.fixture
+def programs(db):
+    """Publish programs that each list three meditations."""
+    for program_index in range(PROGRAMS):
+        program = Program(title=f"Program {program_index}", level="beginner", is_published=True)
+        db.add(program)
+        db.flush()
+        for position in range(1, 4):
+            meditation = Meditation(
+                title=f"Meditation {program_index}-{position}",
+                category="sleep",
+                duration_sec=600,
+                level="beginner",
+                is_published=True,
+            )
+            db.add(meditation)
+            db.flush()
+            db.add(ProgramMeditation(program_id=program.id, meditation_id=meditation.id, position=position))
+    db.commit()
+
+
+@pytest.fixture
+def listening_history(db):
+    """Give an anonymous device sessions with two activity rows each."""
+    meditation = Meditation(title="Calm", category="sleep", duration_sec=600, level="beginner")
+    db.add(meditation)
+    db.flush()
+    now = datetime.now(UTC)
+    activity_id = 0
+    for index in range(SESSIONS):
+        started_at = now - timedelta(days=index)
+        meditation_session = MeditationSession(
+            meditation_id=meditation.id,
+            device_id=DEVICE_ID,
+            started_at=started_at,
+            last_listened_at=started_at + timedelta(minutes=10),
+            completed_at=started_at + timedelta(minutes=10),
+            seconds_listened=600,
+            last_position_sec=600,
+        )
+        db.add(meditation_session)
+        db.flush()
+        for minute in (5, 10):
+            activity_id += 1
+            db.add(MeditationSessionActivity(
+                id=activity_id,
+                session_id=meditation_session.id,
+                seconds_listened=300,
+                recorded_at=started_at + timedelta(minutes=minute),
+            ))
+    db.commit()
+
+
+def test_query_budget_fails_past_its_limit(db, query_budget):
+    with pytest.raises(QueryBudgetExceeded):
+        with query_budget(1):
+            db.query(Meditation).all()
+            db.query(Program).all()
+
+
+def test_list_programs_query_budget(db, programs, query_budget):
+    # program_to_read still loads each program's meditations separately.
+    with query_budget(1 + PROGRAMS):
+        result = list_programs(limit=PROGRAMS, offset=0, db=db, current_user=None)
+
+    assert len(result) == PROGRAMS
+
+
+def test_progress_summary_query_budget(db, listening_history, query_budget):
+    with query_budget(2):
+        summary = progress_summary(DEVICE_ID, timezone_name="UTC", db=db, current_user=None)
+
+    assert summary.mindful_seconds == SESSIONS * 600
+    assert summary.total_sessions == SESSIONS
+
+
+def test_session_history_query_budget(db, listening_history, query_budget):
+    with query_budget(2):
+        history = session_history(DEVICE_ID, limit=10, offset=0, db=db, current_user=None)
+
+    assert history.total == SESSIONS
+    assert len(history.items) == 10
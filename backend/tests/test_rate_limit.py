@@ -0,0 +1,156 @@
+import fakeredis
+import pytest
+import redis
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.core import rate_limit
+from app.core.rate_limit import (
+    MemoryRateLimitBackend,
+    RateLimitBackend,
+    RedisRateLimitBackend,
+    check_rate_limit,
+    set_rate_limit_backend,
+)
+
+
+class FakeClock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class BrokenBackend(RateLimitBackend):
+    """Backend whose store is unreachable."""
+
+    def hit(self, key: str, *, limit: int, window_seconds: int) -> bool:
+        raise ConnectionError("store is down")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def use_backend():
+    """Install a backend for check_rate_limit and restore the default afterward."""
+    yield set_rate_limit_backend
+    set_rate_limit_backend(None)
+
+
+def make_request(ip_address: str = "203.0.113.7") -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/api/v1/auth/login",
+            "headers": [],
+            "client": (ip_address, 50000),
+        }
+    )
+
+
+def test_memory_backend_allows_up_to_limit_in_one_window(clock):
+    limiter = MemoryRateLimitBackend()
+
+    results = [limiter.hit("login:a", limit=3, window_seconds=60) for _ in range(4)]
+
+    assert results == [True, True, True, False]
+
+
+def test_memory_backend_weights_previous_window(clock):
+    limiter = MemoryRateLimitBackend()
+    for _ in range(4):
+        assert limiter.hit("login:a", limit=4, window_seconds=60)
+
+    # Halfway through the next window half of the previous hits still count.
+    clock.now += 90
+    assert limiter.hit("login:a", limit=4, window_seconds=60)
+    assert limiter.hit("login:a", limit=4, window_seconds=60)
+    assert not limiter.hit("login:a", limit=4, window_seconds=60)
+
+
+def test_memory_backend_resets_after_two_idle_windows(clock):
+    limiter = MemoryRateLimitBackend()
+    for _ in range(2):
+        limiter.hit("login:a", limit=2, window_seconds=60)
+    assert not limiter.hit("login:a", limit=2, window_seconds=60)
+
+    clock.now += 120
+    assert limiter.hit("login:a", limit=2, window_seconds=60)
+
+
+def test_memory_backend_evicts_least_recent_key(clock):
+    limiter = MemoryRateLimitBackend(max_keys=2)
+    limiter.hit("login:a", limit=1, window_seconds=60)
+    limiter.hit("login:b", limit=1, window_seconds=60)
+    limiter.hit("login:c", limit=1, window_seconds=60)
+
+    assert list(limiter._windows) == ["login:b", "login:c"]
+    # The evicted key starts over with a fresh window.
+    assert limiter.hit("login:a", limit=1, window_seconds=60)
+
+
+def test_memory_backend_evicts_idle_keys_first(clock):
+    limiter = MemoryRateLimitBackend(max_keys=10)
+    limiter.hit("login:a", limit=1, window_seconds=60)
+    clock.now += 150
+    limiter.hit("login:b", limit=1, window_seconds=60)
+
+    assert list(limiter._windows) == ["login:b"]
+
+
+def test_memory_backend_evicts_by_each_keys_own_window(clock):
+    limiter = MemoryRateLimitBackend(max_keys=10)
+    limiter.hit("login:a", limit=1, window_seconds=900)
+    clock.now += 150
+    limiter.hit("refresh:a", limit=1, window_seconds=60)
+
+    # Two 60-second windows have passed, but not two of login:a's own.
+    assert list(limiter._windows) == ["login:a", "refresh:a"]
+    assert not limiter.hit("login:a", limit=1, window_seconds=900)
+
+
+def test_backend_must_implement_hit():
+    class IncompleteBackend(RateLimitBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteBackend()
+
+
+def test_redis_backend_shares_one_bucket(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(redis.Redis, "from_url", lambda url: fakeredis.FakeRedis(server=server))
+    first = RedisRateLimitBackend("redis://localhost")
+    second = RedisRateLimitBackend("redis://localhost")
+
+    assert first.hit("login:a", limit=2, window_seconds=900)
+    assert second.hit("login:a", limit=2, window_seconds=900)
+    assert not first.hit("login:a", limit=2, window_seconds=900)
+
+
+def test_check_rate_limit_rejects_over_limit(use_backend, clock):
+    use_backend(MemoryRateLimitBackend())
+    check_rate_limit(make_request(), scope="auth:login", limit=1, window_seconds=60)
+
+    with pytest.raises(HTTPException) as error:
+        check_rate_limit(make_request(), scope="auth:login", limit=1, window_seconds=60)
+    assert error.value.status_code == 429
+
+    # Other clients have their own counters.
+    check_rate_limit(make_request("198.51.100.2"), scope="auth:login", limit=1, window_seconds=60)
+
+
+def test_check_rate_limit_fails_open_when_store_is_down(use_backend):
+    use_backend(BrokenBackend())
+
+    for _ in range(3):
+        check_rate_limit(make_request(), scope="auth:login", limit=1, window_seconds=60)
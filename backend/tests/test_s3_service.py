@@ -0,0 +1,55 @@
+from io import BytesIO
+
+from app.api.v1.admin.media import get_upload_metrics
+from app.models.media_object import MediaObject
+from app.services.s3_service import S3Service, get_s3_client, reset_s3_client
+from tests.helpers import bucket_keys
+
+
+def test_services_share_one_client_until_reset(s3):
+    first = S3Service()
+    second = S3Service()
+    assert first.client is second.client is get_s3_client()
+
+    reset_s3_client()
+
+    assert S3Service().client is not first.client
+
+
+def test_same_content_is_stored_once(db, s3):
+    service = S3Service()
+
+    first_url = service.upload_file(BytesIO(b"bell"), "bell.mp3", "audio/mpeg", prefix="audio")
+    second_url = service.upload_file(BytesIO(b"bell"), "renamed.mp3", "audio/mpeg", prefix="audio")
+
+    assert first_url == second_url
+    assert len(bucket_keys(s3)) == 1
+    assert db.query(MediaObject).count() == 1
+    metrics = get_upload_metrics()
+    assert metrics["uploads"] == 1
+    assert metrics["uploaded_bytes"] == 4
+    assert metrics["reused"] == 1
+    assert metrics["reused_bytes"] == 4
+
+
+def test_object_already_in_bucket_is_not_sent_again(db, s3):
+    service = S3Service()
+    service.upload_file(BytesIO(b"bell"), "bell.mp3", "audio/mpeg", prefix="audio")
+    # Forget the local record, as if another environment uploaded it.
+    db.query(MediaObject).delete()
+    db.commit()
+
+    service.upload_file(BytesIO(b"bell"), "bell.mp3", "audio/mpeg", prefix="audio")
+
+    metrics = get_upload_metrics()
+    assert metrics["uploads"] == 1
+    assert metrics["reused"] == 1
+    assert db.query(MediaObject).count() == 1
+
+
+def test_public_url_round_trips_to_key(s3):
+    service = S3Service()
+    key = "artwork/meditations/a b.png"
+
+    assert service.key_from_url(service.generate_public_url(key)) == key
+    assert service.key_from_url("https://example.com/a.png") is None
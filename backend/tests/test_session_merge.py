@@ -0,0 +1,70 @@
+from datetime import UTC, datetime, timedelta
+
+from app.api.v1.session_merge import merge_device_sessions
+from app.models.meditation import Meditation
+from app.models.program import Program, UserProgram
+from app.models.session import MeditationSession
+from app.models.user import User
+
+DEVICE_ID = 777
+
+
+def test_merge_folds_duplicates_and_drops_programs_the_user_is_not_in(db):
+    now = datetime.now(UTC)
+    user = User(email="listener@example.com", hashed_password="x")
+    meditation = Meditation(title="Calm", category="sleep", duration_sec=600, level="beginner")
+    enrolled = Program(title="Enrolled", level="beginner")
+    foreign = Program(title="Foreign", level="beginner")
+    db.add_all([user, meditation, enrolled, foreign])
+    db.flush()
+    db.add(UserProgram(user_id=user.id, program_id=enrolled.id))
+
+    def add_session(**values) -> MeditationSession:
+        meditation_session = MeditationSession(
+            meditation_id=meditation.id,
+            started_at=now - timedelta(hours=1),
+            **values,
+        )
+        db.add(meditation_session)
+        return meditation_session
+
+    account_open = add_session(user_id=user.id, seconds_listened=60, last_listened_at=now - timedelta(minutes=30))
+    device_open = add_session(
+        device_id=DEVICE_ID,
+        program_id=foreign.id,
+        seconds_listened=120,
+        last_listened_at=now - timedelta(minutes=5),
+    )
+    device_completed = add_session(
+        device_id=DEVICE_ID,
+        program_id=foreign.id,
+        seconds_listened=600,
+        completed_at=now - timedelta(days=1),
+    )
+    device_enrolled = add_session(device_id=DEVICE_ID, program_id=enrolled.id, seconds_listened=30)
+    db.commit()
+    account_open_id = account_open.id
+
+    result = merge_device_sessions(db, user, DEVICE_ID)
+    db.commit()
+
+    assert result.attached_sessions == 3
+    assert result.removed_duplicate_sessions == 1
+    assert result.detached_program_sessions == 2
+    assert db.get(MeditationSession, account_open_id) is None
+    db.refresh(device_open)
+    assert (device_open.user_id, device_open.program_id, device_open.seconds_listened) == (user.id, None, 180)
+    db.refresh(device_completed)
+    assert device_completed.program_id is None
+    db.refresh(device_enrolled)
+    assert device_enrolled.program_id == enrolled.id
+
+
+def test_merge_of_an_empty_device_changes_nothing(db):
+    user = User(email="listener@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+
+    result = merge_device_sessions(db, user, DEVICE_ID)
+
+    assert (result.attached_sessions, result.removed_duplicate_sessions, result.detached_program_sessions) == (0, 0, 0)
@@ -0,0 +1,104 @@
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.api.v1.sessions import complete_session, start_session
+from app.models.meditation import Meditation
+from app.models.session import MeditationSession
+from app.models.user import User
+from app.schemas.session import SessionComplete, SessionStart
+
+DEVICE_ID = 31
+AUDIO_URL = "https://media.example.com/audio/calm.mp3"
+
+
+def plain_request() -> Request:
+    return Request({"type": "http", "method": "POST", "path": "/api/v1/sessions/start", "headers": []})
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def any_db(request):
+    """Run the test on SQLite and, when configured, on PostgreSQL."""
+    return request.getfixturevalue("db" if request.param == "sqlite" else "postgresql_db")
+
+
+@pytest.fixture
+def meditation(any_db):
+    meditation = Meditation(
+        title="Calm",
+        category="sleep",
+        duration_sec=600,
+        level="beginner",
+        audio_url=AUDIO_URL,
+        is_published=True,
+    )
+    any_db.add(meditation)
+    any_db.commit()
+    return meditation
+
+
+def start(any_db, meditation, key=None, device_id=DEVICE_ID, user=None):
+    return start_session(
+        SessionStart(meditation_id=meditation.id, device_id=device_id),
+        plain_request(),
+        idempotency_key=key,
+        db=any_db,
+        current_user=user,
+    )
+
+
+def test_first_start_creates_an_open_session(any_db, meditation):
+    session = start(any_db, meditation, key="first")
+
+    assert session.completed_at is None
+    assert session.audio_url == AUDIO_URL
+    stored = any_db.query(MeditationSession).one()
+    assert (stored.id, stored.device_id, stored.start_key) == (session.id, DEVICE_ID, "first")
+
+
+def test_repeat_start_returns_the_open_session(any_db, meditation):
+    first = start(any_db, meditation)
+    second = start(any_db, meditation)
+    keyed = start(any_db, meditation, key="later")
+
+    assert first.id == second.id == keyed.id
+    assert any_db.query(MeditationSession).count() == 1
+
+
+def test_open_session_keeps_its_first_key(any_db, meditation):
+    first = start(any_db, meditation, key="original")
+    start(any_db, meditation, key="second tab")
+
+    assert start(any_db, meditation, key="original").id == first.id
+    assert any_db.query(MeditationSession.start_key).scalar() == "original"
+
+
+def test_replay_returns_the_session_after_completion(any_db, meditation):
+    first = start(any_db, meditation, key="retry-me")
+    complete_session(
+        first.id,
+        SessionComplete(device_id=DEVICE_ID, position_sec=600, seconds_listened=600),
+        db=any_db,
+        current_user=None,
+    )
+
+    replayed = start(any_db, meditation, key="retry-me")
+    fresh = start(any_db, meditation, key="next play")
+
+    assert replayed.id == first.id
+    assert replayed.completed_at is not None
+    assert fresh.id != first.id
+    assert any_db.query(MeditationSession).count() == 2
+
+
+def test_key_reused_by_another_owner_is_rejected(any_db, meditation):
+    user = User(email="listener@example.com", hashed_password="x")
+    any_db.add(user)
+    any_db.commit()
+    start(any_db, meditation, key="shared")
+
+    with pytest.raises(HTTPException) as error:
+        start(any_db, meditation, key="shared", user=user)
+
+    assert error.value.status_code == 409
+    assert any_db.query(MeditationSession).count() == 1
@@ -0,0 +1,149 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from app.core.dependencies import get_user_from_token
+from app.core.security import ALGORITHM, SECRET_KEY, create_access_token
+from app.core.tokens import (
+    ExpiredTokenError,
+    HmacTokenDecoder,
+    InvalidClaimsError,
+    InvalidSignatureError,
+    JoseTokenDecoder,
+    MalformedTokenError,
+    TokenVerifier,
+    token_verifier,
+)
+
+DECODERS = [HmacTokenDecoder, JoseTokenDecoder]
+
+
+class CountingDecoder:
+    """Wrap a decoder and count how often tokens are actually decoded."""
+
+    def __init__(self):
+        self.inner = HmacTokenDecoder(SECRET_KEY)
+        self.calls = 0
+
+    def decode(self, token: str) -> dict:
+        self.calls += 1
+        return self.inner.decode(token)
+
+
+@pytest.fixture(autouse=True)
+def empty_token_cache():
+    """Keep the process-wide verifier from leaking tokens between tests."""
+    token_verifier.clear()
+    yield
+    token_verifier.clear()
+
+
+def encode(claims: dict, secret: str = SECRET_KEY) -> str:
+    return jwt.encode(claims, secret, algorithm=ALGORITHM)
+
+
+def expires_in(minutes: int) -> int:
+    return int((datetime.now(UTC) + timedelta(minutes=minutes)).timestamp())
+
+
+@pytest.mark.parametrize("decoder_class", DECODERS)
+def test_valid_token_returns_claims(decoder_class):
+    verifier = TokenVerifier(decoder_class(SECRET_KEY))
+
+    claims = verifier.verify(create_access_token({"sub": "42"}))
+
+    assert claims["sub"] == "42"
+
+
+@pytest.mark.parametrize("decoder_class", DECODERS)
+def test_wrong_secret_is_rejected(decoder_class):
+    verifier = TokenVerifier(decoder_class(SECRET_KEY))
+
+    with pytest.raises(InvalidSignatureError):
+        verifier.verify(encode({"sub": "42", "exp": expires_in(5)}, secret="another-secret"))
+
+
+@pytest.mark.parametrize("decoder_class", DECODERS)
+def test_expired_token_is_rejected(decoder_class):
+    verifier = TokenVerifier(decoder_class(SECRET_KEY))
+
+    with pytest.raises(ExpiredTokenError):
+        verifier.verify(encode({"sub": "42", "exp": expires_in(-5)}))
+
+
+@pytest.mark.parametrize("decoder_class", DECODERS)
+def test_token_without_expiry_is_rejected(decoder_class):
+    # python-jose alone accepts tokens without exp. Both decoders now refuse
+    # them so a leaked token cannot stay valid forever.
+    verifier = TokenVerifier(decoder_class(SECRET_KEY))
+
+    with pytest.raises(InvalidClaimsError):
+        verifier.verify(encode({"sub": "42"}))
+
+
+@pytest.mark.parametrize("decoder_class", DECODERS)
+def test_token_without_subject_is_rejected(decoder_class):
+    verifier = TokenVerifier(decoder_class(SECRET_KEY))
+
+    with pytest.raises(InvalidClaimsError):
+        verifier.verify(encode({"exp": expires_in(5)}))
+
+
+def test_hmac_decoder_rejects_other_algorithms():
+    token = jwt.encode({"sub": "42", "exp": expires_in(5)}, SECRET_KEY, algorithm="HS512")
+
+    with pytest.raises(InvalidSignatureError):
+        HmacTokenDecoder(SECRET_KEY).decode(token)
+
+
+@pytest.mark.parametrize("token", ["", "not-a-token", "a.b", "é.b.c"])
+def test_hmac_decoder_rejects_malformed_tokens(token):
+    with pytest.raises(MalformedTokenError):
+        HmacTokenDecoder(SECRET_KEY).decode(token)
+
+
+def test_verified_tokens_are_cached_until_cleared():
+    decoder = CountingDecoder()
+    verifier = TokenVerifier(decoder)
+    token = create_access_token({"sub": "42"})
+
+    verifier.verify(token)
+    verifier.verify(token)
+    assert decoder.calls == 1
+
+    verifier.clear()
+    verifier.verify(token)
+    assert decoder.calls == 2
+
+
+def test_cache_keeps_only_the_most_recent_tokens():
+    decoder = CountingDecoder()
+    verifier = TokenVerifier(decoder, max_entries=2)
+    tokens = [create_access_token({"sub": str(user_id)}) for user_id in range(3)]
+
+    for token in tokens:
+        verifier.verify(token)
+    verifier.verify(tokens[0])
+
+    assert decoder.calls == 4
+
+
+def test_cached_token_expires(monkeypatch):
+    decoder = CountingDecoder()
+    verifier = TokenVerifier(decoder)
+    token = encode({"sub": "42", "exp": expires_in(1)})
+    verifier.verify(token)
+
+    monkeypatch.setattr("app.core.tokens.time", lambda: expires_in(2))
+    with pytest.raises(ExpiredTokenError):
+        verifier.verify(token)
+
+
+def test_token_without_expiry_is_an_invalid_session():
+    with pytest.raises(HTTPException) as error:
+        get_user_from_token(encode({"sub": "42"}), db=None)
+
+    assert error.value.status_code == 401
+    assert error.value.detail == "Invalid token"
@@ -0,0 +1,84 @@
+import zipfile
+from io import BytesIO
+
+import pytest
+
+from app.api.v1.admin import meditations as admin_meditations
+from app.api.v1.admin.meditations import bulk_import_meditations
+from app.api.v1.admin.programs import bulk_import_programs
+from app.api.v1.admin.zip_utils import ZipMemberError, extract_zip_member
+from app.models.meditation import Meditation
+from app.models.program import Program
+from tests.helpers import bucket_keys, csv_upload, png_bytes, tamper_zip, zip_upload
+
+AUDIO = b"calm audio " * 100
+MEDITATION_CSV = "title,category,duration_sec,level,audio_filename\nCalm,sleep,300,beginner,calm.mp3\n"
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(admin_meditations, "sleep", lambda seconds: None)
+
+
+def test_extract_checks_the_bytes_actually_read():
+    archive = zipfile.ZipFile(zip_upload({"audio/calm.mp3": AUDIO}).file)
+
+    with extract_zip_member(archive, "audio/calm.mp3", len(AUDIO)) as member:
+        assert member.read() == AUDIO
+    with pytest.raises(ZipMemberError, match="expands past"):
+        with extract_zip_member(archive, "audio/calm.mp3", len(AUDIO) - 1):
+            pass
+
+
+def test_oversized_member_is_skipped_before_reading(db, s3):
+    media_zip = tamper_zip(zip_upload({"audio/calm.mp3": AUDIO}), file_size=admin_meditations.MAX_AUDIO_BYTES + 1)
+
+    result = bulk_import_meditations(csv_file=csv_upload(MEDITATION_CSV), media_zip=media_zip, db=db)
+
+    assert result["warnings"] == ["Row 2: skipped audio over 2 GB: calm.mp3"]
+    assert bucket_keys(s3) == []
+
+
+def test_member_with_a_lying_size_is_a_row_error(db, s3):
+    media_zip = tamper_zip(zip_upload({"audio/calm.mp3": AUDIO}), file_size=10)
+
+    result = bulk_import_meditations(csv_file=csv_upload(MEDITATION_CSV), media_zip=media_zip, db=db)
+
+    assert (result["created"], result["skipped"]) == (0, 1)
+    assert result["errors"][0].startswith("Row 2: audio/calm.mp3 is corrupt")
+    assert db.query(Meditation).count() == 0
+    assert bucket_keys(s3) == []
+
+
+def test_member_with_a_bad_crc_is_a_row_error(db, s3):
+    media_zip = tamper_zip(zip_upload({"audio/calm.mp3": AUDIO}), crc=0)
+
+    result = bulk_import_meditations(csv_file=csv_upload(MEDITATION_CSV), media_zip=media_zip, db=db)
+
+    assert result["skipped"] == 1
+    assert "Bad CRC-32" in result["errors"][0]
+    assert bucket_keys(s3) == []
+
+
+def test_program_import_reports_corrupt_artwork_per_row(db, s3):
+    meditation = Meditation(title="Calm", category="sleep", duration_sec=300, level="beginner", is_published=True)
+    db.add(meditation)
+    db.commit()
+    artwork_zip = tamper_zip(zip_upload({"artwork/calm.png": png_bytes()}), crc=0)
+
+    result = bulk_import_programs(
+        csv_file=csv_upload(
+            "title,level,artwork_filename,meditation_ids\n"
+            f"Sleep Week,beginner,calm.png,{meditation.id}\n"
+            f"Rest Week,beginner,,{meditation.id}\n"
+        ),
+        artwork_zip=artwork_zip,
+        db=db,
+    )
+
+    assert (result["created"], result["skipped"]) == (1, 1)
+    assert result["errors"] == [
+        "Row 2: artwork/calm.png is corrupt: Bad CRC-32 for file 'artwork/calm.png'"
+    ]
+    assert [title for title, in db.query(Program.title)] == ["Rest Week"]
+    assert bucket_keys(s3) == []
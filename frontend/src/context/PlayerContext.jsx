@@ -54,6 +54,8 @@ export function PlayerProvider({ children }) {
   const currentProgramIdRef = useRef(currentProgramId);
   const sessionIdRef = useRef(null);
   const sessionPromiseRef = useRef(null);
+  // Idempotency key of the current play intent, kept until a start succeeds.
+  const startKeyRef = useRef(null);
   const listenedSecondsRef = useRef(0);
   const lastAccountingAtRef = useRef(null);
   const pendingAutoplayRef = useRef(false);
@@ -106,9 +108,18 @@ export function PlayerProvider({ children }) {
     const programId = currentProgramIdRef.current;
     if (!meditation?.id || !meditation.audio_url) return null;
 
+    // Retries of a failed start reuse the key, so the backend returns the
+    // session an earlier attempt may already have created.
+    if (!startKeyRef.current) {
+      startKeyRef.current = globalThis.crypto?.randomUUID?.() || null;
+    }
+    const startKey = startKeyRef.current;
     sessionPromiseRef.current = csrfFetch(`${API_BASE_URL}/sessions/start`, {
       method: "POST",
-      headers: { "Content-Type": "application/json" },
+      headers: {
+        "Content-Type": "application/json",
+        ...(startKey ? { "Idempotency-Key": startKey } : {}),
+      },
       credentials: "include",
       body: JSON.stringify({
         meditation_id: meditation.id,
@@ -120,6 +131,7 @@ export function PlayerProvider({ children }) {
         if (!response.ok) throw new Error("Listening progress is temporarily unavailable.");
         const session = await response.json();
         sessionIdRef.current = session.id;
+        startKeyRef.current = null;
         listenedSecondsRef.current = session.seconds_listened || 0;
 
         const audio = audioRef.current;
@@ -217,6 +229,7 @@ export function PlayerProvider({ children }) {
 
     sessionIdRef.current = null;
     sessionPromiseRef.current = null;
+    startKeyRef.current = null;
     listenedSecondsRef.current = 0;
     lastAccountingAtRef.current = null;
     pendingAutoplayRef.current = true;
@@ -339,6 +352,7 @@ export function PlayerProvider({ children }) {
     setNextPrompt(null);
     setCompletionCelebration(null);
     sessionIdRef.current = null;
+    startKeyRef.current = null;
     localStorage.removeItem(CURRENT_KEY);
     localStorage.removeItem(CURRENT_PROGRAM_KEY);
   }, [accountListeningTime, sendProgress]);